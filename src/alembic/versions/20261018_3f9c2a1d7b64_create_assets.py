@@ -0,0 +1,49 @@
+"""create assets
+
+Revision ID: 3f9c2a1d7b64
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "3f9c2a1d7b64"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "assets",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("provider", sa.String(length=16), nullable=False),
+        sa.Column("bucket", sa.String(length=255), nullable=False),
+        sa.Column("key", sa.String(length=1024), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("content_type", sa.String(length=255), nullable=True),
+        sa.Column("digest", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_assets_location_key", "assets", ["provider", "bucket", "key"]
+    )
+    op.create_index(
+        "ix_assets_location_created_at",
+        "assets",
+        ["provider", "bucket", "created_at"],
+    )
+    op.create_index("ix_assets_digest", "assets", ["digest"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_digest", table_name="assets")
+    op.drop_index("ix_assets_location_created_at", table_name="assets")
+    op.drop_index("ix_assets_location_key", table_name="assets")
+    op.drop_table("assets")
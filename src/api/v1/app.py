@@ -1,13 +1,122 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from api.v1.dependencies.core.repositories.aws.s3 import create_s3_repository
+from api.v1.dependencies.core.repositories.database.assets import (
+    create_asset_repository,
+)
+from api.v1.dependencies.core.services.file_system import (
+    create_file_system_aggregator,
+    create_file_system_aggregator_config,
+    create_transfer_token_signer,
+)
+from api.v1.dependencies.core.services.ml import create_job_manager
+from configs.aws.s3 import AwsEnvConfig
+from configs.database import DatabaseConfig
+from configs.file_system import FileSystemConfig
+from configs.ml import MLConfig
+from core.services.file_system.cache import FSCache, FSCacheConfig
+from core.services.metrics.cloudwatch import CloudWatchMetricsPublisher
+from shared.factories.aws.s3 import AwsClientFactory
+from shared.factories.database import DatabaseFactory
+from shared.helpers.metrics import MetricsRegistry
 from . import v1_router
 
 
 @asynccontextmanager
 async def lifespan_event(app: FastAPI):
-    yield
+    fs_config = FileSystemConfig()
+    aws_env_config = AwsEnvConfig()
+    aws_client_factory = AwsClientFactory(aws_env_config)
+    metrics = MetricsRegistry()
+    if fs_config.USE_AWS_S3:
+        await aws_client_factory.open_s3_clients()
+
+    file_system_cache = None
+    if fs_config.CACHE_ENABLED:
+        file_system_cache = FSCache(
+            FSCacheConfig(
+                memory_max_bytes=fs_config.CACHE_MEMORY_BYTES,
+                disk_path=fs_config.CACHE_DISK_PATH,
+                disk_max_bytes=fs_config.CACHE_DISK_BYTES,
+                ttl_seconds=fs_config.CACHE_TTL_SECONDS,
+                validate_etag=fs_config.CACHE_VALIDATE_ETAG,
+            )
+        )
+        await file_system_cache.open()
+
+    database_config = DatabaseConfig()
+    database_factory = DatabaseFactory(database_config)
+    asset_repository = None
+    if database_config.CATALOG_ENABLED:
+        if database_config.MIGRATE_ON_STARTUP:
+            await database_factory.migrate()
+        await database_factory.open()
+        asset_repository = create_asset_repository(database_factory)
+
+    local_fs_executor = ThreadPoolExecutor(
+        max_workers=fs_config.LOCAL_IO_THREADS,
+        thread_name_prefix="local-fs",
+    )
+    s3_repository = create_s3_repository(aws_client_factory, fs_config, metrics)
+    file_system_aggregator = create_file_system_aggregator(
+        config=create_file_system_aggregator_config(
+            s3_repository=s3_repository,
+            fs_config=fs_config,
+            executor=local_fs_executor,
+            metrics=metrics,
+            asset_repository=asset_repository,
+        ),
+        cache=file_system_cache,
+    )
+
+    app.state.aws_client_factory = aws_client_factory
+    app.state.file_system_cache = file_system_cache
+    app.state.s3_repository = s3_repository
+    app.state.file_system_aggregator = file_system_aggregator
+    app.state.transfer_token_signer = create_transfer_token_signer(fs_config)
+    app.state.database_factory = database_factory
+    app.state.asset_repository = asset_repository
+    app.state.metrics = metrics
+
+    ml_config = MLConfig()
+    ml_executor = ProcessPoolExecutor(
+        max_workers=ml_config.WORKERS,
+        mp_context=multiprocessing.get_context(ml_config.START_METHOD),
+    )
+    job_manager = create_job_manager(
+        file_system_aggregator=file_system_aggregator,
+        executor=ml_executor,
+        ml_config=ml_config,
+    )
+    job_manager.start()
+    app.state.job_manager = job_manager
+
+    metrics_publisher = None
+    if aws_env_config.CW_RUNTIME_METRICS_ENABLED:
+        metrics_publisher = CloudWatchMetricsPublisher(
+            metrics=metrics,
+            namespace=(
+                f"{aws_env_config.CW_METRICS_NAMESPACE}"
+                f"{aws_env_config.CW_NAMESPACE_POSTFIX}"
+            ),
+            client_provider=aws_client_factory.get_cloudwatch_client,
+            interval_seconds=aws_env_config.CW_PUBLISH_INTERVAL_SECONDS,
+        )
+        metrics_publisher.start()
+    try:
+        yield
+    finally:
+        await job_manager.stop()
+        ml_executor.shutdown(wait=True, cancel_futures=True)
+        if metrics_publisher:
+            await metrics_publisher.stop()
+        await aws_client_factory.close_s3_clients()
+        await database_factory.close()
+        local_fs_executor.shutdown(wait=True)
 
 
 def create_app():
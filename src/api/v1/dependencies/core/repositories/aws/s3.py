@@ -1,7 +1,27 @@
-from configs.aws.s3 import AwsEnvConfig
+from fastapi import Request
+
+from configs.file_system import FileSystemConfig
 from core.repositories.aws.s3 import S3Repository
+from shared.factories.aws.s3 import AwsClientFactory
+from shared.helpers.metrics import MetricsRegistry
+
+
+def get_aws_client_factory(request: Request) -> AwsClientFactory:
+    return request.app.state.aws_client_factory
+
+
+def create_s3_repository(
+        aws_client_factory: AwsClientFactory,
+        fs_config: FileSystemConfig,
+        metrics: MetricsRegistry | None = None,
+) -> S3Repository:
+    return S3Repository(
+        aws_env_config=aws_client_factory.aws_env_config,
+        aws_client_factory=aws_client_factory,
+        metrics=metrics,
+        delete_concurrency=fs_config.S3_DELETE_CONCURRENCY,
+    )
 
 
-def get_s3_repository():
-    config = AwsEnvConfig()
-    return S3Repository(aws_env_config=config)
+def get_s3_repository(request: Request) -> S3Repository:
+    return request.app.state.s3_repository
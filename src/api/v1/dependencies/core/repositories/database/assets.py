@@ -0,0 +1,16 @@
+from fastapi import Request
+
+from core.repositories.database.assets import AssetRepository
+from shared.factories.database import DatabaseFactory
+
+
+def get_database_factory(request: Request) -> DatabaseFactory:
+    return request.app.state.database_factory
+
+
+def create_asset_repository(database_factory: DatabaseFactory) -> AssetRepository:
+    return AssetRepository(session_maker=database_factory.get_session_maker())
+
+
+def get_asset_repository(request: Request) -> AssetRepository | None:
+    return request.app.state.asset_repository
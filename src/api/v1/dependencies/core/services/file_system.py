@@ -1,27 +1,91 @@
-from api.v1.dependencies.core.repositories.aws.s3 import get_s3_repository
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import Request
+from loguru import logger
+
 from configs.file_system import FileSystemConfig
+from core.repositories.aws.s3 import S3Repository
+from core.repositories.database.assets import AssetRepository
 from core.services.file_system.aggregator import FSAggregator, FSAggregatorConfig
+from core.services.file_system.cache import CachedFSAggregator, FSCache
 from core.services.file_system.local import LocalFSProcessor
 from core.services.file_system.s3 import S3FSProcessor, S3FSProcessorConfig
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.helpers.metrics import MetricsRegistry
+from shared.helpers.signing import TransferTokenSigner
 
 
-def get_s3_file_system_config() -> S3FSProcessorConfig:
-    return S3FSProcessorConfig(s3_repository=get_s3_repository())
-
+def create_s3_file_system_config(
+        s3_repository: S3Repository,
+        fs_config: FileSystemConfig,
+) -> S3FSProcessorConfig:
+    return S3FSProcessorConfig(
+        s3_repository=s3_repository,
+        batch_concurrency=fs_config.S3_BATCH_CONCURRENCY,
+        parallel_reads=fs_config.S3_PARALLEL_READS,
+    )
 
-def get_file_system_aggregator_config() -> FSAggregatorConfig:
-    config = FileSystemConfig()
 
-    local_file_system = LocalFSProcessor()
-    s3_file_system = S3FSProcessor(config=get_s3_file_system_config())
+def create_file_system_aggregator_config(
+        s3_repository: S3Repository,
+        fs_config: FileSystemConfig,
+        executor: ThreadPoolExecutor,
+        metrics: MetricsRegistry | None = None,
+        asset_repository: AssetRepository | None = None,
+) -> FSAggregatorConfig:
+    local_file_system = LocalFSProcessor(
+        target_provider=FSProvidersEnum.LOCAL,
+        executor=executor,
+        fs_config=fs_config,
+    )
+    local_s3_file_system = LocalFSProcessor(
+        target_provider=FSProvidersEnum.S3,
+        executor=executor,
+        fs_config=fs_config,
+    )
+    s3_file_system = S3FSProcessor(
+        config=create_s3_file_system_config(s3_repository, fs_config)
+    )
     return FSAggregatorConfig(
-        fs_config=config,
+        fs_config=fs_config,
         local_fs_processor=local_file_system,
         s3_fs_processor=s3_file_system,
+        local_s3_fs_processor=local_s3_file_system,
+        metrics=metrics,
+        asset_repository=asset_repository,
     )
 
 
-def get_file_system_aggregator() -> FSAggregator:
+def create_file_system_aggregator(
+        config: FSAggregatorConfig,
+        cache: FSCache | None = None,
+) -> FSAggregator:
+    """
+    Build the aggregator once at startup. It holds no per-request state,
+    so a single instance is shared by all requests.
+    """
+    if cache is not None:
+        return CachedFSAggregator(config=config, cache=cache)
     return FSAggregator(
-        config=get_file_system_aggregator_config()
+        config=config
     )
+
+
+def get_file_system_aggregator(request: Request) -> FSAggregator:
+    return request.app.state.file_system_aggregator
+
+
+def create_transfer_token_signer(fs_config: FileSystemConfig) -> TransferTokenSigner:
+    if fs_config.TRANSFER_TOKEN_SECRET:
+        return TransferTokenSigner(fs_config.TRANSFER_TOKEN_SECRET.encode())
+
+    logger.warning(
+        "FS_TRANSFER_TOKEN_SECRET is not set. Transfer tokens are only valid "
+        "in this process until it restarts."
+    )
+    return TransferTokenSigner(secrets.token_bytes(32))
+
+
+def get_transfer_token_signer(request: Request) -> TransferTokenSigner:
+    return request.app.state.transfer_token_signer
@@ -0,0 +1,28 @@
+from concurrent.futures import Executor
+
+from fastapi import Request
+
+from configs.ml import MLConfig
+from core.services.file_system.aggregator import FSAggregator
+from core.services.ml.jobs import JobManager, JobManagerConfig
+from shared.enums.services.core.file_system import FSProvidersEnum
+
+
+def create_job_manager(
+        file_system_aggregator: FSAggregator,
+        executor: Executor,
+        ml_config: MLConfig,
+) -> JobManager:
+    return JobManager(
+        JobManagerConfig(
+            file_system_aggregator=file_system_aggregator,
+            executor=executor,
+            ml_config=ml_config,
+            provider=FSProvidersEnum.S3,
+            bucket=file_system_aggregator.fs_config.S3_BUCKET,
+        )
+    )
+
+
+def get_job_manager(request: Request) -> JobManager:
+    return request.app.state.job_manager
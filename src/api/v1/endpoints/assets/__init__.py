@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from .catalog import catalog_router
 from .network import network_router
+from .transfers import transfers_router
 
 assets_router = APIRouter()
 assets_router.include_router(network_router, prefix="/network", tags=["assets"])
+assets_router.include_router(catalog_router, prefix="/catalog", tags=["assets"])
+assets_router.include_router(transfers_router, prefix="/transfers", tags=["assets"])
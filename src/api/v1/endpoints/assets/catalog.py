@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from api.v1.dependencies.core.services.file_system import get_file_system_aggregator
+from api.v1.schemas.assets.catalog import CatalogAssetSchema, CatalogListSchema
+from core.services.file_system.aggregator import FSAggregator
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.exceptions.assets import AssetCatalogDisabledError
+
+catalog_router = APIRouter()
+
+
+@catalog_router.get("", response_model=CatalogListSchema)
+async def list_assets(
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        prefix: str = "",
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        start_after: str | None = None,
+        limit: Annotated[int, Query(ge=1, le=1000)] = 1000,
+):
+    try:
+        records = await file_system_aggregator.list_assets(
+            provider=FSProvidersEnum.S3,
+            bucket=file_system_aggregator.fs_config.S3_BUCKET,
+            prefix=prefix,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            start_after=start_after,
+        )
+    except AssetCatalogDisabledError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    keyed = prefix or start_after is not None or (
+        created_after is None and created_before is None
+    )
+    content = CatalogListSchema(
+        assets=[CatalogAssetSchema.model_validate(record) for record in records],
+        next_start_after=(
+            records[-1].key if keyed and len(records) == limit else None
+        ),
+    )
+    return JSONResponse(status_code=200, content=content.model_dump(mode="json"))
+
+
+@catalog_router.get("/{asset_id}", response_model=CatalogAssetSchema)
+async def get_asset(
+        asset_id: str,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+):
+    if not file_system_aggregator.catalog_enabled:
+        raise HTTPException(status_code=503, detail=str(AssetCatalogDisabledError()))
+
+    record = await file_system_aggregator.get_asset(asset_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return JSONResponse(
+        status_code=200,
+        content=CatalogAssetSchema.model_validate(record).model_dump(mode="json"),
+    )
@@ -1,13 +1,28 @@
-from typing import Annotated
-from uuid import uuid4
+import mimetypes
+import tarfile
+import zipfile
+from typing import Annotated, AsyncIterator, List
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, File, UploadFile, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile, Depends
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 
 from api.v1.dependencies.core.services.file_system import get_file_system_aggregator
-from api.v1.schemas.assets.network import NetworkUploadAssetSchema
+from api.v1.schemas.assets.network import (
+    NetworkBulkUploadItemSchema,
+    NetworkBulkUploadSchema,
+    NetworkUploadAssetSchema,
+)
 from core.services.file_system.aggregator import FSAggregator
-from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.dataclasses.services.core.assets import AssetUpload
+from shared.enums.services.core.file_system import FSProvidersEnum, UploadStatusEnum
+from shared.exceptions.assets import FileTooLargeError
+from shared.exceptions.http import RangeNotSatisfiableError
+from shared.helpers.archives import is_archive, iter_archive, safe_relative_path
+from shared.helpers.concurrency import map_bounded
+from shared.helpers.http import etag_matches, http_date, parse_byte_range
+from shared.helpers.streams import iter_bytes, iter_chunks
 
 network_router = APIRouter()
 
@@ -17,12 +32,300 @@ async def network(
         file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
         file: UploadFile = File(...),
 ):
-    await file_system_aggregator.write(
-        provider=FSProvidersEnum.S3,
-        path=file.filename,
-        data=await file.read(),
+    fs_config = file_system_aggregator.fs_config
+    asset_id = str(uuid4())
+    if fs_config.CONTENT_ADDRESSED_UPLOADS:
+        # The content is keyed by its digest, the file name is only recorded
+        result = await file_system_aggregator.write_content_addressed(
+            provider=FSProvidersEnum.S3,
+            asset_id=asset_id,
+            chunks=iter_chunks(file),
+            bucket=fs_config.S3_BUCKET,
+            content_type=file.content_type,
+            filename=file.filename,
+        )
+        content = NetworkUploadAssetSchema(
+            uuid=asset_id,
+            path=result.path,
+            digest=result.digest,
+            deduplicated=result.deduplicated,
+        )
+    else:
+        try:
+            path = safe_relative_path(file.filename or "")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await file_system_aggregator.write_asset(
+            provider=FSProvidersEnum.S3,
+            asset_id=asset_id,
+            path=path,
+            chunks=iter_chunks(file),
+            bucket=fs_config.S3_BUCKET,
+            content_type=file.content_type,
+        )
+        content = NetworkUploadAssetSchema(uuid=asset_id, path=path)
+
+    return JSONResponse(
+        status_code=200,
+        content=content.model_dump(),
+    )
+
+
+async def _iter_bulk_files(
+        files: List[UploadFile],
+        archive: UploadFile | None,
+        max_file_bytes: int,
+) -> AsyncIterator[tuple[str, bytes | Exception, str | None]]:
+    """
+    Yield the name, content (or the reason it is rejected) and content type
+    of every uploaded file, then of every member of the archive.
+    """
+    for file in files:
+        name = file.filename or ""
+        if file.size is not None and file.size > max_file_bytes:
+            yield name, FileTooLargeError(file.size, max_file_bytes), file.content_type
+            continue
+        yield name, await file.read(), file.content_type
+
+    if archive is None:
+        return
+
+    members = iterate_in_threadpool(iter_archive(archive.file, max_file_bytes))
+    try:
+        async for name, data in members:
+            yield name, data, mimetypes.guess_type(name)[0]
+    except (tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+        yield archive.filename or "", ValueError(f"Corrupt archive: {e}"), None
+
+
+@network_router.post("/upload/bulk", response_model=NetworkBulkUploadSchema)
+async def bulk_upload(
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        files: List[UploadFile] | None = File(default=None),
+        archive: UploadFile | None = File(default=None),
+):
+    """
+    Store many files from one multipart request, given as "files" parts
+    and/or a zip or tar "archive". Files are buffered up to
+    BULK_UPLOAD_BATCH_BYTES and each group is written concurrently through
+    the batch path. Every file gets its own status.
+    """
+    fs_config = file_system_aggregator.fs_config
+    provider = FSProvidersEnum.S3
+    bucket = fs_config.S3_BUCKET
+    files = files or []
+    if not files and archive is None:
+        raise HTTPException(status_code=400, detail="No files were uploaded")
+    if len(files) > fs_config.BULK_UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=413, detail="Too many files")
+    if archive is not None and not is_archive(archive.file):
+        raise HTTPException(status_code=400, detail="Unsupported archive format")
+
+    items: List[NetworkBulkUploadItemSchema] = []
+    group: List[tuple[int, AssetUpload]] = []
+    group_bytes = 0
+    paths: set[str] = set()
+
+    async def write_content_addressed(upload: AssetUpload):
+        return await file_system_aggregator.write_content_addressed(
+            provider=provider,
+            asset_id=upload.asset_id,
+            chunks=iter_bytes(upload.data),
+            bucket=bucket,
+            content_type=upload.content_type,
+            filename=upload.path,
+        )
+
+    async def flush() -> None:
+        uploads = [upload for _, upload in group]
+        if fs_config.CONTENT_ADDRESSED_UPLOADS:
+            results = await map_bounded(
+                write_content_addressed,
+                uploads,
+                fs_config.BULK_UPLOAD_CONCURRENCY,
+                return_exceptions=True,
+                limiter=file_system_aggregator.batch_limiter(provider),
+            )
+            for (index, upload), result in zip(group, results):
+                if isinstance(result, Exception):
+                    items[index].status = UploadStatusEnum.FAILED
+                    items[index].error = str(result)
+                else:
+                    items[index].uuid = upload.asset_id
+                    items[index].digest = result.digest
+                    items[index].deduplicated = result.deduplicated
+        else:
+            result = await file_system_aggregator.write_asset_batch(
+                provider=provider,
+                uploads=uploads,
+                bucket=bucket,
+                concurrency=fs_config.BULK_UPLOAD_CONCURRENCY,
+            )
+            for index, upload in group:
+                error = result.errors.get(upload.path)
+                if error is not None:
+                    items[index].status = UploadStatusEnum.FAILED
+                    items[index].error = str(error)
+                else:
+                    items[index].uuid = upload.asset_id
+
+    async for name, data, content_type in _iter_bulk_files(
+            files, archive, fs_config.BULK_UPLOAD_MAX_FILE_BYTES
+    ):
+        item = NetworkBulkUploadItemSchema(
+            filename=name, status=UploadStatusEnum.STORED
+        )
+        items.append(item)
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if len(paths) >= fs_config.BULK_UPLOAD_MAX_FILES:
+                raise ValueError("Too many files")
+            path = safe_relative_path(name)
+            if path in paths:
+                raise ValueError(f"Duplicate file name: {path}")
+        except ValueError as e:
+            item.status = UploadStatusEnum.FAILED
+            item.error = str(e)
+            continue
+
+        paths.add(path)
+        group.append(
+            (
+                len(items) - 1,
+                AssetUpload(
+                    asset_id=str(uuid4()),
+                    path=path,
+                    data=data,
+                    content_type=content_type,
+                ),
+            )
+        )
+        group_bytes += len(data)
+        if group_bytes >= fs_config.BULK_UPLOAD_BATCH_BYTES:
+            await flush()
+            group, group_bytes = [], 0
+
+    if group:
+        await flush()
+
+    stored = sum(item.status == UploadStatusEnum.STORED for item in items)
+    content = NetworkBulkUploadSchema(
+        stored=stored,
+        failed=len(items) - stored,
+        assets=items,
     )
     return JSONResponse(
         status_code=200,
-        content=NetworkUploadAssetSchema(uuid=str(uuid4())).model_dump(),
+        content=content.model_dump(),
+    )
+
+
+async def _resolve_download_path(
+        file_system_aggregator: FSAggregator,
+        provider: FSProvidersEnum,
+        path: str,
+        bucket: str | None,
+) -> str:
+    """
+    Storage path to serve for a download: an asset id resolves to the path
+    its content is stored at, anything else is a path itself.
+    """
+    try:
+        UUID(path)
+    except ValueError:
+        return safe_relative_path(path)
+
+    try:
+        return await file_system_aggregator.resolve_asset(
+            provider=provider,
+            asset_id=path,
+            bucket=bucket,
+        )
+    except FileNotFoundError:
+        return safe_relative_path(path)
+
+
+@network_router.get("/download/{path:path}")
+async def download(
+        path: str,
+        request: Request,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+):
+    """
+    Serve an asset by its storage path or by its asset id, which is how
+    content-addressed uploads are downloaded.
+    """
+    provider = FSProvidersEnum.S3
+    bucket = file_system_aggregator.fs_config.S3_BUCKET
+    try:
+        path = await _resolve_download_path(
+            file_system_aggregator, provider, path, bucket
+        )
+        info = await file_system_aggregator.stat(
+            provider=provider,
+            path=path,
+            bucket=bucket,
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"accept-ranges": "bytes"}
+    if info.etag:
+        headers["etag"] = info.etag
+    if info.last_modified:
+        headers["last-modified"] = http_date(info.last_modified)
+
+    if info.etag and etag_matches(request.headers.get("if-none-match"), info.etag):
+        return Response(status_code=304, headers=headers)
+
+    size = info.size or 0
+    # Validated here for every backend, FileResponse answers unsatisfiable
+    # ranges without the unit in Content-Range
+    if_range = request.headers.get("if-range")
+    use_range = if_range is None or if_range in (
+        headers.get("etag"), headers.get("last-modified")
+    )
+    try:
+        byte_range = (
+            parse_byte_range(request.headers.get("range"), size) if use_range else None
+        )
+    except RangeNotSatisfiableError as e:
+        return Response(status_code=416, headers={"content-range": f"bytes */{e.size}"})
+
+    # Local files are served by the server straight from the page cache,
+    # including Range requests. FileResponse hands whole files to the server
+    # through the ASGI pathsend extension, which servers implement with
+    # sendfile, and falls back to chunked reads on servers without it.
+    # Compressed files have to be decoded on the way out.
+    local_path = file_system_aggregator.local_path(provider, path)
+    if local_path and not info.codec:
+        return FileResponse(
+            local_path,
+            headers=headers,
+            media_type=info.content_type or "application/octet-stream",
+        )
+
+    status_code = 200
+    offset, length = 0, size
+    if byte_range:
+        status_code = 206
+        offset, length = byte_range
+        headers["content-range"] = f"bytes {offset}-{offset + length - 1}/{size}"
+    headers["content-length"] = str(length)
+
+    return StreamingResponse(
+        file_system_aggregator.iter_read(
+            provider=provider,
+            path=path,
+            bucket=bucket,
+            offset=offset,
+            length=length,
+            info=info,
+        ),
+        status_code=status_code,
+        headers=headers,
+        media_type=info.content_type or "application/octet-stream",
     )
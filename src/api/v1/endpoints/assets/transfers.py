@@ -0,0 +1,336 @@
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, AsyncIterator, Dict
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from api.v1.dependencies.core.services.file_system import (
+    get_file_system_aggregator,
+    get_transfer_token_signer,
+)
+from api.v1.schemas.assets.transfers import (
+    TransferAbortRequestSchema,
+    TransferAssetSchema,
+    TransferCompleteRequestSchema,
+    TransferDownloadSchema,
+    TransferPartSchema,
+    TransferUploadRequestSchema,
+    TransferUploadSchema,
+)
+from configs.file_system import FileSystemConfig
+from core.services.file_system.aggregator import FSAggregator
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.exceptions.assets import FileTooLargeError, InvalidTransferTokenError
+from shared.helpers.archives import safe_relative_path
+from shared.helpers.signing import TransferTokenSigner
+from .network import download
+
+transfers_router = APIRouter()
+
+
+def _expires_in(fs_config: FileSystemConfig, requested: int | None) -> int:
+    if requested is None:
+        return fs_config.PRESIGNED_URL_EXPIRY_SECONDS
+    if requested > fs_config.PRESIGNED_URL_MAX_EXPIRY_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "expires_in exceeds the limit of "
+                f"{fs_config.PRESIGNED_URL_MAX_EXPIRY_SECONDS} seconds"
+            ),
+        )
+    return requested
+
+
+def _verify(signer: TransferTokenSigner, token: str, operation: str) -> Dict[str, Any]:
+    """
+    Check a transfer token and return its claims. The path it grants access
+    to is checked again, so a token can only address the storage root.
+    """
+    try:
+        claims = signer.verify(token)
+    except InvalidTransferTokenError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    if claims.get("op") != operation:
+        raise HTTPException(status_code=403, detail="Invalid transfer token")
+    try:
+        claims["path"] = safe_relative_path(claims.get("path") or "")
+    except ValueError:
+        raise HTTPException(status_code=403, detail="Invalid transfer token")
+    return claims
+
+
+@transfers_router.post("/uploads", response_model=TransferUploadSchema)
+async def create_upload(
+        body: TransferUploadRequestSchema,
+        request: Request,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        signer: Annotated[TransferTokenSigner, Depends(get_transfer_token_signer)],
+):
+    """
+    Issue the URLs a client uploads a file to without passing its bytes
+    through the API: presigned S3 URLs, or a signed local transfer URL when
+    S3 is disabled. The upload is registered by completing its ticket.
+    """
+    fs_config = file_system_aggregator.fs_config
+    provider = FSProvidersEnum.S3
+    bucket = fs_config.S3_BUCKET
+    expires_in = _expires_in(fs_config, body.expires_in)
+
+    allowed_types = fs_config.PRESIGNED_UPLOAD_CONTENT_TYPES
+    if allowed_types and body.content_type not in allowed_types:
+        raise HTTPException(status_code=415, detail="Content type is not accepted")
+    max_bytes = fs_config.PRESIGNED_UPLOAD_MAX_BYTES
+    if body.size is not None and body.size > max_bytes:
+        raise HTTPException(
+            status_code=413, detail=str(FileTooLargeError(body.size, max_bytes))
+        )
+    try:
+        path = safe_relative_path(body.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    asset_id = str(uuid4())
+    presigned = file_system_aggregator.supports_presigned_urls(provider)
+    content = TransferUploadSchema(
+        uuid=asset_id,
+        path=path,
+        ticket="",
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+    )
+    if body.content_type:
+        content.headers["content-type"] = body.content_type
+    claims = {
+        "op": "upload",
+        "asset_id": asset_id,
+        "path": path,
+        "content_type": body.content_type,
+    }
+
+    if body.parts is not None:
+        if not presigned:
+            raise HTTPException(
+                status_code=400, detail="Multipart uploads need the S3 provider"
+            )
+        multipart = await file_system_aggregator.presign_multipart_upload(
+            provider=provider,
+            path=path,
+            part_count=body.parts,
+            bucket=bucket,
+            expires_in=expires_in,
+            content_type=body.content_type,
+        )
+        claims["upload_id"] = multipart.upload_id
+        content.parts = [
+            TransferPartSchema(part_number=number, url=url)
+            for number, url in enumerate(multipart.part_urls, start=1)
+        ]
+        # Parts are sent without a content type; it was set at creation
+        content.headers.clear()
+    elif presigned:
+        content.url = await file_system_aggregator.presign_upload(
+            provider=provider,
+            path=path,
+            bucket=bucket,
+            expires_in=expires_in,
+            content_type=body.content_type,
+        )
+    else:
+        token = signer.sign(
+            {"op": "put", "path": path, "content_type": body.content_type},
+            expires_in,
+        )
+        content.url = str(request.url_for("local_transfer_upload", token=token))
+
+    # An upload started just before its URLs expire still has to be completed
+    content.ticket = signer.sign(
+        claims, expires_in + fs_config.PRESIGNED_URL_MAX_EXPIRY_SECONDS
+    )
+    return JSONResponse(status_code=200, content=content.model_dump(mode="json"))
+
+
+@transfers_router.post("/uploads/complete", response_model=TransferAssetSchema)
+async def complete_upload(
+        body: TransferCompleteRequestSchema,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        signer: Annotated[TransferTokenSigner, Depends(get_transfer_token_signer)],
+):
+    """
+    Register a finished direct upload as an asset. Multipart uploads are
+    assembled from the reported parts first. Completing an upload that is
+    already in the catalog returns its asset.
+    """
+    claims = _verify(signer, body.ticket, "upload")
+    fs_config = file_system_aggregator.fs_config
+    provider = FSProvidersEnum.S3
+    bucket = fs_config.S3_BUCKET
+
+    upload_id = claims.get("upload_id")
+    if upload_id and not await file_system_aggregator.get_asset(claims["asset_id"]):
+        if not body.parts:
+            raise HTTPException(
+                status_code=400, detail="Parts are required by a multipart upload"
+            )
+        try:
+            await file_system_aggregator.complete_multipart_upload(
+                provider=provider,
+                path=claims["path"],
+                upload_id=upload_id,
+                parts=[(part.part_number, part.etag) for part in body.parts],
+                bucket=bucket,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        record = await file_system_aggregator.register_asset(
+            provider=provider,
+            asset_id=claims["asset_id"],
+            path=claims["path"],
+            bucket=bucket,
+            max_bytes=fs_config.PRESIGNED_UPLOAD_MAX_BYTES,
+            # Local storage keeps no content type; its upload route checked it
+            content_type=(
+                claims.get("content_type")
+                if file_system_aggregator.supports_presigned_urls(provider)
+                else None
+            ),
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="The file was not uploaded")
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    content = TransferAssetSchema(
+        uuid=record.asset_id,
+        path=record.key,
+        size=record.size,
+        content_type=record.content_type,
+    )
+    return JSONResponse(status_code=200, content=content.model_dump())
+
+
+@transfers_router.post("/uploads/abort", status_code=204)
+async def abort_upload(
+        body: TransferAbortRequestSchema,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        signer: Annotated[TransferTokenSigner, Depends(get_transfer_token_signer)],
+):
+    """
+    Abort a multipart upload so its parts stop taking storage.
+    """
+    claims = _verify(signer, body.ticket, "upload")
+    if claims.get("upload_id"):
+        await file_system_aggregator.abort_multipart_upload(
+            provider=FSProvidersEnum.S3,
+            path=claims["path"],
+            upload_id=claims["upload_id"],
+            bucket=file_system_aggregator.fs_config.S3_BUCKET,
+        )
+    return Response(status_code=204)
+
+
+@transfers_router.get("/downloads/{path:path}", response_model=TransferDownloadSchema)
+async def create_download(
+        path: str,
+        request: Request,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        signer: Annotated[TransferTokenSigner, Depends(get_transfer_token_signer)],
+        expires_in: Annotated[int | None, Query(ge=1)] = None,
+):
+    """
+    Issue a URL the file is downloaded from without passing through the API
+    when S3 is enabled. Compressed files are served through the API, which
+    decodes them.
+    """
+    fs_config = file_system_aggregator.fs_config
+    provider = FSProvidersEnum.S3
+    bucket = fs_config.S3_BUCKET
+    expires_in = _expires_in(fs_config, expires_in)
+    try:
+        path = safe_relative_path(path)
+        info = await file_system_aggregator.stat(
+            provider=provider, path=path, bucket=bucket
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if file_system_aggregator.supports_presigned_urls(provider) and not info.codec:
+        url = await file_system_aggregator.presign_download(
+            provider=provider,
+            path=path,
+            bucket=bucket,
+            expires_in=expires_in,
+        )
+    else:
+        token = signer.sign({"op": "get", "path": path}, expires_in)
+        url = str(request.url_for("local_transfer_download", token=token))
+
+    content = TransferDownloadSchema(
+        url=url,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+    )
+    return JSONResponse(status_code=200, content=content.model_dump(mode="json"))
+
+
+@transfers_router.put("/local/{token}", name="local_transfer_upload")
+async def local_upload(
+        token: str,
+        request: Request,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        signer: Annotated[TransferTokenSigner, Depends(get_transfer_token_signer)],
+):
+    """
+    Receive the body of a signed local upload, the local stand-in for a
+    presigned S3 PUT.
+    """
+    claims = _verify(signer, token, "put")
+    content_type = claims.get("content_type")
+    if content_type and request.headers.get("content-type") != content_type:
+        raise HTTPException(status_code=403, detail="Content type does not match")
+
+    max_bytes = file_system_aggregator.fs_config.PRESIGNED_UPLOAD_MAX_BYTES
+
+    async def limited_body() -> AsyncIterator[bytes]:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise FileTooLargeError(size, max_bytes)
+            yield chunk
+
+    try:
+        await file_system_aggregator.write_stream(
+            provider=FSProvidersEnum.S3,
+            path=claims["path"],
+            chunks=limited_body(),
+            bucket=file_system_aggregator.fs_config.S3_BUCKET,
+            content_type=content_type,
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return Response(status_code=200)
+
+
+@transfers_router.get("/local/{token}", name="local_transfer_download")
+async def local_download(
+        token: str,
+        request: Request,
+        file_system_aggregator: Annotated[FSAggregator, Depends(get_file_system_aggregator)],
+        signer: Annotated[TransferTokenSigner, Depends(get_transfer_token_signer)],
+):
+    """
+    Serve a signed local download, with the range and conditional request
+    support of the download endpoint.
+    """
+    claims = _verify(signer, token, "get")
+    return await download(
+        path=claims["path"],
+        request=request,
+        file_system_aggregator=file_system_aggregator,
+    )
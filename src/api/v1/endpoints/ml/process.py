@@ -1,10 +1,100 @@
-from fastapi import APIRouter
+from typing import Annotated
 
-from api.v1.schemas.assets.network import NetworkUploadAssetSchema
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+
+from api.v1.dependencies.core.services.ml import get_job_manager
+from api.v1.schemas.ml.process import (
+    ProcessJobSchema,
+    ProcessRequestSchema,
+    ProcessResultSchema,
+)
+from core.services.ml.jobs import JobManager
+from shared.exceptions.jobs import (
+    JobNotFinishedError,
+    JobNotFoundError,
+    JobNotRetryableError,
+    JobQueueFullError,
+)
 
 process_router = APIRouter()
 
 
-@process_router.post("/process", response_model=NetworkUploadAssetSchema)
-async def process():
-    ...
+def _job_response(job, status_code: int = 200) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content=ProcessJobSchema.model_validate(job).model_dump(mode="json"),
+    )
+
+
+@process_router.post("", response_model=ProcessJobSchema, status_code=202)
+async def process(
+        body: ProcessRequestSchema,
+        job_manager: Annotated[JobManager, Depends(get_job_manager)],
+):
+    try:
+        job = job_manager.submit(body.asset_id)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "5"}
+        )
+    return _job_response(job, status_code=202)
+
+
+@process_router.get("/{job_id}", response_model=ProcessJobSchema)
+async def process_status(
+        job_id: str,
+        job_manager: Annotated[JobManager, Depends(get_job_manager)],
+):
+    try:
+        job = job_manager.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _job_response(job)
+
+
+@process_router.get("/{job_id}/result", response_model=ProcessResultSchema)
+async def process_result(
+        job_id: str,
+        job_manager: Annotated[JobManager, Depends(get_job_manager)],
+):
+    try:
+        result = await job_manager.get_result(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobNotFinishedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(
+        status_code=200,
+        content=ProcessResultSchema(job_id=job_id, result=result).model_dump(),
+    )
+
+
+@process_router.post("/{job_id}/retry", response_model=ProcessJobSchema)
+async def process_retry(
+        job_id: str,
+        job_manager: Annotated[JobManager, Depends(get_job_manager)],
+):
+    try:
+        job = job_manager.retry(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobNotRetryableError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "5"}
+        )
+    return _job_response(job, status_code=202)
+
+
+@process_router.delete("/{job_id}", response_model=ProcessJobSchema)
+async def process_cancel(
+        job_id: str,
+        job_manager: Annotated[JobManager, Depends(get_job_manager)],
+):
+    try:
+        job = job_manager.cancel(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _job_response(job)
@@ -1,7 +1,11 @@
 from fastapi import APIRouter
 
+from api.v1.endpoints.system.cache import router as cache_router
 from api.v1.endpoints.system.health import router as health_router
+from api.v1.endpoints.system.metrics import router as metrics_router
 
 system_router = APIRouter()
 
 system_router.include_router(health_router, prefix="/health", tags=["system"])
+system_router.include_router(cache_router, prefix="/cache", tags=["system"])
+system_router.include_router(metrics_router, prefix="/metrics", tags=["system"])
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from api.v1.schemas.system.cache import CacheStatsResponseSchema
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=CacheStatsResponseSchema)
+async def cache_stats(request: Request):
+    cache = request.app.state.file_system_cache
+    if cache is None:
+        content = CacheStatsResponseSchema(enabled=False)
+    else:
+        content = CacheStatsResponseSchema(
+            enabled=True,
+            **cache.stats.as_dict(),
+            **cache.usage(),
+        )
+    return JSONResponse(
+        status_code=200,
+        content=content.model_dump(),
+    )
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from api.v1.schemas.system.metrics import MetricsResponseSchema
+
+router = APIRouter()
+
+
+@router.get("", response_model=MetricsResponseSchema)
+async def metrics(request: Request):
+    content = MetricsResponseSchema(**request.app.state.metrics.as_dict())
+    return JSONResponse(
+        status_code=200,
+        content=content.model_dump(),
+    )
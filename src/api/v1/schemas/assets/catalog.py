@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import Field
+
+from ..base import BaseSchema
+
+
+class CatalogAssetSchema(BaseSchema):
+    asset_id: str = Field(description="UUID of the asset")
+    provider: str = Field(description="Storage provider of the asset")
+    bucket: str | None = Field(default=None, description="Bucket of the asset")
+    key: str = Field(description="Storage key of the asset")
+    size: int | None = Field(default=None, description="Size in bytes")
+    content_type: str | None = Field(default=None, description="Content type")
+    digest: str | None = Field(default=None, description="SHA-256 of the content")
+    created_at: datetime | None = Field(default=None, description="When it was stored")
+    updated_at: datetime | None = Field(default=None, description="Last update")
+
+
+class CatalogListSchema(BaseSchema):
+    assets: List[CatalogAssetSchema] = Field(description="Matching assets")
+    next_start_after: str | None = Field(
+        default=None,
+        description="Pass as start_after to get the next page of a key listing",
+    )
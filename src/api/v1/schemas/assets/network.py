@@ -1,7 +1,38 @@
+from typing import List
+
 from pydantic import Field
 
+from shared.enums.services.core.file_system import UploadStatusEnum
 from ..base import BaseSchema
 
 
 class NetworkUploadAssetSchema(BaseSchema):
     uuid: str = Field(description="UUID of the asset")
+    path: str = Field(description="Storage path of the asset")
+    digest: str | None = Field(
+        default=None, description="SHA-256 digest of a content-addressed asset"
+    )
+    deduplicated: bool | None = Field(
+        default=None, description="Whether identical content was already stored"
+    )
+
+
+class NetworkBulkUploadItemSchema(BaseSchema):
+    filename: str = Field(description="Name of the file or archive member")
+    status: UploadStatusEnum = Field(description="Whether the file was stored")
+    uuid: str | None = Field(default=None, description="UUID of the stored asset")
+    digest: str | None = Field(
+        default=None, description="SHA-256 digest of a content-addressed asset"
+    )
+    deduplicated: bool | None = Field(
+        default=None, description="Whether identical content was already stored"
+    )
+    error: str | None = Field(default=None, description="Why the file failed")
+
+
+class NetworkBulkUploadSchema(BaseSchema):
+    stored: int = Field(description="Number of stored files")
+    failed: int = Field(description="Number of failed files")
+    assets: List[NetworkBulkUploadItemSchema] = Field(
+        description="Outcome of every file, in upload order"
+    )
@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import Field
+
+from ..base import BaseSchema
+
+
+class TransferUploadRequestSchema(BaseSchema):
+    filename: str = Field(description="Storage path of the file to upload")
+    content_type: str | None = Field(
+        default=None, description="Content type the upload must be sent with"
+    )
+    size: int | None = Field(default=None, ge=0, description="Expected size in bytes")
+    parts: int | None = Field(
+        default=None,
+        ge=1,
+        le=10000,
+        description="Number of parts of a multipart upload, single PUT if unset",
+    )
+    expires_in: int | None = Field(
+        default=None, ge=1, description="Lifetime of the URLs in seconds"
+    )
+
+
+class TransferPartSchema(BaseSchema):
+    part_number: int = Field(description="Number of the part, starting at 1")
+    url: str = Field(description="URL the part is PUT to")
+
+
+class TransferUploadSchema(BaseSchema):
+    uuid: str = Field(description="UUID of the asset once the upload completes")
+    path: str = Field(description="Storage path of the file")
+    method: str = Field(default="PUT", description="HTTP method of the upload")
+    url: str | None = Field(default=None, description="URL of a single PUT upload")
+    parts: List[TransferPartSchema] | None = Field(
+        default=None, description="URLs of the parts of a multipart upload"
+    )
+    headers: Dict[str, str] = Field(
+        default_factory=dict, description="Headers the upload must be sent with"
+    )
+    ticket: str = Field(description="Passed back to complete or abort the upload")
+    expires_at: datetime = Field(description="When the URLs expire")
+
+
+class TransferCompletedPartSchema(BaseSchema):
+    part_number: int = Field(ge=1, le=10000, description="Number of the part")
+    etag: str = Field(description="ETag returned by the part upload")
+
+
+class TransferCompleteRequestSchema(BaseSchema):
+    ticket: str = Field(description="Ticket of the upload")
+    parts: List[TransferCompletedPartSchema] | None = Field(
+        default=None, description="Uploaded parts of a multipart upload"
+    )
+
+
+class TransferAbortRequestSchema(BaseSchema):
+    ticket: str = Field(description="Ticket of the upload")
+
+
+class TransferAssetSchema(BaseSchema):
+    uuid: str = Field(description="UUID of the asset")
+    path: str = Field(description="Storage path of the file")
+    size: int | None = Field(default=None, description="Size in bytes")
+    content_type: str | None = Field(default=None, description="Content type")
+
+
+class TransferDownloadSchema(BaseSchema):
+    url: str = Field(description="URL the file is downloaded from")
+    expires_at: datetime = Field(description="When the URL expires")
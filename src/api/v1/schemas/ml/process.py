@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from pydantic import Field
+
+from shared.enums.services.core.jobs import JobStatusEnum
+from ..base import BaseSchema
+
+
+class ProcessRequestSchema(BaseSchema):
+    asset_id: str = Field(
+        description="Asset id, or the storage path without content addressing"
+    )
+
+
+class ProcessJobSchema(BaseSchema):
+    job_id: str = Field(description="Id of the analysis job")
+    asset_id: str = Field(description="Asset being analysed")
+    status: JobStatusEnum = Field(description="Current status of the job")
+    progress: float = Field(description="Progress from 0.0 to 1.0")
+    shards_total: int = Field(default=0, description="Shards the input is split in")
+    shards_done: int = Field(default=0, description="Shards processed so far")
+    attempts: int = Field(default=1, description="Times the job has been run")
+    error: str | None = Field(default=None, description="Error of a failed job")
+    created_at: datetime = Field(description="When the job was submitted")
+    started_at: datetime | None = Field(default=None, description="When it started")
+    finished_at: datetime | None = Field(default=None, description="When it ended")
+
+
+class ProcessResultSchema(BaseSchema):
+    job_id: str = Field(description="Id of the analysis job")
+    result: Dict[str, Any] = Field(description="Analysis of the asset")
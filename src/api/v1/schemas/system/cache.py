@@ -0,0 +1,16 @@
+from pydantic import Field
+
+from ..base import BaseSchema
+
+
+class CacheStatsResponseSchema(BaseSchema):
+    enabled: bool = Field(description="Whether the file system cache is enabled")
+    memory_hits: int = Field(default=0, description="Reads served from memory")
+    disk_hits: int = Field(default=0, description="Reads served from the disk tier")
+    misses: int = Field(default=0, description="Reads fetched from the backend")
+    stale: int = Field(default=0, description="Cached entries that failed validation")
+    memory_evictions: int = Field(default=0, description="Entries spilled from memory")
+    disk_evictions: int = Field(default=0, description="Entries evicted from disk")
+    invalidations: int = Field(default=0, description="Entries removed by writes")
+    memory_bytes: int = Field(default=0, description="Bytes held in memory")
+    disk_bytes: int = Field(default=0, description="Bytes held on disk")
@@ -0,0 +1,30 @@
+from typing import Dict, List
+
+from pydantic import Field
+
+from ..base import BaseSchema
+
+
+class MetricValueSchema(BaseSchema):
+    name: str = Field(description="Metric name")
+    tags: Dict[str, str] = Field(description="Metric tags, such as the provider")
+    value: float = Field(description="Current value")
+
+
+class HistogramSchema(BaseSchema):
+    name: str = Field(description="Metric name")
+    tags: Dict[str, str] = Field(description="Metric tags, such as the provider")
+    count: int = Field(description="Number of observations")
+    sum: float = Field(description="Sum of the observed values")
+    min: float | None = Field(default=None, description="Smallest observed value")
+    max: float | None = Field(default=None, description="Largest observed value")
+    p50: float | None = Field(default=None, description="Estimated median")
+    p95: float | None = Field(default=None, description="Estimated 95th percentile")
+    p99: float | None = Field(default=None, description="Estimated 99th percentile")
+    buckets: Dict[str, int] = Field(description="Observations per bucket upper bound")
+
+
+class MetricsResponseSchema(BaseSchema):
+    counters: List[MetricValueSchema] = Field(default_factory=list)
+    gauges: List[MetricValueSchema] = Field(default_factory=list)
+    histograms: List[HistogramSchema] = Field(default_factory=list)
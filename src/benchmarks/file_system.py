@@ -0,0 +1,472 @@
+"""
+Micro-benchmarks for the file-system layer.
+
+The aggregator is benchmarked against a temporary directory (LOCAL) and an
+in-process moto S3 server (S3), so no AWS account is needed. Every case is
+written to a JSON report that can be compared between commits.
+
+    cd src && python -m benchmarks.file_system --quick --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Awaitable, Callable, List
+
+from loguru import logger
+
+from api.v1.dependencies.core.repositories.aws.s3 import create_s3_repository
+from api.v1.dependencies.core.services.file_system import (
+    create_file_system_aggregator,
+    create_file_system_aggregator_config,
+)
+from configs.aws.s3 import AwsEnvConfig
+from configs.file_system import FileSystemConfig
+from core.services.file_system.aggregator import FSAggregator
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.factories.aws.s3 import AwsClientFactory
+
+if TYPE_CHECKING:
+    from moto.server import ThreadedMotoServer
+
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+
+DEFAULT_SIZES = [KB, 64 * KB, MB, 16 * MB, 128 * MB, GB]
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000]
+QUICK_SIZES = [KB, 64 * KB, MB]
+QUICK_BATCH_SIZES = [1, 10, 100]
+
+BENCH_BUCKET = "fs-benchmark"
+
+
+@dataclass
+class BenchmarkResult:
+    provider: str
+    operation: str
+    object_size: int
+    batch_size: int
+    calls: int
+    objects: int
+    total_bytes: int
+    seconds: float
+    ops_per_sec: float
+    mb_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_bytes: int
+
+
+@dataclass
+class Timings:
+    """
+    Latencies of the calls of one operation, in seconds.
+    """
+
+    latencies: List[float] = field(default_factory=list)
+
+    async def measure(self, call: Awaitable) -> None:
+        start = time.perf_counter()
+        await call
+        self.latencies.append(time.perf_counter() - start)
+
+
+class PeakRSSSampler:
+    """
+    Track the peak resident set size while the block runs.
+    /proc is sampled on Linux, elsewhere the process-wide maximum is used.
+    """
+
+    statm_path = "/proc/self/statm"
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _current_rss(self) -> int:
+        if os.path.exists(self.statm_path):
+            with open(self.statm_path) as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+        return max_rss if sys.platform == "darwin" else max_rss * KB
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self._current_rss())
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self.peak = self._current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.peak = max(self.peak, self._current_rss())
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of the values.
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_result(
+        provider: FSProvidersEnum,
+        operation: str,
+        object_size: int,
+        batch_size: int,
+        timings: Timings,
+        peak_rss: int,
+) -> BenchmarkResult:
+    seconds = sum(timings.latencies)
+    calls = len(timings.latencies)
+    objects = calls * batch_size
+    total_bytes = objects * object_size
+    return BenchmarkResult(
+        provider=provider.value,
+        operation=operation,
+        object_size=object_size,
+        batch_size=batch_size,
+        calls=calls,
+        objects=objects,
+        total_bytes=total_bytes,
+        seconds=round(seconds, 6),
+        ops_per_sec=round(objects / seconds, 3) if seconds else 0.0,
+        mb_per_sec=round(total_bytes / MB / seconds, 3) if seconds else 0.0,
+        p50_ms=round(percentile(timings.latencies, 50) * 1000, 3),
+        p99_ms=round(percentile(timings.latencies, 99) * 1000, 3),
+        peak_rss_bytes=peak_rss,
+    )
+
+
+class FSBenchmark:
+    def __init__(
+            self,
+            aggregator: FSAggregator,
+            provider: FSProvidersEnum,
+            root: str,
+            bucket: str | None,
+            repeat: int,
+            max_bytes_per_case: int,
+            batch_object_size: int,
+    ):
+        self.aggregator = aggregator
+        self.provider = provider
+        self.root = root
+        self.bucket = bucket
+        self.repeat = repeat
+        self.max_bytes_per_case = max_bytes_per_case
+        self.batch_object_size = batch_object_size
+
+    def _path(self, *parts: object) -> str:
+        return "/".join([self.root, *map(str, parts)])
+
+    async def _timed(
+            self,
+            operation: str,
+            object_size: int,
+            batch_size: int,
+            calls: int,
+            func: Callable[[int], Awaitable],
+    ) -> BenchmarkResult:
+        timings = Timings()
+        with PeakRSSSampler() as rss:
+            for i in range(calls):
+                await timings.measure(func(i))
+        result = build_result(
+            self.provider, operation, object_size, batch_size, timings, rss.peak
+        )
+        logger.info(
+            f"{result.provider} {operation} size={object_size} "
+            f"batch={batch_size}: {result.ops_per_sec} ops/s, "
+            f"{result.mb_per_sec} MB/s, p99 {result.p99_ms} ms"
+        )
+        return result
+
+    async def run_object_sizes(self, sizes: List[int]) -> List[BenchmarkResult]:
+        """
+        Single-object write, read and streaming read for every object size.
+        """
+        results = []
+        for size in sizes:
+            calls = max(1, min(self.repeat, self.max_bytes_per_case // size))
+            data = os.urandom(size)
+            paths = [self._path("objects", size, i) for i in range(calls)]
+
+            async def write(i: int) -> None:
+                await self.aggregator.write(
+                    provider=self.provider,
+                    path=paths[i],
+                    data=data,
+                    bucket=self.bucket,
+                )
+
+            async def read(i: int) -> None:
+                await self.aggregator.read(
+                    provider=self.provider, path=paths[i], bucket=self.bucket
+                )
+
+            async def iter_read(i: int) -> None:
+                async for _ in self.aggregator.iter_read(
+                    provider=self.provider, path=paths[i], bucket=self.bucket
+                ):
+                    pass
+
+            results.append(await self._timed("write", size, 1, calls, write))
+            results.append(await self._timed("read", size, 1, calls, read))
+            results.append(
+                await self._timed("iter_read", size, 1, calls, iter_read)
+            )
+
+            data = b""
+            await self.aggregator.delete_batch(
+                provider=self.provider, paths=paths, bucket=self.bucket
+            )
+        return results
+
+    async def run_batch_sizes(self, batch_sizes: List[int]) -> List[BenchmarkResult]:
+        """
+        Batch write, listing, batch read and delete by prefix for every batch
+        size. Each round writes a fresh prefix that the round deletes again.
+        """
+        results = []
+        size = self.batch_object_size
+        data = os.urandom(size)
+        for batch_size in batch_sizes:
+            timings = {
+                operation: Timings()
+                for operation in (
+                    "write_batch",
+                    "list",
+                    "read_batch",
+                    "delete_files_by_prefix",
+                )
+            }
+            with PeakRSSSampler() as rss:
+                for round_number in range(self.repeat):
+                    prefix = self._path("batches", batch_size, round_number) + "/"
+                    paths = [f"{prefix}{i}" for i in range(batch_size)]
+
+                    await timings["write_batch"].measure(
+                        self.aggregator.write_batch(
+                            provider=self.provider,
+                            data=[(path, data) for path in paths],
+                            bucket=self.bucket,
+                        )
+                    )
+                    await timings["list"].measure(self._consume_list(prefix))
+                    await timings["read_batch"].measure(
+                        self.aggregator.read_batch(
+                            provider=self.provider, paths=paths, bucket=self.bucket
+                        )
+                    )
+                    await timings["delete_files_by_prefix"].measure(
+                        self.aggregator.delete_files_by_prefix(
+                            provider=self.provider, prefix=prefix, bucket=self.bucket
+                        )
+                    )
+
+            for operation, operation_timings in timings.items():
+                result = build_result(
+                    self.provider,
+                    operation,
+                    size,
+                    batch_size,
+                    operation_timings,
+                    rss.peak,
+                )
+                logger.info(
+                    f"{result.provider} {operation} batch={batch_size}: "
+                    f"{result.ops_per_sec} ops/s, p99 {result.p99_ms} ms"
+                )
+                results.append(result)
+        return results
+
+    async def _consume_list(self, prefix: str) -> None:
+        async for _ in self.aggregator.iter_list(
+            provider=self.provider, prefix=prefix, bucket=self.bucket
+        ):
+            pass
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_moto_server(port: int) -> tuple["ThreadedMotoServer", str]:
+    """
+    Start moto in a background thread of this process.
+    """
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        raise RuntimeError(
+            "The S3 benchmark needs moto[server]: poetry install --with bench"
+        ) from None
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def run_provider(
+        provider: FSProvidersEnum,
+        args: argparse.Namespace,
+        executor: ThreadPoolExecutor,
+        root: str,
+) -> List[BenchmarkResult]:
+    use_s3 = provider == FSProvidersEnum.S3
+    fs_config = FileSystemConfig(
+        USE_AWS_S3=use_s3,
+        S3_BUCKET=BENCH_BUCKET if use_s3 else None,
+        CACHE_ENABLED=False,
+    )
+    aws_client_factory = AwsClientFactory(AwsEnvConfig())
+    try:
+        if use_s3:
+            region = aws_client_factory.aws_env_config.TARGET_REGION
+            async with aws_client_factory.get_s3_client() as client:
+                await client.create_bucket(
+                    Bucket=BENCH_BUCKET,
+                    CreateBucketConfiguration={"LocationConstraint": region},
+                )
+
+        aggregator = create_file_system_aggregator(
+            config=create_file_system_aggregator_config(
+                s3_repository=create_s3_repository(aws_client_factory, fs_config),
+                fs_config=fs_config,
+                executor=executor,
+            )
+        )
+        benchmark = FSBenchmark(
+            aggregator=aggregator,
+            provider=provider,
+            root="bench" if use_s3 else root,
+            bucket=fs_config.S3_BUCKET,
+            repeat=args.repeat,
+            max_bytes_per_case=args.max_bytes_per_case,
+            batch_object_size=args.batch_object_size,
+        )
+        results = await benchmark.run_object_sizes(args.sizes)
+        results += await benchmark.run_batch_sizes(args.batch_sizes)
+        return results
+    finally:
+        await aws_client_factory.close_s3_clients()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    server: "ThreadedMotoServer | None" = None
+    if FSProvidersEnum.S3 in args.providers:
+        server, endpoint_url = start_moto_server(args.moto_port)
+        os.environ["AWS_ENDPOINT_URL"] = endpoint_url
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    executor = ThreadPoolExecutor(
+        max_workers=FileSystemConfig().LOCAL_IO_THREADS,
+        thread_name_prefix="local-fs",
+    )
+    results: List[BenchmarkResult] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="fs-benchmark-") as root:
+            for provider in args.providers:
+                results += await run_provider(provider, args, executor, root)
+    finally:
+        executor.shutdown(wait=True)
+        if server is not None:
+            server.stop()
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": args.sizes,
+            "batch_sizes": args.batch_sizes,
+            "repeat": args.repeat,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--providers",
+        nargs="+",
+        type=FSProvidersEnum,
+        default=[FSProvidersEnum.LOCAL, FSProvidersEnum.S3],
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=None)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=None)
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Use small object and batch sizes for a fast smoke run.",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--max-bytes-per-case",
+        type=int,
+        default=GB,
+        help="Cap on the bytes moved per object-size case; large objects "
+        "are repeated fewer times.",
+    )
+    parser.add_argument("--batch-object-size", type=int, default=KB)
+    parser.add_argument("--moto-port", type=int, default=5077)
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args(argv)
+
+    args.sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    args.batch_sizes = args.batch_sizes or (
+        QUICK_BATCH_SIZES if args.quick else DEFAULT_BATCH_SIZES
+    )
+    if args.quick:
+        args.repeat = min(args.repeat, 5)
+    return args
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,5 +17,37 @@ class AwsEnvConfig(BaseConfig):
     CW_METRICS_NAMESPACE: Annotated[str | None, Field()] = "default-namespace"
     CW_NAMESPACE_POSTFIX: Annotated[str | None, Field()] = ""
     CW_RUNTIME_METRICS_ENABLED: Annotated[bool | None, Field()] = False
+    CW_PUBLISH_INTERVAL_SECONDS: Annotated[float, Field(gt=0)] = 60.0
+
+    S3_CLIENT_POOL_SIZE: Annotated[int, Field(ge=1)] = 1
+    S3_MAX_POOL_CONNECTIONS: Annotated[int, Field(ge=1)] = 50
+    S3_KEEPALIVE_TIMEOUT: Annotated[float, Field(gt=0)] = 12.0
+    S3_TCP_KEEPALIVE: Annotated[bool, Field()] = True
+
+    S3_MULTIPART_THRESHOLD: Annotated[int, Field(ge=1)] = 16 * 1024 * 1024
+    S3_MULTIPART_PART_SIZE: Annotated[int, Field(ge=5 * 1024 * 1024)] = (
+        8 * 1024 * 1024
+    )
+    S3_MULTIPART_CONCURRENCY: Annotated[int, Field(ge=1)] = 4
+
+    S3_RANGE_PART_SIZE: Annotated[int, Field(ge=1)] = 8 * 1024 * 1024
+    S3_RANGE_CONCURRENCY: Annotated[int, Field(ge=1)] = 8
+
+    S3_HEDGED_READS: Annotated[bool, Field()] = False
+    S3_HEDGE_DELAY_MS: Annotated[float | None, Field(gt=0)] = None
+    S3_HEDGE_PERCENTILE: Annotated[float, Field(gt=0, lt=100)] = 95.0
+    S3_HEDGE_MIN_DELAY_MS: Annotated[float, Field(gt=0)] = 5.0
+    S3_HEDGE_MAX_DELAY_MS: Annotated[float, Field(gt=0)] = 500.0
+    S3_HEDGE_BUDGET_RATIO: Annotated[float, Field(ge=0, le=1)] = 0.05
+
+    S3_RETRY_MAX_ATTEMPTS: Annotated[int, Field(ge=1)] = 5
+    S3_RETRY_BASE_DELAY: Annotated[float, Field(gt=0)] = 0.1
+    S3_RETRY_MAX_DELAY: Annotated[float, Field(gt=0)] = 5.0
+
+    S3_ADAPTIVE_CONCURRENCY_ENABLED: Annotated[bool, Field()] = True
+    S3_ADAPTIVE_CONCURRENCY_INITIAL: Annotated[int, Field(ge=1)] = 32
+    S3_ADAPTIVE_CONCURRENCY_MIN: Annotated[int, Field(ge=1)] = 2
+    S3_ADAPTIVE_CONCURRENCY_MAX: Annotated[int, Field(ge=1)] = 256
+    S3_ADAPTIVE_CONCURRENCY_COOLDOWN: Annotated[float, Field(ge=0)] = 1.0
 
     model_config = SettingsConfigDict(env_prefix="AWS_")
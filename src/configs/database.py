@@ -0,0 +1,22 @@
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from configs.base import BaseConfig
+
+
+class DatabaseConfig(BaseConfig):
+    CATALOG_ENABLED: bool = Field(
+        default=False, description="Record stored assets in the asset catalog"
+    )
+    URL: str = Field(
+        default="sqlite+aiosqlite:///./catalog.db",
+        description="SQLAlchemy async URL of the catalog database",
+    )
+    ECHO: bool = Field(default=False, description="Log the SQL statements")
+    MIGRATE_ON_STARTUP: bool = Field(
+        default=True, description="Apply the Alembic migrations at startup"
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="DB_",
+    )
@@ -1,12 +1,176 @@
+import os
+from typing import List
+
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
 
 from configs.base import BaseSettings
+from shared.enums.services.core.file_system import CompressionCodecEnum
 
 
 class FileSystemConfig(BaseSettings):
     USE_AWS_S3: bool = Field(default=False, description="Use AWS S3 for file system")
     LOCAL_AWS_S3_PATH: str = Field(default="media", description="Local AWS S3 path")
+    S3_BUCKET: str | None = Field(default=None, description="Bucket for assets")
+    S3_BATCH_CONCURRENCY: int = Field(
+        default=32, ge=1, description="Max concurrent S3 requests per batch"
+    )
+    S3_PARALLEL_READS: bool = Field(
+        default=False, description="Download S3 objects as parallel ranged GETs"
+    )
+    S3_DELETE_CONCURRENCY: int = Field(
+        default=8, ge=1, description="Max concurrent S3 DeleteObjects requests"
+    )
+    LOCAL_IO_THREADS: int = Field(
+        default=min(32, (os.cpu_count() or 1) + 4),
+        ge=1,
+        description="Size of the thread pool used for local file system calls",
+    )
+    LOCAL_BATCH_CONCURRENCY: int = Field(
+        default=16, ge=1, description="Max concurrent local file operations per batch"
+    )
+    LOCAL_DURABLE_WRITES: bool = Field(
+        default=False,
+        description="Sync local writes to disk before acknowledging them",
+    )
+    LOCAL_GROUP_COMMIT_WINDOW_MS: float = Field(
+        default=2.0,
+        ge=0,
+        description="Time concurrent durable writes wait to share one sync",
+    )
+    LOCAL_LIST_BATCH_SIZE: int = Field(
+        default=1000, ge=1, description="Local files listed per thread pool call"
+    )
+    LOCAL_MMAP_MIN_BYTES: int = Field(
+        default=64 * 1024,
+        ge=0,
+        description="Smallest local file read through mmap by read_mapped",
+    )
+
+    BULK_UPLOAD_CONCURRENCY: int = Field(
+        default=16, ge=1, description="Max concurrent writes of a bulk upload"
+    )
+    BULK_UPLOAD_BATCH_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        description="Bulk upload bytes buffered before they are written as a batch",
+    )
+    BULK_UPLOAD_MAX_FILES: int = Field(
+        default=1000, ge=1, description="Max files stored by one bulk upload"
+    )
+    BULK_UPLOAD_MAX_FILE_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        ge=1,
+        description="Largest file accepted by a bulk upload",
+    )
+
+    PRESIGNED_URL_EXPIRY_SECONDS: int = Field(
+        default=900, ge=1, description="Default lifetime of presigned URLs"
+    )
+    PRESIGNED_URL_MAX_EXPIRY_SECONDS: int = Field(
+        default=3600,
+        ge=1,
+        le=7 * 24 * 3600,
+        description="Longest lifetime a client may request for a presigned URL",
+    )
+    PRESIGNED_UPLOAD_CONTENT_TYPES: List[str] = Field(
+        default_factory=list,
+        description="Content types accepted for direct uploads, any if empty",
+    )
+    PRESIGNED_UPLOAD_MAX_BYTES: int = Field(
+        default=5 * 1024 * 1024 * 1024,
+        ge=1,
+        description="Largest direct upload kept when it is completed",
+    )
+    TRANSFER_TOKEN_SECRET: str | None = Field(
+        default=None,
+        description="HMAC secret of local transfer tokens, random per process if unset",
+    )
+
+    CONTENT_ADDRESSED_UPLOADS: bool = Field(
+        default=False, description="Store uploads under their SHA-256 digest"
+    )
+    CAS_PREFIX: str = Field(default="cas", description="Prefix of stored content")
+    CAS_REFS_PREFIX: str = Field(
+        default="refs", description="Prefix of asset id to digest references"
+    )
+    CAS_SPOOL_MEMORY_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        ge=0,
+        description="Upload bytes kept in memory before spooling to disk",
+    )
+
+    COMPRESSION_ENABLED: bool = Field(
+        default=False, description="Compress compressible content on write"
+    )
+    COMPRESSION_CODEC: CompressionCodecEnum = Field(
+        default=CompressionCodecEnum.ZSTD,
+        description="Codec of compressed writes, gzip when zstandard is missing",
+    )
+    COMPRESSION_ZSTD_LEVEL: int = Field(
+        default=3, ge=1, le=22, description="zstd compression level"
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(
+        default=6, ge=1, le=9, description="gzip compression level"
+    )
+    COMPRESSION_MIN_BYTES: int = Field(
+        default=1024, ge=0, description="Smallest content that is compressed"
+    )
+    COMPRESSION_SAMPLE_BYTES: int = Field(
+        default=64 * 1024,
+        ge=1,
+        description="Leading bytes trial-compressed to decide on compression",
+    )
+    COMPRESSION_MAX_RATIO: float = Field(
+        default=0.9,
+        gt=0,
+        le=1,
+        description="Compressed to original size ratio the trial must reach",
+    )
+    COMPRESSION_SKIP_CONTENT_TYPES: List[str] = Field(
+        default=[
+            "image/jpeg",
+            "image/png",
+            "image/gif",
+            "image/webp",
+            "image/avif",
+            "image/heic",
+            "application/pdf",
+            "application/zip",
+            "application/gzip",
+            "application/x-gzip",
+            "application/zstd",
+            "application/x-bzip2",
+            "application/x-xz",
+            "application/x-7z-compressed",
+            "application/vnd.rar",
+            "application/vnd.openxmlformats-officedocument.*",
+            "font/woff",
+            "font/woff2",
+            "audio/*",
+            "video/*",
+        ],
+        description="Already compressed content types, fnmatch patterns",
+    )
+
+    CACHE_ENABLED: bool = Field(
+        default=False, description="Cache reads in memory and on local disk"
+    )
+    CACHE_MEMORY_BYTES: int = Field(
+        default=256 * 1024 * 1024, ge=0, description="Memory cache size in bytes"
+    )
+    CACHE_DISK_PATH: str = Field(
+        default=".cache/file_system", description="Directory of the disk cache"
+    )
+    CACHE_DISK_BYTES: int = Field(
+        default=2 * 1024 * 1024 * 1024, ge=0, description="Disk cache size in bytes"
+    )
+    CACHE_TTL_SECONDS: float = Field(
+        default=60.0, ge=0, description="Age after which cached files are revalidated"
+    )
+    CACHE_VALIDATE_ETAG: bool = Field(
+        default=True, description="Revalidate expired cached files by ETag"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="FS_",
@@ -0,0 +1,47 @@
+import os
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from configs.base import BaseConfig
+
+
+class MLConfig(BaseConfig):
+    WORKERS: int = Field(
+        default=os.cpu_count() or 1,
+        ge=1,
+        description="Processes in the document analysis pool",
+    )
+    START_METHOD: Literal["spawn", "forkserver", "fork"] = Field(
+        default="spawn", description="Start method of the analysis processes"
+    )
+    CONCURRENT_JOBS: int = Field(
+        default=4, ge=1, description="Jobs processed at the same time"
+    )
+    QUEUE_SIZE: int = Field(
+        default=100, ge=1, description="Jobs that may wait before submits are refused"
+    )
+    SHARD_SIZE: int = Field(
+        default=4 * 1024 * 1024,
+        ge=1,
+        description="Bytes of a document read and analysed as one shard",
+    )
+    SHARD_CONCURRENCY: int = Field(
+        default=os.cpu_count() or 1,
+        ge=1,
+        description="Shards of one job processed at the same time",
+    )
+    RESULTS_PREFIX: str = Field(
+        default="results", description="Prefix under which job results are stored"
+    )
+    CHECKPOINTS_PREFIX: str = Field(
+        default="checkpoints", description="Prefix of per-shard checkpoints"
+    )
+    JOB_RETENTION_SECONDS: float = Field(
+        default=3600.0, ge=0, description="How long finished jobs stay queryable"
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="ML_",
+    )
@@ -1,53 +1,673 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
+from botocore.exceptions import ClientError
 from loguru import logger
 
 from shared.factories.aws.s3 import AwsClientFactory, AwsEnvConfig
-from shared.helpers.aws.s3 import handle_s3_exceptions
+from shared.helpers.aws.s3 import (
+    S3_IDEMPOTENT_OPERATIONS,
+    backoff_delay,
+    handle_s3_exceptions,
+    is_s3_retryable_error,
+    is_s3_throttling_error,
+)
+from shared.helpers.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    map_bounded,
+    map_bounded_stream,
+)
+from shared.helpers.hedging import HedgePolicy
+from shared.helpers.metrics import MetricsRegistry, error_code, get_default_registry
+from shared.helpers.streams import DEFAULT_CHUNK_SIZE
+
+MULTIPART_MAX_PARTS = 10000
+
+
+class InstrumentedS3Client:
+    """
+    Proxy around a pooled S3 client that records every API call:
+    latency, in-flight count, errors by AWS error code and bytes moved.
+    Idempotent calls that fail transiently are retried with jittered
+    exponential backoff, and every outcome is reported to the adaptive
+    concurrency limiter.
+    """
+
+    def __init__(
+            self,
+            client: Any,
+            metrics: MetricsRegistry,
+            aws_env_config: AwsEnvConfig,
+            limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        self._client = client
+        self._metrics = metrics
+        self._aws_env_config = aws_env_config
+        self._limiter = limiter
+
+    @staticmethod
+    def _is_retryable_call(operation: str, kwargs: Dict[str, Any]) -> bool:
+        # A streamed body is consumed by the first attempt and cannot be resent.
+        body = kwargs.get("Body")
+        return operation in S3_IDEMPOTENT_OPERATIONS and (
+            body is None or isinstance(body, (bytes, bytearray, memoryview))
+        )
+
+    def _report(self, operation: str, error: Optional[BaseException]) -> None:
+        if self._limiter is None:
+            return
+
+        limit = self._limiter.limit
+        if error is None:
+            self._limiter.on_success()
+        elif is_s3_throttling_error(error):
+            self._metrics.increment("s3.throttled", operation=operation)
+            self._limiter.on_throttle()
+        if self._limiter.limit != limit:
+            self._metrics.add_gauge(
+                "s3.concurrency_limit", self._limiter.limit - limit
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        operation = self._client.meta.method_to_api_mapping.get(name)
+        if operation is None:
+            return attr
+
+        async def call(*args, **kwargs):
+            max_attempts = (
+                self._aws_env_config.S3_RETRY_MAX_ATTEMPTS
+                if self._is_retryable_call(operation, kwargs)
+                else 1
+            )
+            attempt = 1
+            while True:
+                try:
+                    with self._metrics.track("s3.request", operation):
+                        response = await attr(*args, **kwargs)
+                except Exception as e:
+                    self._report(operation, e)
+                    if attempt >= max_attempts or not is_s3_retryable_error(e):
+                        raise
+
+                    delay = backoff_delay(
+                        attempt,
+                        self._aws_env_config.S3_RETRY_BASE_DELAY,
+                        self._aws_env_config.S3_RETRY_MAX_DELAY,
+                    )
+                    self._metrics.increment(
+                        "s3.retries", operation=operation, error_code=error_code(e)
+                    )
+                    logger.warning(
+                        f"Retrying {operation} in {delay:.2f}s after attempt "
+                        f"{attempt}/{max_attempts} failed: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+                self._report(operation, None)
+                break
+
+            body = kwargs.get("Body")
+            if isinstance(body, (bytes, bytearray, memoryview)):
+                self._metrics.increment(
+                    "s3.bytes_out", len(body), operation=operation
+                )
+            if operation == "GetObject":
+                self._metrics.increment(
+                    "s3.bytes_in",
+                    response.get("ContentLength", 0),
+                    operation=operation,
+                )
+            return response
+
+        return call
 
 
 class AsyncS3Client:
     """Async S3 client that handles authentication using AWS credentials"""
 
-    def __init__(self, aws_env_config: AwsEnvConfig):
-        self.aws_client_factory = AwsClientFactory(aws_env_config)
+    def __init__(
+            self,
+            aws_env_config: AwsEnvConfig,
+            aws_client_factory: Optional[AwsClientFactory] = None,
+            metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.aws_env_config = aws_env_config
+        self.aws_client_factory = aws_client_factory or AwsClientFactory(
+            aws_env_config
+        )
+        self.metrics = metrics or get_default_registry()
+        self.limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if aws_env_config.S3_ADAPTIVE_CONCURRENCY_ENABLED:
+            self.limiter = AdaptiveConcurrencyLimiter(
+                initial=aws_env_config.S3_ADAPTIVE_CONCURRENCY_INITIAL,
+                minimum=aws_env_config.S3_ADAPTIVE_CONCURRENCY_MIN,
+                maximum=aws_env_config.S3_ADAPTIVE_CONCURRENCY_MAX,
+                cooldown_seconds=aws_env_config.S3_ADAPTIVE_CONCURRENCY_COOLDOWN,
+            )
+            self.metrics.add_gauge("s3.concurrency_limit", self.limiter.limit)
+        self.hedge_policy: Optional[HedgePolicy] = None
+        if aws_env_config.S3_HEDGED_READS:
+            self.hedge_policy = HedgePolicy(
+                percentile=aws_env_config.S3_HEDGE_PERCENTILE,
+                fixed_delay_ms=aws_env_config.S3_HEDGE_DELAY_MS,
+                min_delay_ms=aws_env_config.S3_HEDGE_MIN_DELAY_MS,
+                max_delay_ms=aws_env_config.S3_HEDGE_MAX_DELAY_MS,
+                budget_ratio=aws_env_config.S3_HEDGE_BUDGET_RATIO,
+            )
 
     @asynccontextmanager
     async def _get_client(self) -> AsyncGenerator:
         async with self.aws_client_factory.get_s3_client() as client:
-            yield client
+            yield InstrumentedS3Client(
+                client, self.metrics, self.aws_env_config, self.limiter
+            )
+
+    async def _get_object(self, client: Any, **kwargs) -> Dict[str, Any]:
+        """
+        GetObject, hedged when hedged reads are enabled.
+        The call returns once the response headers arrive, so its latency is
+        the time to first byte that the hedge delay is compared against.
+        """
+        if self.hedge_policy is None:
+            return await client.get_object(**kwargs)
+        return await self._hedged_get_object(client, self.hedge_policy, kwargs)
+
+    async def _send_hedge(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # Take the next pooled client so the duplicate uses another connection.
+        async with self._get_client() as client:
+            return await client.get_object(**kwargs)
+
+    @staticmethod
+    def _discard_response(task: asyncio.Task) -> None:
+        """
+        Close the body of a losing request that still produced a response.
+        """
+        if task.cancelled() or task.exception() is not None:
+            return
+        task.result()["Body"].close()
+
+    async def _hedged_get_object(
+            self,
+            client: Any,
+            policy: HedgePolicy,
+            kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Send a duplicate GetObject when the first one has not answered within
+        the hedge delay and the budget allows it. The first successful
+        response wins and the other request is cancelled.
+        """
+        policy.on_request()
+        started = time.perf_counter()
+        primary = asyncio.create_task(client.get_object(**kwargs))
+        pending = {primary}
+        try:
+            await asyncio.wait(pending, timeout=policy.delay_ms / 1000)
+            if not primary.done():
+                if policy.try_acquire():
+                    self.metrics.increment("s3.hedge.sent", operation="GetObject")
+                    pending.add(asyncio.create_task(self._send_hedge(kwargs)))
+                else:
+                    self.metrics.increment(
+                        "s3.hedge.over_budget", operation="GetObject"
+                    )
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (task for task in done if task.exception() is None), None
+                )
+                if winner is None:
+                    error = error or next(iter(done)).exception()
+                    continue
+
+                for task in done - {winner}:
+                    self._discard_response(task)
+                # When the hedge wins, the elapsed time is a lower bound of
+                # the primary's latency. It is recorded too, so slow reads are
+                # not left out of the percentile behind the hedge delay.
+                policy.record((time.perf_counter() - started) * 1000)
+                if winner is not primary:
+                    self.metrics.increment("s3.hedge.won", operation="GetObject")
+                return winner.result()
+            # Every request failed, so at least one error was kept
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(self._discard_response)
 
     @handle_s3_exceptions
     async def upload_file(
             self,
             key: str,
-            data: bytes,
+            data: bytes | AsyncIterable[bytes],
             bucket: str,
             content_type: Optional[str] = None,
             metadata: Optional[Dict[str, str]] = None,
             extra_args: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """Upload file to S3 bucket"""
+        """
+        Upload file to S3 bucket.
+        Bodies at or above the multipart threshold, either bytes or an async
+        chunk source, are sent as a parallel multipart upload. Streams are
+        held to one part of look-ahead: a stream that fills a part goes
+        multipart, so at most the in-flight parts are buffered.
+        """
         args = extra_args or {}
         if metadata:
             args["Metadata"] = metadata
         if content_type:
             args["ContentType"] = content_type
 
+        threshold = self.aws_env_config.S3_MULTIPART_THRESHOLD
+        if isinstance(data, (bytes, bytearray)):
+            if len(data) < threshold:
+                await self._put_object(bucket, key, bytes(data), args)
+                return
+
+            part_size = max(
+                self.aws_env_config.S3_MULTIPART_PART_SIZE,
+                -(-len(data) // MULTIPART_MAX_PARTS),
+            )
+            await self._multipart_upload(
+                bucket, key, self._split_bytes(bytes(data), part_size), args
+            )
+            return
+
+        # Buffer up to the first part of the stream to decide on multipart
+        part_size = self.aws_env_config.S3_MULTIPART_PART_SIZE
+        chunks = aiter(data)
+        head = bytearray()
+        exhausted = False
+        while len(head) < min(threshold, part_size):
+            try:
+                head += await anext(chunks)
+            except StopAsyncIteration:
+                exhausted = True
+                break
+
+        if exhausted and len(head) < threshold:
+            await self._put_object(bucket, key, bytes(head), args)
+            return
+
+        await self._multipart_upload(
+            bucket, key, self._split_stream(head, chunks, part_size), args
+        )
+
+    async def _put_object(
+            self, bucket: str, key: str, data: bytes, args: Dict[str, Any]
+    ) -> None:
         async with self._get_client() as client:
             await client.put_object(Bucket=bucket, Key=key, Body=data, **args)
             logger.debug(f"Successfully uploaded file to s3://{bucket}/{key}")
 
+    @staticmethod
+    async def _split_bytes(data: bytes, part_size: int) -> AsyncIterator[bytes]:
+        for offset in range(0, len(data), part_size):
+            yield data[offset:offset + part_size]
+
+    @staticmethod
+    async def _split_stream(
+            head: bytearray, chunks: AsyncIterator[bytes], part_size: int
+    ) -> AsyncIterator[bytes]:
+        buffer = head
+        while True:
+            while len(buffer) >= part_size:
+                yield bytes(buffer[:part_size])
+                del buffer[:part_size]
+            try:
+                buffer += await anext(chunks)
+            except StopAsyncIteration:
+                break
+        if buffer:
+            yield bytes(buffer)
+
+    @staticmethod
+    async def _number_parts(
+            parts: AsyncIterable[bytes],
+    ) -> AsyncIterator[Tuple[int, bytes]]:
+        part_number = 0
+        async for part in parts:
+            part_number += 1
+            if part_number > MULTIPART_MAX_PARTS:
+                raise ValueError(
+                    f"Multipart upload exceeds {MULTIPART_MAX_PARTS} parts, "
+                    f"increase the part size"
+                )
+            yield part_number, part
+
+    @staticmethod
+    async def _upload_part(
+            client: Any,
+            bucket: str,
+            key: str,
+            upload_id: str,
+            part_number: int,
+            body: bytes,
+    ) -> Dict[str, Any]:
+        response = await client.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    async def _multipart_upload(
+            self,
+            bucket: str,
+            key: str,
+            parts: AsyncIterable[bytes],
+            args: Dict[str, Any],
+    ) -> None:
+        """
+        Upload parts in parallel under the configured concurrency limit.
+        The upload is aborted if any part fails, so no orphaned parts remain.
+        """
+        async with self._get_client() as client:
+            response = await client.create_multipart_upload(
+                Bucket=bucket, Key=key, **args
+            )
+            upload_id = response["UploadId"]
+
+            async def upload_numbered_part(
+                    numbered_part: Tuple[int, bytes],
+            ) -> Dict[str, Any]:
+                part_number, body = numbered_part
+                return await self._upload_part(
+                    client, bucket, key, upload_id, part_number, body
+                )
+
+            try:
+                completed_parts = [
+                    part
+                    async for part in map_bounded_stream(
+                        upload_numbered_part,
+                        self._number_parts(parts),
+                        self.aws_env_config.S3_MULTIPART_CONCURRENCY,
+                        limiter=self.limiter,
+                    )
+                ]
+                completed_parts.sort(key=lambda part: part["PartNumber"])
+                await client.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": completed_parts},
+                )
+            except BaseException:
+                try:
+                    await client.abort_multipart_upload(
+                        Bucket=bucket, Key=key, UploadId=upload_id
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to abort multipart upload {upload_id} "
+                        f"for s3://{bucket}/{key}: {e}"
+                    )
+                raise
+
+            logger.debug(
+                f"Successfully uploaded file to s3://{bucket}/{key} "
+                f"in {len(completed_parts)} parts"
+            )
+
+    @handle_s3_exceptions
+    async def generate_presigned_urls(
+            self,
+            operation: str,
+            params: List[Dict[str, Any]],
+            expires_in: int,
+    ) -> List[str]:
+        """
+        Sign requests for operation, e.g. "put_object", that a client can
+        send straight to S3 until they expire. Signing is local, no request
+        is made, so one pooled client signs the whole list.
+        """
+        async with self._get_client() as client:
+            return [
+                await client.generate_presigned_url(
+                    ClientMethod=operation, Params=item, ExpiresIn=expires_in
+                )
+                for item in params
+            ]
+
     @handle_s3_exceptions
+    async def create_multipart_upload(
+            self, bucket: str, key: str, content_type: Optional[str] = None
+    ) -> str:
+        """Start a multipart upload and return its upload id"""
+        args = {"ContentType": content_type} if content_type else {}
+        async with self._get_client() as client:
+            response = await client.create_multipart_upload(
+                Bucket=bucket, Key=key, **args
+            )
+            return response["UploadId"]
+
+    @handle_s3_exceptions
+    async def complete_multipart_upload(
+            self,
+            bucket: str,
+            key: str,
+            upload_id: str,
+            parts: List[Dict[str, Any]],
+    ) -> None:
+        """Assemble the parts, given as PartNumber and ETag, into the object"""
+        async with self._get_client() as client:
+            await client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": sorted(parts, key=lambda part: part["PartNumber"])
+                },
+            )
+            logger.debug(
+                f"Successfully completed multipart upload {upload_id} "
+                f"to s3://{bucket}/{key}"
+            )
+
+    @handle_s3_exceptions
+    async def abort_multipart_upload(
+            self, bucket: str, key: str, upload_id: str
+    ) -> None:
+        """Abort a multipart upload and free its parts"""
+        async with self._get_client() as client:
+            await client.abort_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id
+            )
+
     async def download_file(self, bucket: str, key: str) -> bytes:
         """Download file from S3 bucket"""
+        data, _ = await self.download_object(bucket, key)
+        return data
+
+    @handle_s3_exceptions
+    async def download_object(
+            self, bucket: str, key: str
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Download file from S3 bucket together with the GetObject response,
+        whose ETag and metadata describe exactly the downloaded bytes.
+        """
         async with self._get_client() as client:
-            response = await client.get_object(Bucket=bucket, Key=key)
+            response = await self._get_object(client, Bucket=bucket, Key=key)
             async with response["Body"] as stream:
                 data = await stream.read()
                 logger.debug(f"Successfully downloaded file from s3://{bucket}/{key}")
-                return data
+                return data, response
+
+    @staticmethod
+    def _range_header(offset: int, length: Optional[int]) -> str:
+        if length is None:
+            return f"bytes={offset}-"
+        return f"bytes={offset}-{offset + length - 1}"
+
+    @handle_s3_exceptions
+    async def head_object(self, bucket: str, key: str) -> Dict:
+        """Fetch object metadata without its body"""
+        async with self._get_client() as client:
+            return await client.head_object(Bucket=bucket, Key=key)
+
+    @handle_s3_exceptions
+    async def object_exists(self, bucket: str, key: str) -> bool:
+        """Check whether an object exists with a HEAD request"""
+        async with self._get_client() as client:
+            try:
+                await client.head_object(Bucket=bucket, Key=key)
+            except ClientError as e:
+                if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                    return False
+                raise
+            return True
+
+    @handle_s3_exceptions
+    async def download_range(
+            self,
+            bucket: str,
+            key: str,
+            offset: int,
+            length: Optional[int] = None,
+            etag: Optional[str] = None,
+    ) -> bytes:
+        """
+        Download a byte range of a file from S3 bucket.
+        With etag the range is only read from that version of the object.
+        """
+        if length == 0:
+            return b""
+
+        args: Dict[str, Any] = {}
+        if etag is not None:
+            args["IfMatch"] = etag
+        async with self._get_client() as client:
+            response = await self._get_object(
+                client,
+                Bucket=bucket,
+                Key=key,
+                Range=self._range_header(offset, length),
+                **args,
+            )
+            async with response["Body"] as stream:
+                return await stream.read()
+
+    @handle_s3_exceptions
+    async def iter_download(
+            self,
+            bucket: str,
+            key: str,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            offset: int = 0,
+            length: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or a byte range of it, from S3 bucket in chunks"""
+        if length == 0:
+            return
+
+        args: Dict[str, Any] = {}
+        if offset or length is not None:
+            args["Range"] = self._range_header(offset, length)
+
+        async with self._get_client() as client:
+            response = await self._get_object(client, Bucket=bucket, Key=key, **args)
+            body = response["Body"]
+            async with body:
+                async for chunk in body.iter_chunks(chunk_size):
+                    yield chunk
+
+    async def download_file_parallel(
+            self,
+            bucket: str,
+            key: str,
+            part_size: Optional[int] = None,
+            concurrency: Optional[int] = None,
+    ) -> bytes:
+        """Download file from S3 bucket as parallel ranged GETs"""
+        data, _ = await self.download_object_parallel(
+            bucket, key, part_size=part_size, concurrency=concurrency
+        )
+        return data
+
+    @handle_s3_exceptions
+    async def download_object_parallel(
+            self,
+            bucket: str,
+            key: str,
+            part_size: Optional[int] = None,
+            concurrency: Optional[int] = None,
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Download file from S3 bucket as parallel ranged GETs, together with
+        the response to the first one.
+        The first range also reveals the object size, so no HEAD is needed
+        and small objects still cost a single request. The other ranges are
+        bound to its ETag, so all of them come from the same version.
+        """
+        part_size = part_size or self.aws_env_config.S3_RANGE_PART_SIZE
+        concurrency = concurrency or self.aws_env_config.S3_RANGE_CONCURRENCY
+
+        async with self._get_client() as client:
+            try:
+                response = await self._get_object(
+                    client,
+                    Bucket=bucket,
+                    Key=key,
+                    Range=self._range_header(0, part_size),
+                )
+            except ClientError as e:
+                # A range starting at 0 is only unsatisfiable for empty
+                # objects, which a plain GET returns with their headers.
+                if e.response["Error"]["Code"] == "InvalidRange":
+                    return await self.download_object(bucket, key)
+                raise
+            async with response["Body"] as stream:
+                head = await stream.read()
+
+        content_range = response.get("ContentRange")
+        total_size = (
+            int(content_range.rsplit("/", 1)[1]) if content_range else len(head)
+        )
+        if total_size <= len(head):
+            return head, response
+
+        offsets = range(len(head), total_size, part_size)
+        parts = await map_bounded(
+            lambda offset: self.download_range(
+                bucket,
+                key,
+                offset,
+                min(part_size, total_size - offset),
+                etag=response.get("ETag"),
+            ),
+            offsets,
+            concurrency,
+            limiter=self.limiter,
+        )
+        logger.debug(
+            f"Successfully downloaded file from s3://{bucket}/{key} "
+            f"in {len(parts) + 1} ranges"
+        )
+        return b"".join([head, *parts]), response
 
     @handle_s3_exceptions
     async def list_objects(
@@ -63,6 +683,60 @@ class AsyncS3Client:
             )
             return response
 
+    @handle_s3_exceptions
+    async def iter_list_pages(
+            self,
+            bucket: str,
+            prefix: str,
+            page_size: int = 1000,
+            prefetch: bool = True,
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Walk every page of objects with prefix, following continuation tokens.
+        With prefetch enabled the next page is requested while the caller
+        consumes the current one.
+        """
+        async with self._get_client() as client:
+            async def fetch_page(token: Optional[str]) -> Dict:
+                kwargs: Dict[str, Any] = {
+                    "Bucket": bucket,
+                    "Prefix": prefix,
+                    "MaxKeys": page_size,
+                }
+                if token:
+                    kwargs["ContinuationToken"] = token
+                return await client.list_objects_v2(**kwargs)
+
+            token: Optional[str] = None
+            next_page: Optional[asyncio.Task] = None
+            try:
+                while True:
+                    if next_page:
+                        response = await next_page
+                        next_page = None
+                    else:
+                        response = await fetch_page(token)
+
+                    token = (
+                        response.get("NextContinuationToken")
+                        if response.get("IsTruncated")
+                        else None
+                    )
+                    if token and prefetch:
+                        next_page = asyncio.create_task(fetch_page(token))
+
+                    yield response.get("Contents", [])
+
+                    if not token:
+                        break
+            finally:
+                if next_page:
+                    next_page.cancel()
+
+            logger.debug(
+                f"Successfully listed objects with prefix '{prefix}' in bucket '{bucket}'"
+            )
+
     @handle_s3_exceptions
     async def delete_object(self, key: str, bucket: str) -> None:
         """Delete an object from S3 bucket"""
@@ -71,9 +745,14 @@ class AsyncS3Client:
             logger.debug(f"Successfully deleted s3://{bucket}/{key}")
 
     @handle_s3_exceptions
-    async def delete_objects(self, keys: list[str], bucket: str) -> None:
-        """Delete multiple objects from S3 bucket"""
+    async def delete_objects(
+            self, keys: list[str], bucket: str, quiet: bool = False
+    ) -> Dict:
+        """Delete up to 1000 objects from S3 bucket in a single request"""
         async with self._get_client() as client:
             objects = [{"Key": key} for key in keys]
-            await client.delete_objects(Bucket=bucket, Delete={"Objects": objects})
+            response = await client.delete_objects(
+                Bucket=bucket, Delete={"Objects": objects, "Quiet": quiet}
+            )
             logger.debug(f"Successfully deleted objects from s3://{bucket}")
+            return response
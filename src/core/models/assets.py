@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class AssetModel(Base):
+    """
+    One stored asset. Several assets can point to the same key when
+    content-addressed uploads deduplicate identical content.
+    """
+
+    __tablename__ = "assets"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(16))
+    # An empty string for providers without buckets keeps the composite
+    # indexes usable, NULLs would not compare equal.
+    bucket: Mapped[str] = mapped_column(String(255), default="")
+    key: Mapped[str] = mapped_column(String(1024))
+    size: Mapped[int | None] = mapped_column(BigInteger)
+    content_type: Mapped[str | None] = mapped_column(String(255))
+    digest: Mapped[str | None] = mapped_column(String(64))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utc_now
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utc_now, onupdate=_utc_now
+    )
+
+    __table_args__ = (
+        Index("ix_assets_location_key", "provider", "bucket", "key"),
+        Index("ix_assets_location_created_at", "provider", "bucket", "created_at"),
+        Index("ix_assets_digest", "digest"),
+    )
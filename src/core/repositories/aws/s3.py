@@ -1,33 +1,194 @@
+from dataclasses import replace
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+
+from loguru import logger
+
 from core.clients.aws.s3 import AsyncS3Client
+from shared.dataclasses.services.core.file_system import DeleteSummary, ObjectInfo
+from shared.helpers.concurrency import map_bounded, map_bounded_stream
+
+DELETE_OBJECTS_MAX_KEYS = 1000
 
 
 class S3Repository(AsyncS3Client):
-    def __init__(self, **kwargs):
+    def __init__(self, delete_concurrency: int = 8, **kwargs):
         super().__init__(**kwargs)
+        self.delete_concurrency = delete_concurrency
 
-    async def get_file(self, bucket: str, path: str) -> bytes:
+    async def get_file(
+            self, bucket: str, path: str, parallel: bool = False
+    ) -> bytes:
+        if parallel:
+            return await self.download_file_parallel(
+                bucket=bucket,
+                key=path,
+            )
         return await self.download_file(
             bucket=bucket,
             key=path,
         )
 
-    async def list_file(self, bucket: str, prefix: str) -> list:
-        response = await self.list_objects(
+    async def get_file_with_info(
+            self, bucket: str, path: str, parallel: bool = False
+    ) -> tuple[bytes, ObjectInfo]:
+        """
+        Read a file together with the ETag, content type and metadata of
+        the version that was read, taken from the GET response.
+        """
+        if parallel:
+            data, response = await self.download_object_parallel(
+                bucket=bucket,
+                key=path,
+            )
+        else:
+            data, response = await self.download_object(
+                bucket=bucket,
+                key=path,
+            )
+        return data, replace(self._object_info(path, response), size=len(data))
+
+    async def file_exists(self, bucket: str, path: str) -> bool:
+        return await self.object_exists(
             bucket=bucket,
-            prefix=prefix,
+            key=path,
         )
-        return [
-            obj["Key"] for obj in response.get("Contents", []) if obj["Key"] != prefix
-        ]
+
+    async def get_file_info(self, bucket: str, path: str) -> ObjectInfo:
+        response = await self.head_object(
+            bucket=bucket,
+            key=path,
+        )
+        return self._object_info(path, response)
+
+    @staticmethod
+    def _object_info(path: str, response: Dict[str, Any]) -> ObjectInfo:
+        return ObjectInfo(
+            key=path,
+            size=response.get("ContentLength"),
+            etag=response.get("ETag"),
+            last_modified=response.get("LastModified"),
+            content_type=response.get("ContentType"),
+            metadata=response.get("Metadata"),
+        )
+
+    async def get_file_range(
+            self, bucket: str, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self.download_range(
+            bucket=bucket,
+            key=path,
+            offset=offset,
+            length=length,
+        )
+
+    def iter_file(
+            self,
+            bucket: str,
+            path: str,
+            chunk_size: int,
+            offset: int = 0,
+            length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        return self.iter_download(
+            bucket=bucket,
+            key=path,
+            chunk_size=chunk_size,
+            offset=offset,
+            length=length,
+        )
+
+    async def iter_files(
+            self,
+            bucket: str,
+            prefix: str,
+            with_metadata: bool = False,
+            prefetch: bool = True,
+    ) -> AsyncIterator[ObjectInfo]:
+        async for page in self.iter_list_pages(
+            bucket=bucket,
+            prefix=prefix,
+            prefetch=prefetch,
+        ):
+            for obj in page:
+                if obj["Key"] == prefix:
+                    continue
+                if with_metadata:
+                    yield ObjectInfo(
+                        key=obj["Key"],
+                        size=obj.get("Size"),
+                        etag=obj.get("ETag"),
+                        last_modified=obj.get("LastModified"),
+                    )
+                else:
+                    yield ObjectInfo(key=obj["Key"])
+
+    async def list_file(self, bucket: str, prefix: str) -> list:
+        return [obj.key async for obj in self.iter_files(bucket, prefix)]
 
     async def put_file(
-            self, bucket: str, path: str, data: bytes, content_type: str | None = None
+            self,
+            bucket: str,
+            path: str,
+            data: bytes | AsyncIterable[bytes],
+            content_type: str | None = None,
+            metadata: Dict[str, str] | None = None,
     ) -> None:
         await self.upload_file(
             bucket=bucket,
             key=path,
             data=data,
             content_type=content_type,
+            metadata=metadata,
+        )
+
+    async def presign_get_file(
+            self, bucket: str, path: str, expires_in: int
+    ) -> str:
+        urls = await self.generate_presigned_urls(
+            operation="get_object",
+            params=[{"Bucket": bucket, "Key": path}],
+            expires_in=expires_in,
+        )
+        return urls[0]
+
+    async def presign_put_file(
+            self,
+            bucket: str,
+            path: str,
+            expires_in: int,
+            content_type: str | None = None,
+    ) -> str:
+        params = {"Bucket": bucket, "Key": path}
+        if content_type:
+            # Signed as a header, so the upload must send this exact type
+            params["ContentType"] = content_type
+        urls = await self.generate_presigned_urls(
+            operation="put_object",
+            params=[params],
+            expires_in=expires_in,
+        )
+        return urls[0]
+
+    async def presign_file_parts(
+            self,
+            bucket: str,
+            path: str,
+            upload_id: str,
+            part_count: int,
+            expires_in: int,
+    ) -> List[str]:
+        return await self.generate_presigned_urls(
+            operation="upload_part",
+            params=[
+                {
+                    "Bucket": bucket,
+                    "Key": path,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                }
+                for part_number in range(1, part_count + 1)
+            ],
+            expires_in=expires_in,
         )
 
     async def delete_file(self, bucket: str, path: str) -> None:
@@ -36,24 +197,68 @@ class S3Repository(AsyncS3Client):
             key=path,
         )
 
-    async def delete_files(self, bucket: str, keys: list[str]) -> None:
-        await self.delete_objects(
-            bucket=bucket,
-            keys=keys,
-        )
+    async def _delete_chunk(self, bucket: str, keys: List[str]) -> DeleteSummary:
+        try:
+            response = await self.delete_objects(bucket=bucket, keys=keys, quiet=True)
+        except Exception as e:
+            return DeleteSummary(errors={key: str(e) for key in keys})
 
-    async def delete_files_by_prefix(self, bucket: str, prefix: str) -> None:
-        objects = await self.list_objects(
-            bucket=bucket,
-            prefix=prefix,
+        errors = {
+            error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+            for error in response.get("Errors", [])
+        }
+        return DeleteSummary(deleted=len(keys) - len(errors), errors=errors)
+
+    async def _iter_key_chunks(
+            self, bucket: str, prefix: str
+    ) -> AsyncIterator[List[str]]:
+        chunk: List[str] = []
+        async for page in self.iter_list_pages(bucket=bucket, prefix=prefix):
+            for obj in page:
+                chunk.append(obj["Key"])
+                if len(chunk) == DELETE_OBJECTS_MAX_KEYS:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    async def delete_files(self, bucket: str, keys: list[str]) -> DeleteSummary:
+        chunks = [
+            keys[i:i + DELETE_OBJECTS_MAX_KEYS]
+            for i in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS)
+        ]
+        results = await map_bounded(
+            lambda chunk: self._delete_chunk(bucket, chunk),
+            chunks,
+            self.delete_concurrency,
+            limiter=self.limiter,
         )
-        keys = [obj["Key"] for obj in objects.get("Contents", [])]
-        if keys:
-            await self.delete_objects(
-                bucket=bucket,
-                keys=keys,
-            )
-        else:
+        summary = DeleteSummary()
+        for result in results:
+            summary.merge(result)
+        return summary
+
+    async def delete_files_by_prefix(self, bucket: str, prefix: str) -> DeleteSummary:
+        """
+        Stream every key under prefix and delete them in chunks of up to
+        1000 keys, with several DeleteObjects requests in flight.
+        """
+        summary = DeleteSummary()
+        async for result in map_bounded_stream(
+            lambda chunk: self._delete_chunk(bucket, chunk),
+            self._iter_key_chunks(bucket, prefix),
+            self.delete_concurrency,
+            limiter=self.limiter,
+        ):
+            summary.merge(result)
+
+        if not summary.deleted and not summary.errors:
             raise ValueError(
                 f"No objects found with prefix '{prefix}' in bucket '{bucket}'"
             )
+        if summary.errors:
+            logger.warning(
+                f"Failed to delete {len(summary.errors)} objects with prefix "
+                f"'{prefix}' in bucket '{bucket}'"
+            )
+        return summary
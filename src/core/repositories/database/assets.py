@@ -0,0 +1,283 @@
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Set, cast
+
+from sqlalchemy import CursorResult, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.models.assets import AssetModel
+from shared.dataclasses.services.core.assets import AssetRecord
+
+# Stays below the bound-parameter limit of every supported database
+DELETE_KEYS_CHUNK_SIZE = 500
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Smallest string greater than every string starting with prefix, so a
+    prefix match becomes an index range scan instead of a LIKE.
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    # SQLite returns naive datetimes even for timezone-aware columns
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class AssetRepository:
+    """
+    Asset catalog stored in a SQL database. Every query is answered from
+    the (provider, bucket, key) or (provider, bucket, created_at) index.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+
+    @staticmethod
+    def _to_record(model: AssetModel) -> AssetRecord:
+        return AssetRecord(
+            asset_id=model.id,
+            provider=model.provider,
+            bucket=model.bucket or None,
+            key=model.key,
+            size=model.size,
+            content_type=model.content_type,
+            digest=model.digest,
+            created_at=_as_utc(model.created_at),
+            updated_at=_as_utc(model.updated_at),
+        )
+
+    @staticmethod
+    def _to_model(record: AssetRecord) -> AssetModel:
+        return AssetModel(
+            id=record.asset_id,
+            provider=record.provider,
+            bucket=record.bucket or "",
+            key=record.key,
+            size=record.size,
+            content_type=record.content_type,
+            digest=record.digest,
+        )
+
+    @staticmethod
+    async def _delete_key_rows(
+            session: AsyncSession, records: List[AssetRecord]
+    ) -> None:
+        for record in records:
+            await session.execute(
+                delete(AssetModel).where(
+                    AssetModel.provider == record.provider,
+                    AssetModel.bucket == (record.bucket or ""),
+                    AssetModel.key == record.key,
+                )
+            )
+
+    async def add(
+            self, record: AssetRecord, replace_key: bool = False
+    ) -> AssetRecord:
+        """
+        Add an asset. With replace_key the rows of other assets at its key
+        are removed in the same transaction, so the key holds this asset only.
+        """
+        async with self.session_maker.begin() as session:
+            if replace_key:
+                await self._delete_key_rows(session, [record])
+            model = self._to_model(record)
+            session.add(model)
+            await session.flush()
+            return self._to_record(model)
+
+    async def add_batch(
+            self, records: Iterable[AssetRecord], replace_keys: bool = False
+    ) -> List[AssetRecord]:
+        """
+        Add several assets in one transaction; none is added if one fails.
+        replace_keys works as replace_key of add.
+        """
+        records = list(records)
+        async with self.session_maker.begin() as session:
+            if replace_keys:
+                await self._delete_key_rows(session, records)
+            models = [self._to_model(record) for record in records]
+            session.add_all(models)
+            await session.flush()
+            return [self._to_record(model) for model in models]
+
+    async def record_keys(self, records: Iterable[AssetRecord]) -> None:
+        """
+        Record the content just written at the keys of records in one
+        transaction. The rows of a key are updated with its new size and
+        content type; a key without rows gets one under the asset id of its
+        record.
+        """
+        async with self.session_maker.begin() as session:
+            for record in records:
+                result = cast(CursorResult[Any], await session.execute(
+                    update(AssetModel)
+                    .where(
+                        AssetModel.provider == record.provider,
+                        AssetModel.bucket == (record.bucket or ""),
+                        AssetModel.key == record.key,
+                    )
+                    .values(size=record.size, content_type=record.content_type)
+                ))
+                if not result.rowcount:
+                    session.add(self._to_model(record))
+
+    async def get(self, asset_id: str) -> AssetRecord | None:
+        async with self.session_maker() as session:
+            model = await session.get(AssetModel, asset_id)
+            return self._to_record(model) if model else None
+
+    async def key_exists(self, provider: str, bucket: str | None, key: str) -> bool:
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(AssetModel.id)
+                .where(
+                    AssetModel.provider == provider,
+                    AssetModel.bucket == (bucket or ""),
+                    AssetModel.key == key,
+                )
+                .limit(1)
+            )
+            return result.first() is not None
+
+    async def content_keys(
+            self, provider: str, bucket: str | None, keys: Iterable[str]
+    ) -> Set[str]:
+        """
+        The keys that hold content-addressed assets, which may be shared.
+        """
+        keys = list(keys)
+        found: Set[str] = set()
+        async with self.session_maker() as session:
+            for start in range(0, len(keys), DELETE_KEYS_CHUNK_SIZE):
+                result = await session.scalars(
+                    select(AssetModel.key)
+                    .where(
+                        AssetModel.provider == provider,
+                        AssetModel.bucket == (bucket or ""),
+                        AssetModel.key.in_(keys[start:start + DELETE_KEYS_CHUNK_SIZE]),
+                        AssetModel.digest.is_not(None),
+                    )
+                    .distinct()
+                )
+                found.update(result)
+        return found
+
+    async def list(
+            self,
+            provider: str,
+            bucket: str | None,
+            prefix: str = "",
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+            limit: int = 1000,
+            start_after: str | None = None,
+    ) -> List[AssetRecord]:
+        """
+        Assets under a key prefix or created in a time range, whichever is
+        given; a prefix query is ordered by key and a time range query by
+        creation time. start_after continues a key-ordered listing.
+        """
+        query = select(AssetModel).where(
+            AssetModel.provider == provider,
+            AssetModel.bucket == (bucket or ""),
+        )
+        if prefix:
+            query = query.where(AssetModel.key >= prefix)
+            upper_bound = _prefix_upper_bound(prefix)
+            if upper_bound is not None:
+                query = query.where(AssetModel.key < upper_bound)
+        if start_after is not None:
+            query = query.where(AssetModel.key > start_after)
+        if created_after is not None:
+            query = query.where(AssetModel.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(AssetModel.created_at < created_before)
+
+        if prefix or start_after is not None or (
+            created_after is None and created_before is None
+        ):
+            query = query.order_by(AssetModel.key, AssetModel.id)
+        else:
+            query = query.order_by(AssetModel.created_at, AssetModel.id)
+
+        async with self.session_maker() as session:
+            result = await session.scalars(query.limit(limit))
+            return [self._to_record(model) for model in result]
+
+    async def delete(self, asset_id: str) -> tuple[AssetRecord | None, bool]:
+        """
+        Delete an asset. Returns its record, None if it is unknown, and
+        whether other assets still point to its key.
+        """
+        async with self.session_maker.begin() as session:
+            model = await session.get(AssetModel, asset_id)
+            if model is None:
+                return None, False
+            record = self._to_record(model)
+            await session.delete(model)
+            await session.flush()
+            result = await session.execute(
+                select(AssetModel.id)
+                .where(
+                    AssetModel.provider == model.provider,
+                    AssetModel.bucket == model.bucket,
+                    AssetModel.key == model.key,
+                )
+                .limit(1)
+            )
+            return record, result.first() is not None
+
+    async def delete_keys(
+            self, provider: str, bucket: str | None, keys: Iterable[str]
+    ) -> int:
+        keys = list(keys)
+        deleted = 0
+        async with self.session_maker.begin() as session:
+            for start in range(0, len(keys), DELETE_KEYS_CHUNK_SIZE):
+                statement = delete(AssetModel).where(
+                    AssetModel.provider == provider,
+                    AssetModel.bucket == (bucket or ""),
+                    AssetModel.key.in_(keys[start:start + DELETE_KEYS_CHUNK_SIZE]),
+                )
+                result: CursorResult[Any] = cast(
+                    CursorResult[Any], await session.execute(statement)
+                )
+                deleted += result.rowcount or 0
+        return deleted
+
+    async def delete_prefix(
+            self,
+            provider: str,
+            bucket: str | None,
+            prefix: str,
+            exclude: Iterable[str] = (),
+    ) -> int:
+        """
+        Delete the assets under a key prefix, except the excluded keys.
+        """
+        query = delete(AssetModel).where(
+            AssetModel.provider == provider,
+            AssetModel.bucket == (bucket or ""),
+            AssetModel.key >= prefix,
+        )
+        upper_bound = _prefix_upper_bound(prefix)
+        if upper_bound is not None:
+            query = query.where(AssetModel.key < upper_bound)
+        exclude = list(exclude)
+        if exclude:
+            query = query.where(AssetModel.key.not_in(exclude))
+        async with self.session_maker.begin() as session:
+            result: CursorResult[Any] = cast(
+                CursorResult[Any], await session.execute(query)
+            )
+            return result.rowcount or 0
@@ -1,13 +1,44 @@
+import inspect
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Sequence,
+    Set,
+)
 
 from loguru import logger
 
 from configs.file_system import FileSystemConfig
+from shared.dataclasses.services.core.assets import AssetRecord, AssetUpload
+from shared.dataclasses.services.core.file_system import (
+    BatchResult,
+    ContentAddressedWrite,
+    DeleteSummary,
+    ObjectInfo,
+    PresignedMultipartUpload,
+)
 from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.exceptions.assets import (
+    FileTooLargeError,
+    PresignedUrlsUnsupportedError,
+)
+from shared.helpers.concurrency import AdaptiveConcurrencyLimiter, map_bounded
+from shared.helpers.metrics import MetricsRegistry, get_default_registry
+from shared.helpers.streams import DEFAULT_CHUNK_SIZE
 from .base import BaseFSProcessor
+from .catalog import AssetCatalog
+from .codec import FSCodec
+from .content import ContentStore
 from .local import LocalFSProcessor
 from .s3 import S3FSProcessor
+from ...repositories.database.assets import AssetRepository
 
 
 @dataclass
@@ -17,17 +48,82 @@ class FSAggregatorConfig:
 
     fs_config: FileSystemConfig
 
+    # Serves S3 paths from the local disk while S3 is disabled.
+    local_s3_fs_processor: LocalFSProcessor | None = None
+
+    metrics: MetricsRegistry | None = None
+
+    # Records stored assets so they can be looked up without the backend.
+    asset_repository: AssetRepository | None = None
+
 
 class FSAggregator:
     def __init__(self, config: FSAggregatorConfig):
         self._local_fs_processor = config.local_fs_processor
         self._s3_fs_processor = config.s3_fs_processor
         self._fs_config = config.fs_config
+        self._local_s3_fs_processor = (
+            config.local_s3_fs_processor
+            or LocalFSProcessor(
+                target_provider=FSProvidersEnum.S3,
+                fs_config=self._fs_config,
+            )
+        )
+        self._metrics = config.metrics or get_default_registry()
+        # Rollbacks go through delete_batch, so subclasses see them
+        self._catalog = AssetCatalog(config.asset_repository, self.delete_batch)
+        self._content = ContentStore(self, self._catalog)
+
+        self._codec = FSCodec(self._fs_config, self._metrics)
 
     @property
     def fs_config(self) -> FileSystemConfig:
         return self._fs_config
 
+    @property
+    def metrics(self) -> MetricsRegistry:
+        return self._metrics
+
+    @property
+    def catalog_enabled(self) -> bool:
+        return self._catalog.enabled
+
+    def _track(self, operation: str, provider: FSProvidersEnum):
+        """
+        Record latency, in-flight count and errors of an operation.
+        """
+        return self._metrics.track("file_system", operation, provider=provider)
+
+    def _count_bytes(
+            self, direction: str, provider: FSProvidersEnum, size: int
+    ) -> None:
+        self._metrics.increment(
+            f"file_system.bytes_{direction}", size, provider=provider
+        )
+
+    async def _count_chunks(
+            self,
+            chunks: AsyncIterable[bytes],
+            provider: FSProvidersEnum,
+    ) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            self._count_bytes("written", provider, len(chunk))
+            yield chunk
+
+    async def _count_read_chunks(
+            self,
+            chunks: AsyncIterator[bytes],
+            provider: FSProvidersEnum,
+    ) -> AsyncGenerator[bytes, None]:
+        try:
+            async for chunk in chunks:
+                self._count_bytes("read", provider, len(chunk))
+                yield chunk
+        finally:
+            # Release the response of a stream that is abandoned early
+            if inspect.isasyncgen(chunks):
+                await chunks.aclose()
+
     def __get_fs_processor(
             self,
             provider: FSProvidersEnum,
@@ -37,12 +133,34 @@ class FSAggregator:
                 return self._local_fs_processor
             case FSProvidersEnum.S3 if self._fs_config.USE_AWS_S3:
                 return self._s3_fs_processor
-            case _:
+            case FSProvidersEnum.S3:
                 logger.warning(
                     f"Provider {provider} is disabled. Using local file system."
                 )
-                self._local_fs_processor.target_provider = provider
-                return self._local_fs_processor
+                return self._local_s3_fs_processor
+            case _:
+                raise ValueError(f"Provider {provider} is not supported.")
+
+    def batch_limiter(
+            self, provider: FSProvidersEnum
+    ) -> AdaptiveConcurrencyLimiter | None:
+        """
+        Adaptive concurrency limit shared by the batch operations of provider.
+        """
+        return self.__get_fs_processor(provider).batch_limiter
+
+    def batch_concurrency(self, provider: FSProvidersEnum) -> int:
+        """
+        Default number of files a batch operation of provider works on at once.
+        """
+        return self.__get_fs_processor(provider).batch_concurrency
+
+    def local_path(self, provider: FSProvidersEnum, path: str) -> str | None:
+        """
+        Return the file path on the local disk if the provider is served
+        by the local file system, otherwise None.
+        """
+        return self.__get_fs_processor(provider).local_path(path)
 
     @classmethod
     def parse_s3_path(cls, s3_path: str) -> tuple[str, str]:
@@ -55,10 +173,54 @@ class FSAggregator:
             bucket: str | None = None,
     ) -> list[str]:
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.list(
-            prefix=prefix,
-            bucket=bucket,
-        )
+        with self._track("list", provider):
+            return await fs_processor.list(
+                prefix=prefix,
+                bucket=bucket,
+            )
+
+    async def iter_list(
+            self,
+            provider: FSProvidersEnum,
+            prefix: str,
+            bucket: str | None = None,
+            with_metadata: bool = False,
+    ) -> AsyncIterator[ObjectInfo]:
+        fs_processor = self.__get_fs_processor(provider)
+        with self._track("iter_list", provider):
+            async for obj in fs_processor.iter_list(
+                prefix=prefix,
+                bucket=bucket,
+                with_metadata=with_metadata,
+            ):
+                yield obj
+
+    async def exists(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+    ) -> bool:
+        fs_processor = self.__get_fs_processor(provider)
+        with self._track("exists", provider):
+            return await fs_processor.exists(
+                path=path,
+                bucket=bucket,
+            )
+
+    async def stat(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+    ) -> ObjectInfo:
+        fs_processor = self.__get_fs_processor(provider)
+        with self._track("stat", provider):
+            info = await fs_processor.stat(
+                path=path,
+                bucket=bucket,
+            )
+            return await self._codec.logical_info(fs_processor, path, bucket, info)
 
     async def read(
             self,
@@ -66,10 +228,173 @@ class FSAggregator:
             path: str,
             bucket: str | None = None,
     ) -> bytes:
+        data, _ = await self.read_with_info(
+            provider=provider, path=path, bucket=bucket
+        )
+        return data
+
+    async def read_with_info(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+    ) -> tuple[bytes, ObjectInfo]:
+        """
+        Read a file together with the ETag of the version that was read,
+        taken from the same request, as is the codec it is decoded with.
+        """
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.read(
-            path=path,
-            bucket=bucket,
+        with self._track("read", provider):
+            data, info = await fs_processor.read_with_info(
+                path=path,
+                bucket=bucket,
+            )
+        self._count_bytes("read", provider, len(data))
+        return await self._codec.decode(fs_processor, path, bucket, data, info), info
+
+    async def read_mapped(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+    ) -> memoryview:
+        """
+        Read a file as a read-only buffer that parsers can work on in place.
+        Files on the local disk are memory-mapped instead of copied; other
+        providers return a view of read(), as do compressed files.
+        """
+        fs_processor = self.__get_fs_processor(provider)
+        with self._track("read_mapped", provider):
+            view, info = await fs_processor.read_mapped(path=path, bucket=bucket)
+        self._count_bytes("read", provider, view.nbytes)
+        return await self._codec.decode_view(fs_processor, path, bucket, view, info)
+
+    async def read_range(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            offset: int,
+            length: int | None = None,
+            bucket: str | None = None,
+            info: ObjectInfo | None = None,
+    ) -> bytes:
+        """
+        Read a byte range of the content. info, as returned by stat, tells
+        whether the content is compressed without another metadata request.
+        """
+        fs_processor = self.__get_fs_processor(provider)
+        with self._track("read_range", provider):
+            codec = await self._codec.stored_codec(fs_processor, path, bucket, info)
+            if codec:
+                chunks = self._codec.slice_stream(
+                    self._iter_decoded(
+                        fs_processor, provider, path, bucket, DEFAULT_CHUNK_SIZE, info
+                    ),
+                    offset,
+                    length,
+                )
+                return b"".join([chunk async for chunk in chunks])
+            data = await fs_processor.read_range(
+                path=path,
+                bucket=bucket,
+                offset=offset,
+                length=length,
+            )
+        self._count_bytes("read", provider, len(data))
+        return data
+
+    async def iter_read(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            offset: int = 0,
+            length: int | None = None,
+            info: ObjectInfo | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the content, or a byte range of it. info, as returned by stat,
+        tells whether the content is compressed without another metadata
+        request.
+        """
+        fs_processor = self.__get_fs_processor(provider)
+        ranged = offset > 0 or length is not None
+        with self._track("iter_read", provider):
+            chunks: AsyncGenerator[bytes, None]
+            codec = None
+            if ranged:
+                codec = await self._codec.stored_codec(
+                    fs_processor, path, bucket, info
+                )
+            if ranged and not codec:
+                chunks = self._count_read_chunks(
+                    fs_processor.iter_read(
+                        path=path,
+                        bucket=bucket,
+                        chunk_size=chunk_size,
+                        offset=offset,
+                        length=length,
+                    ),
+                    provider,
+                )
+            else:
+                chunks = self._iter_decoded(
+                    fs_processor, provider, path, bucket, chunk_size, info
+                )
+                if ranged:
+                    # Compressed content is decoded from the start up to the range
+                    chunks = self._codec.slice_stream(chunks, offset, length)
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    yield chunk
+
+    def _iter_decoded(
+            self,
+            fs_processor: BaseFSProcessor,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None,
+            chunk_size: int,
+            info: ObjectInfo | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        return self._codec.decode_stream(
+            fs_processor,
+            path,
+            bucket,
+            self._count_read_chunks(
+                fs_processor.iter_read(
+                    path=path, bucket=bucket, chunk_size=chunk_size
+                ),
+                provider,
+            ),
+            info,
+        )
+
+    async def _decode_batch(
+            self,
+            fs_processor: BaseFSProcessor,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            files: Sequence[bytes | None],
+            bucket: str | None,
+            concurrency: int | None,
+    ) -> List[Any]:
+        """
+        Count and decode the files of a batch read; failed reads stay None.
+        """
+        self._count_bytes("read", provider, sum(len(f) for f in files if f))
+
+        async def decode(item: tuple[str, bytes | None]) -> bytes | None:
+            path, data = item
+            if data is None:
+                return None
+            return await self._codec.decode(fs_processor, path, bucket, data)
+
+        return await map_bounded(
+            decode,
+            zip(paths, files),
+            concurrency or self.batch_concurrency(provider),
         )
 
     async def read_batch(
@@ -77,12 +402,37 @@ class FSAggregator:
             provider: FSProvidersEnum,
             paths: List[str],
             bucket: str | None = None,
+            concurrency: int | None = None,
     ) -> List[bytes]:
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.read_batch(
-            paths=paths,
-            bucket=bucket,
+        with self._track("read_batch", provider):
+            files = await fs_processor.read_batch(
+                paths=paths,
+                bucket=bucket,
+                concurrency=concurrency,
+            )
+        return await self._decode_batch(
+            fs_processor, provider, paths, files, bucket, concurrency
+        )
+
+    async def read_batch_results(
+            self,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+    ) -> BatchResult[bytes]:
+        fs_processor = self.__get_fs_processor(provider)
+        with self._track("read_batch", provider):
+            result = await fs_processor.read_batch_results(
+                paths=paths,
+                bucket=bucket,
+                concurrency=concurrency,
+            )
+        result.results = await self._decode_batch(
+            fs_processor, provider, paths, result.results, bucket, concurrency
         )
+        return result
 
     async def write(
             self,
@@ -92,25 +442,511 @@ class FSAggregator:
             bucket: str | None = None,
             content_type: str | None = None,
     ) -> None:
-        fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.write(
+        """
+        Write a file and record it in the catalog, if enabled.
+        """
+        await self._store(
+            provider=provider,
             path=path,
             data=data,
             bucket=bucket,
             content_type=content_type,
         )
+        await self._catalog.record_written(
+            provider, bucket, [(path, len(data), content_type)]
+        )
+
+    async def _store(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            data: bytes,
+            bucket: str | None = None,
+            content_type: str | None = None,
+    ) -> None:
+        """
+        Write a file without recording it in the catalog.
+        """
+        fs_processor = self.__get_fs_processor(provider)
+        stored, metadata = await self._codec.encode(data, content_type)
+        with self._track("write", provider):
+            await fs_processor.write(
+                path=path,
+                data=stored,
+                bucket=bucket,
+                content_type=content_type,
+                metadata=metadata,
+            )
+        self._count_bytes("written", provider, len(data))
+        if metadata:
+            self._codec.count(provider, len(data), len(stored))
+
+    async def write_stream(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+    ) -> None:
+        """
+        Stream a file to storage and record it in the catalog, if enabled.
+        """
+        size = await self._store_stream(
+            provider=provider,
+            path=path,
+            chunks=chunks,
+            bucket=bucket,
+            content_type=content_type,
+        )
+        await self._catalog.record_written(
+            provider, bucket, [(path, size, content_type)]
+        )
+
+    async def _store_stream(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+    ) -> int:
+        """
+        Stream a file to storage without recording it in the catalog.
+        Returns the number of bytes streamed.
+        """
+        fs_processor = self.__get_fs_processor(provider)
+        size = 0
+
+        async def count_size() -> AsyncIterator[bytes]:
+            nonlocal size
+            async for chunk in self._count_chunks(chunks, provider):
+                size += len(chunk)
+                yield chunk
+
+        with self._track("write_stream", provider):
+            stream, metadata = await self._codec.encode_stream(
+                count_size(), content_type, provider
+            )
+            await fs_processor.write_stream(
+                path=path,
+                chunks=stream,
+                bucket=bucket,
+                content_type=content_type,
+                metadata=metadata,
+            )
+        return size
+
+    async def write_content_addressed(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+            filename: str | None = None,
+    ) -> ContentAddressedWrite:
+        """
+        Store the content under a key derived from its SHA-256 digest,
+        skipping the upload if it is already stored. The asset id is mapped
+        to the digest through a small reference object.
+        """
+        return await self._content.write(
+            provider=provider,
+            asset_id=asset_id,
+            chunks=chunks,
+            bucket=bucket,
+            content_type=content_type,
+            filename=filename,
+        )
+
+    async def resolve_asset(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            bucket: str | None = None,
+    ) -> str:
+        """
+        Return the content path an asset id points to.
+        Raises FileNotFoundError if the asset is unknown.
+        """
+        return await self._content.resolve(
+            provider=provider, asset_id=asset_id, bucket=bucket
+        )
+
+    async def write_asset(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            path: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+    ) -> AssetRecord | None:
+        """
+        Stream an asset to path and record it in the catalog, if enabled,
+        or in a reference object otherwise.
+        Returns the catalog entry, or None without a catalog.
+        """
+        size = await self._store_stream(
+            provider=provider,
+            path=path,
+            chunks=chunks,
+            bucket=bucket,
+            content_type=content_type,
+        )
+        record = AssetRecord(
+            asset_id=asset_id,
+            provider=provider,
+            bucket=bucket,
+            key=path,
+            size=size,
+            content_type=content_type,
+        )
+        return await self._content.record(record, rollback_path=path)
+
+    async def write_asset_batch(
+            self,
+            provider: FSProvidersEnum,
+            uploads: List[AssetUpload],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+    ) -> BatchResult[AssetRecord]:
+        """
+        Write assets concurrently through the batch path of the provider and
+        record the stored ones in the catalog, if enabled, in one transaction,
+        or in reference objects otherwise.
+        Paths must be unique within the batch; failures are reported per path.
+        Results keep the input order and are None for failed uploads and
+        without a catalog.
+        """
+        written = await self._store_batch_results(
+            provider=provider,
+            data=[(upload.path, upload.data) for upload in uploads],
+            bucket=bucket,
+            concurrency=concurrency,
+            content_types=[upload.content_type for upload in uploads],
+        )
+        result: BatchResult[AssetRecord] = BatchResult(
+            results=[None] * len(uploads),
+            errors=dict(written.errors),
+        )
+        stored = [
+            (index, upload)
+            for index, upload in enumerate(uploads)
+            if upload.path not in result.errors
+        ]
+        if not stored:
+            return result
+
+        records, errors = await self._content.record_batch(
+            provider,
+            bucket,
+            [
+                AssetRecord(
+                    asset_id=upload.asset_id,
+                    provider=provider,
+                    bucket=bucket,
+                    key=upload.path,
+                    size=len(upload.data),
+                    content_type=upload.content_type,
+                )
+                for _, upload in stored
+            ],
+            concurrency=concurrency,
+        )
+        result.errors.update(errors)
+        for (index, _), record in zip(stored, records):
+            result.results[index] = record
+        return result
+
+    async def get_asset(self, asset_id: str) -> AssetRecord | None:
+        """
+        Look an asset up in the catalog. None if it is unknown or the catalog
+        is disabled.
+        """
+        return await self._catalog.get(asset_id)
+
+    async def list_assets(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None = None,
+            prefix: str = "",
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+            limit: int = 1000,
+            start_after: str | None = None,
+    ) -> List[AssetRecord]:
+        """
+        List assets from the catalog with a single indexed query.
+        Raises AssetCatalogDisabledError without a catalog.
+        """
+        return await self._catalog.repository.list(
+            provider=provider,
+            bucket=bucket,
+            prefix=prefix,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            start_after=start_after,
+        )
+
+    def _get_presigning_processor(self, provider: FSProvidersEnum) -> BaseFSProcessor:
+        fs_processor = self.__get_fs_processor(provider)
+        if not fs_processor.supports_presigned_urls:
+            raise PresignedUrlsUnsupportedError(provider)
+        return fs_processor
+
+    def supports_presigned_urls(self, provider: FSProvidersEnum) -> bool:
+        """
+        Whether clients can transfer files of provider straight to storage.
+        """
+        return self.__get_fs_processor(provider).supports_presigned_urls
+
+    async def presign_download(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+            expires_in: int = 900,
+    ) -> str:
+        fs_processor = self._get_presigning_processor(provider)
+        with self._track("presign_download", provider):
+            return await fs_processor.presign_download(
+                path=path,
+                bucket=bucket,
+                expires_in=expires_in,
+            )
+
+    async def presign_upload(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+            expires_in: int = 900,
+            content_type: str | None = None,
+    ) -> str:
+        fs_processor = self._get_presigning_processor(provider)
+        with self._track("presign_upload", provider):
+            return await fs_processor.presign_upload(
+                path=path,
+                bucket=bucket,
+                expires_in=expires_in,
+                content_type=content_type,
+            )
+
+    async def presign_multipart_upload(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            part_count: int,
+            bucket: str | None = None,
+            expires_in: int = 900,
+            content_type: str | None = None,
+    ) -> PresignedMultipartUpload:
+        fs_processor = self._get_presigning_processor(provider)
+        with self._track("presign_multipart_upload", provider):
+            return await fs_processor.presign_multipart_upload(
+                path=path,
+                bucket=bucket,
+                part_count=part_count,
+                expires_in=expires_in,
+                content_type=content_type,
+            )
+
+    async def complete_multipart_upload(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            upload_id: str,
+            parts: List[tuple[int, str]],
+            bucket: str | None = None,
+    ) -> None:
+        fs_processor = self._get_presigning_processor(provider)
+        with self._track("complete_multipart_upload", provider):
+            await fs_processor.complete_multipart_upload(
+                path=path,
+                bucket=bucket,
+                upload_id=upload_id,
+                parts=parts,
+            )
+
+    async def abort_multipart_upload(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            upload_id: str,
+            bucket: str | None = None,
+    ) -> None:
+        fs_processor = self._get_presigning_processor(provider)
+        with self._track("abort_multipart_upload", provider):
+            await fs_processor.abort_multipart_upload(
+                path=path,
+                bucket=bucket,
+                upload_id=upload_id,
+            )
+
+    async def register_asset(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            path: str,
+            bucket: str | None = None,
+            max_bytes: int | None = None,
+            content_type: str | None = None,
+    ) -> AssetRecord:
+        """
+        Register a file a client uploaded straight to storage, in the catalog
+        if enabled. Registering an asset again returns its catalog entry.
+        Raises FileNotFoundError if the file is missing. A file larger than
+        max_bytes is deleted with FileTooLargeError, one stored with another
+        content type than content_type, if given, with ValueError.
+        """
+        existing = await self.get_asset(asset_id)
+        if existing is not None:
+            return existing
+
+        info = await self.stat(provider=provider, path=path, bucket=bucket)
+        if max_bytes is not None and info.size is not None and info.size > max_bytes:
+            await self.delete(provider=provider, path=path, bucket=bucket)
+            raise FileTooLargeError(info.size, max_bytes)
+        if content_type and info.content_type != content_type:
+            await self.delete(provider=provider, path=path, bucket=bucket)
+            raise ValueError(
+                f"File was stored as {info.content_type}, not {content_type}"
+            )
+
+        record = AssetRecord(
+            asset_id=asset_id,
+            provider=provider,
+            bucket=bucket,
+            key=path,
+            size=info.size,
+            content_type=info.content_type,
+        )
+        return await self._content.record(record, rollback_path=path) or record
+
+    def _count_batch_written(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            stored: List[tuple[str, bytes]],
+            metadata: List[Dict[str, str] | None] | None,
+            failed: Set[str],
+    ) -> None:
+        self._count_bytes(
+            "written",
+            provider,
+            sum(len(file) for path, file in data if path not in failed),
+        )
+        self._codec.count_batch(provider, data, stored, metadata, failed)
+
+    @staticmethod
+    def _batch_written(
+            data: List[tuple[str, bytes]],
+            content_types: List[str | None] | None,
+            failed: Set[str],
+    ) -> List[tuple[str, int | None, str | None]]:
+        types = content_types or [None] * len(data)
+        return [
+            (path, len(file), content_type)
+            for (path, file), content_type in zip(data, types)
+            if path not in failed
+        ]
 
     async def write_batch(
             self,
             provider: FSProvidersEnum,
             data: List[tuple[str, bytes]],
             bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+    ) -> None:
+        """
+        Write files concurrently and record them in the catalog, if enabled,
+        in one transaction.
+        """
+        await self._store_batch(
+            provider=provider,
+            data=data,
+            bucket=bucket,
+            concurrency=concurrency,
+            content_types=content_types,
+        )
+        await self._catalog.record_written(
+            provider, bucket, self._batch_written(data, content_types, set())
+        )
+
+    async def _store_batch(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
     ) -> None:
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.write_batch(
+        stored, metadata = await self._codec.encode_batch(data, content_types)
+        with self._track("write_batch", provider):
+            await fs_processor.write_batch(
+                data=stored,
+                bucket=bucket,
+                concurrency=concurrency,
+                content_types=content_types,
+                metadata=metadata,
+            )
+        self._count_batch_written(provider, data, stored, metadata, failed=set())
+
+    async def write_batch_results(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+    ) -> BatchResult[None]:
+        """
+        Write files concurrently and record the stored ones in the catalog,
+        if enabled, in one transaction. Failures are reported per path; if
+        the catalog write fails every stored file is rolled back with it.
+        """
+        result = await self._store_batch_results(
+            provider=provider,
             data=data,
             bucket=bucket,
+            concurrency=concurrency,
+            content_types=content_types,
+        )
+        written = self._batch_written(data, content_types, set(result.failed))
+        try:
+            await self._catalog.record_written(provider, bucket, written)
+        except Exception as e:
+            for path, _, _ in written:
+                result.errors[path] = e
+        return result
+
+    async def _store_batch_results(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+    ) -> BatchResult[None]:
+        fs_processor = self.__get_fs_processor(provider)
+        stored, metadata = await self._codec.encode_batch(data, content_types)
+        with self._track("write_batch", provider):
+            result = await fs_processor.write_batch_results(
+                data=stored,
+                bucket=bucket,
+                concurrency=concurrency,
+                content_types=content_types,
+                metadata=metadata,
+            )
+        self._count_batch_written(
+            provider, data, stored, metadata, failed=set(result.failed)
         )
+        return result
 
     async def delete(
             self,
@@ -118,32 +954,83 @@ class FSAggregator:
             path: str,
             bucket: str | None = None,
     ) -> None:
+        """
+        Delete a file and its catalog rows.
+        Raises ValueError for content of content-addressed assets.
+        """
+        if await self._catalog.shared_content(provider, bucket, [path]):
+            raise ValueError(
+                f"{path} holds content-addressed assets; delete them instead."
+            )
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.delete(
-            path=path,
-            bucket=bucket,
-        )
+        with self._track("delete", provider):
+            await fs_processor.delete(
+                path=path,
+                bucket=bucket,
+            )
+        await self._catalog.forget(provider, bucket, [path])
 
     async def delete_batch(
             self,
             provider: FSProvidersEnum,
             paths: List[str],
             bucket: str | None = None,
-    ) -> None:
+    ) -> DeleteSummary:
+        """
+        Delete files and their catalog rows. Content of content-addressed
+        assets is kept and reported as failed.
+        """
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.delete_batch(
-            paths=paths,
-            bucket=bucket,
+        shared = await self._catalog.shared_content(provider, bucket, paths)
+        deletable = [path for path in paths if path not in shared]
+        summary = DeleteSummary()
+        if deletable:
+            with self._track("delete_batch", provider):
+                summary = await fs_processor.delete_batch(
+                    paths=deletable,
+                    bucket=bucket,
+                )
+        await self._catalog.forget(
+            provider,
+            bucket,
+            [path for path in deletable if path not in summary.errors],
+        )
+        for path in shared:
+            summary.errors[path] = "Holds content-addressed assets"
+        return summary
+
+    async def delete_asset(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            bucket: str | None = None,
+    ) -> DeleteSummary:
+        """
+        Delete an asset with its reference object, and its content unless
+        other assets share it. Without a catalog references are not counted,
+        so the content of content-addressed assets is kept.
+        Raises FileNotFoundError if the asset is unknown.
+        """
+        paths = await self._content.release(
+            provider=provider, asset_id=asset_id, bucket=bucket
         )
+        return await self.delete_batch(provider=provider, paths=paths, bucket=bucket)
 
     async def delete_files_by_prefix(
             self,
             provider: FSProvidersEnum,
             prefix: str,
             bucket: str | None = None,
-    ) -> None:
+    ) -> DeleteSummary:
+        """
+        Delete every file below the prefix with its catalog rows, content of
+        content-addressed assets included.
+        """
         fs_processor = self.__get_fs_processor(provider)
-        return await fs_processor.delete_files_by_prefix(
-            prefix=prefix,
-            bucket=bucket,
-        )
+        with self._track("delete_files_by_prefix", provider):
+            summary = await fs_processor.delete_files_by_prefix(
+                prefix=prefix,
+                bucket=bucket,
+            )
+        await self._catalog.forget_prefix(provider, bucket, prefix, summary.failed)
+        return summary
@@ -1,5 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    TypeVar,
+)
+
+from shared.dataclasses.services.core.file_system import (
+    BatchResult,
+    DeleteSummary,
+    ObjectInfo,
+    PresignedMultipartUpload,
+)
+from shared.helpers.concurrency import AdaptiveConcurrencyLimiter, map_bounded
+from shared.helpers.streams import DEFAULT_CHUNK_SIZE
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class BaseFSProcessor(ABC):
@@ -18,6 +39,41 @@ class BaseFSProcessor(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_list(
+        self,
+        prefix: str,
+        bucket: str | None,
+        with_metadata: bool = False,
+    ) -> AsyncIterator[ObjectInfo]:
+        """
+        Stream the objects under prefix without building the whole list.
+        """
+        pass
+
+    @abstractmethod
+    async def exists(
+        self,
+        path: str,
+        bucket: str | None,
+    ) -> bool:
+        """
+        Check whether a file exists.
+        """
+        pass
+
+    @abstractmethod
+    async def stat(
+        self,
+        path: str,
+        bucket: str | None,
+    ) -> ObjectInfo:
+        """
+        Return size, ETag, last-modified and content type of a file.
+        Raises FileNotFoundError if it does not exist.
+        """
+        pass
+
     @abstractmethod
     async def read(
         self,
@@ -29,14 +85,67 @@ class BaseFSProcessor(ABC):
         """
         pass
 
+    @abstractmethod
+    async def read_with_info(
+        self,
+        path: str,
+        bucket: str | None,
+    ) -> tuple[bytes, ObjectInfo]:
+        """
+        Read a file together with the description of the version that was
+        read, without a separate stat call.
+        """
+        pass
+
+    @abstractmethod
+    async def read_range(
+        self,
+        path: str,
+        bucket: str | None,
+        offset: int,
+        length: int | None = None,
+    ) -> bytes:
+        """
+        Read `length` bytes starting at `offset`, or up to the end of the file.
+        """
+        pass
+
+    @abstractmethod
+    def iter_read(
+        self,
+        path: str,
+        bucket: str | None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the file, or a byte range of it, in chunks.
+        """
+        pass
+
     @abstractmethod
     async def read_batch(
         self,
         paths: List[str],
         bucket: str | None,
+        concurrency: int | None = None,
     ) -> List[bytes]:
         """
-        Process the data and return the result.
+        Read the files concurrently, in the order of the paths.
+        The first failure is raised.
+        """
+        pass
+
+    @abstractmethod
+    async def read_batch_results(
+        self,
+        paths: List[str],
+        bucket: str | None,
+        concurrency: int | None = None,
+    ) -> BatchResult[bytes]:
+        """
+        Read the files concurrently and collect the failures per path.
         """
         pass
 
@@ -47,20 +156,52 @@ class BaseFSProcessor(ABC):
         data: bytes,
         bucket: str | None,
         content_type: str | None = None,
+        metadata: Dict[str, str] | None = None,
     ) -> None:
         """
         Process the data and return the result.
         """
         pass
 
+    @abstractmethod
+    async def write_stream(
+        self,
+        path: str,
+        chunks: AsyncIterable[bytes],
+        bucket: str | None,
+        content_type: str | None = None,
+        metadata: Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Write the chunks as they arrive without holding the whole file in memory.
+        """
+        pass
+
     @abstractmethod
     async def write_batch(
         self,
         data: List[tuple[str, bytes]],
         bucket: str | None,
+        concurrency: int | None = None,
+        content_types: List[str | None] | None = None,
+        metadata: List[Dict[str, str] | None] | None = None,
     ) -> None:
         """
-        Process the data and return the result.
+        Write the files concurrently. The first failure is raised.
+        """
+        pass
+
+    @abstractmethod
+    async def write_batch_results(
+        self,
+        data: List[tuple[str, bytes]],
+        bucket: str | None,
+        concurrency: int | None = None,
+        content_types: List[str | None] | None = None,
+        metadata: List[Dict[str, str] | None] | None = None,
+    ) -> BatchResult[None]:
+        """
+        Write the files concurrently and collect the failures per path.
         """
         pass
 
@@ -80,7 +221,7 @@ class BaseFSProcessor(ABC):
         self,
         paths: List[str],
         bucket: str | None,
-    ) -> None:
+    ) -> DeleteSummary:
         """
         Process the data and return the result.
         """
@@ -91,8 +232,147 @@ class BaseFSProcessor(ABC):
         self,
         prefix: str,
         bucket: str | None,
-    ) -> None:
+    ) -> DeleteSummary:
         """
         Process the data and return the result.
         """
         pass
+
+    @property
+    def batch_limiter(self) -> AdaptiveConcurrencyLimiter | None:
+        """
+        Adaptive limit shared by the batch operations of this backend, if any.
+        """
+        return None
+
+    @property
+    @abstractmethod
+    def batch_concurrency(self) -> int:
+        """
+        Default number of files a batch operation works on at once.
+        """
+        pass
+
+    def local_path(self, path: str) -> str | None:
+        """
+        Path of the file on the local disk, or None if this backend does
+        not store files there.
+        """
+        return None
+
+    async def read_mapped(
+        self,
+        path: str,
+        bucket: str | None,
+    ) -> tuple[memoryview, ObjectInfo | None]:
+        """
+        Read a file as a read-only buffer that parsers can work on in place,
+        with the description of the version that was read if it came with
+        the data. Backends on the local disk map the file instead of copying.
+        """
+        data, info = await self.read_with_info(path=path, bucket=bucket)
+        return memoryview(data).toreadonly(), info
+
+    @property
+    def supports_presigned_urls(self) -> bool:
+        """
+        Whether clients can transfer files straight to and from this backend
+        through the presign methods.
+        """
+        return False
+
+    async def presign_download(
+        self,
+        path: str,
+        bucket: str | None,
+        expires_in: int,
+    ) -> str:
+        """
+        Presigned URL to download the file straight from the backend.
+        """
+        raise NotImplementedError
+
+    async def presign_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        expires_in: int,
+        content_type: str | None = None,
+    ) -> str:
+        """
+        Presigned URL to upload the file straight to the backend.
+        """
+        raise NotImplementedError
+
+    async def presign_multipart_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        part_count: int,
+        expires_in: int,
+        content_type: str | None = None,
+    ) -> PresignedMultipartUpload:
+        """
+        Start a multipart upload and presign a URL for each of its parts.
+        """
+        raise NotImplementedError
+
+    async def complete_multipart_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        upload_id: str,
+        parts: List[tuple[int, str]],
+    ) -> None:
+        """
+        Assemble the parts, given as part number and ETag, into the file.
+        """
+        raise NotImplementedError
+
+    async def abort_multipart_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        upload_id: str,
+    ) -> None:
+        """
+        Abort a multipart upload and free its parts.
+        """
+        raise NotImplementedError
+
+    async def _run_batch(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        concurrency: int,
+    ) -> List[R]:
+        """
+        Run func over items with bounded concurrency.
+        The first failure cancels the rest and is raised.
+        """
+        return await map_bounded(
+            func,
+            items,
+            concurrency,
+            limiter=self.batch_limiter,
+        )
+
+    async def _run_batch_results(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        keys: Sequence[str],
+        concurrency: int,
+    ) -> BatchResult[R]:
+        """
+        Run func over items with bounded concurrency, collecting the
+        failures per key.
+        """
+        results = await map_bounded(
+            func,
+            items,
+            concurrency,
+            return_exceptions=True,
+            limiter=self.batch_limiter,
+        )
+        return BatchResult.from_results(keys, results)
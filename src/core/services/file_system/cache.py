@@ -0,0 +1,623 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+
+from loguru import logger
+
+from shared.dataclasses.services.core.assets import AssetRecord
+from shared.dataclasses.services.core.file_system import BatchResult, DeleteSummary
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.helpers.concurrency import map_bounded
+from .aggregator import FSAggregator, FSAggregatorConfig
+
+
+@dataclass
+class CacheEntry:
+    data: bytes
+    etag: str | None
+    stored_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class FSCacheConfig:
+    """
+    Configuration for FSCache.
+    """
+
+    memory_max_bytes: int
+    disk_path: str
+    disk_max_bytes: int
+    ttl_seconds: float
+    validate_etag: bool = True
+
+
+class MemoryLRUCache:
+    """
+    In-memory LRU cache bounded by the total size of the cached values.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> List[tuple[str, CacheEntry]]:
+        """
+        Store the entry and return the entries evicted to make room for it.
+        Entries larger than the whole cache are returned right away.
+        """
+        self.pop(key)
+        if entry.size > self.max_bytes:
+            return [(key, entry)]
+
+        self._entries[key] = entry
+        self._size += entry.size
+
+        evicted = []
+        while self._size > self.max_bytes:
+            evicted_key, evicted_entry = self._entries.popitem(last=False)
+            self._size -= evicted_entry.size
+            evicted.append((evicted_key, evicted_entry))
+        return evicted
+
+    def pop(self, key: str) -> CacheEntry | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+        return entry
+
+
+class DiskCache:
+    """
+    Spill tier on the local disk with size-based LRU eviction.
+    The index lives in memory, so every process keeps its files in a
+    subdirectory of path named after its pid, which is wiped when opened.
+    Subdirectories left by processes that are gone are removed then too.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.root = path
+        self.path = os.path.join(path, str(os.getpid()))
+        self.max_bytes = max_bytes
+        self._index: OrderedDict[str, tuple[int, str | None, float]] = OrderedDict()
+        self._size = 0
+        # Keys being written, flagged when invalidated before the write ends
+        self._writing: Dict[str, bool] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def keys(self) -> List[str]:
+        return list(self._index)
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest())
+
+    @staticmethod
+    def _process_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @classmethod
+    def _reset_sync(cls, root: str, path: str) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name.isdigit() and not cls._process_alive(int(entry.name)):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+
+    @staticmethod
+    def _read_sync(file_path: str) -> bytes:
+        with open(file_path, mode="rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _write_sync(file_path: str, data: bytes) -> None:
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, mode="wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def _remove_sync(file_paths: List[str]) -> None:
+        for file_path in file_paths:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._reset_sync, self.root, self.path)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        meta = self._index.get(key)
+        if meta is None:
+            return None
+
+        try:
+            data = await asyncio.to_thread(self._read_sync, self._file_path(key))
+        except FileNotFoundError:
+            self._drop(key)
+            return None
+
+        # The entry may have been evicted or replaced while reading
+        if self._index.get(key) is not meta:
+            return None
+
+        self._index.move_to_end(key)
+        _, etag, stored_at = meta
+        return CacheEntry(data=data, etag=etag, stored_at=stored_at)
+
+    async def put(self, key: str, entry: CacheEntry) -> int:
+        """
+        Store the entry and return the number of evicted entries.
+        """
+        await self.pop(key)
+        if entry.size > self.max_bytes or key in self._writing:
+            return 0
+
+        self._writing[key] = False
+        try:
+            await asyncio.to_thread(self._write_sync, self._file_path(key), entry.data)
+        finally:
+            invalidated = self._writing.pop(key)
+        if invalidated:
+            await asyncio.to_thread(self._remove_sync, [self._file_path(key)])
+            return 0
+
+        self._index[key] = (entry.size, entry.etag, entry.stored_at)
+        self._size += entry.size
+
+        evicted = []
+        while self._size > self.max_bytes:
+            evicted_key = next(iter(self._index))
+            self._drop(evicted_key)
+            evicted.append(self._file_path(evicted_key))
+        if evicted:
+            await asyncio.to_thread(self._remove_sync, evicted)
+        return len(evicted)
+
+    async def pop(self, key: str) -> bool:
+        if key in self._writing:
+            self._writing[key] = True
+        if not self._drop(key):
+            return False
+        await asyncio.to_thread(self._remove_sync, [self._file_path(key)])
+        return True
+
+    def _drop(self, key: str) -> bool:
+        meta = self._index.pop(key, None)
+        if meta is None:
+            return False
+        self._size -= meta[0]
+        return True
+
+
+class FSCache:
+    """
+    Two-tier cache: a memory LRU in front of a disk spill tier.
+    Entries evicted from memory move to disk, disk hits move back to memory.
+    """
+
+    def __init__(self, config: FSCacheConfig):
+        self.config = config
+        self.stats = CacheStats()
+        self._memory = MemoryLRUCache(config.memory_max_bytes)
+        self._disk = DiskCache(config.disk_path, config.disk_max_bytes)
+        # Keys being fetched, flagged when invalidated before the fetch ends
+        self._fills: Dict[str, bool] = {}
+        # Shared fetches, so concurrent misses for a key hit the backend once
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+    async def open(self) -> None:
+        await self._disk.open()
+
+    def usage(self) -> Dict[str, int]:
+        return {
+            "memory_bytes": self._memory.size,
+            "disk_bytes": self._disk.size,
+        }
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self.stats.memory_hits += 1
+            return entry
+
+        entry = await self._disk.get(key)
+        if entry is not None:
+            self.stats.disk_hits += 1
+            await self._disk.pop(key)
+            await self._store_in_memory(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CacheEntry) -> None:
+        await self._disk.pop(key)
+        await self._store_in_memory(key, entry)
+
+    def start_fill(self, key: str) -> None:
+        """
+        Mark the key as being fetched from the backend.
+        """
+        self._fills[key] = False
+
+    async def finish_fill(self, key: str, entry: CacheEntry | None) -> None:
+        """
+        Store a fetched entry unless the key was invalidated meanwhile,
+        in which case the data may predate a write and is dropped.
+        """
+        invalidated = self._fills.pop(key, True)
+        if entry is not None and not invalidated:
+            await self.put(key, entry)
+
+    async def _store_in_memory(self, key: str, entry: CacheEntry) -> None:
+        for evicted_key, evicted_entry in self._memory.put(key, entry):
+            if evicted_key != key:
+                self.stats.memory_evictions += 1
+            self.stats.disk_evictions += await self._disk.put(
+                evicted_key, evicted_entry
+            )
+
+    async def invalidate(self, key: str) -> None:
+        if key in self._fills:
+            self._fills[key] = True
+        in_memory = self._memory.pop(key) is not None
+        on_disk = await self._disk.pop(key)
+        if in_memory or on_disk:
+            self.stats.invalidations += 1
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        keys = {
+            key
+            for key in [*self._memory.keys(), *self._disk.keys(), *self._fills]
+            if key.startswith(prefix)
+        }
+        for key in keys:
+            await self.invalidate(key)
+
+
+class CachedFSAggregator(FSAggregator):
+    """
+    FSAggregator with a read-through FSCache.
+    Cached entries are served while younger than the TTL, after that they are
+    revalidated by ETag (a HEAD/stat instead of a full read) when enabled.
+    Writes and deletes through the aggregator invalidate the affected keys.
+    """
+
+    def __init__(self, config: FSAggregatorConfig, cache: FSCache):
+        super().__init__(config)
+        self._cache = cache
+
+    @property
+    def cache(self) -> FSCache:
+        return self._cache
+
+    @staticmethod
+    def _cache_key(provider: FSProvidersEnum, path: str, bucket: str | None) -> str:
+        return f"{provider}:{bucket or ''}:{path}"
+
+    async def _is_fresh(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None,
+            entry: CacheEntry,
+    ) -> bool:
+        if time.monotonic() - entry.stored_at < self._cache.config.ttl_seconds:
+            return True
+        if not self._cache.config.validate_etag or entry.etag is None:
+            return False
+
+        try:
+            info = await self.stat(provider=provider, path=path, bucket=bucket)
+        except FileNotFoundError:
+            return False
+        if info.etag != entry.etag:
+            return False
+
+        entry.stored_at = time.monotonic()
+        return True
+
+    async def _fetch(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None,
+            key: str,
+    ) -> bytes:
+        # The ETag comes with the data from the same response, so a miss
+        # costs a single request.
+        self._cache.start_fill(key)
+        entry = None
+        try:
+            data, info = await super().read_with_info(
+                provider=provider, path=path, bucket=bucket
+            )
+            entry = CacheEntry(data=data, etag=info.etag)
+        finally:
+            await self._cache.finish_fill(key, entry)
+        return data
+
+    async def read(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+    ) -> bytes:
+        key = self._cache_key(provider, path, bucket)
+        entry = await self._cache.get(key)
+        if entry is not None:
+            if await self._is_fresh(provider, path, bucket, entry):
+                return entry.data
+            self._cache.stats.stale += 1
+            await self._cache.invalidate(key)
+        else:
+            self._cache.stats.misses += 1
+
+        # Concurrent misses for the same key share a single fetch. If the
+        # request that owns the fetch is cancelled, a waiter fetches instead.
+        while (inflight := self._cache.inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not inflight.cancelled() or (task and task.cancelling()):
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._cache.inflight[key] = future
+        try:
+            data = await self._fetch(provider, path, bucket, key)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else awaited it
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            self._cache.inflight.pop(key, None)
+
+    async def _read_cached_batch(
+            self,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            bucket: str | None,
+            concurrency: int | None,
+            return_exceptions: bool,
+    ) -> List[Any]:
+        return await map_bounded(
+            lambda path: self.read(provider=provider, path=path, bucket=bucket),
+            paths,
+            concurrency or self.batch_concurrency(provider),
+            return_exceptions=return_exceptions,
+            limiter=self.batch_limiter(provider),
+        )
+
+    async def read_batch(
+            self,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+    ) -> List[bytes]:
+        return await self._read_cached_batch(
+            provider, paths, bucket, concurrency, return_exceptions=False
+        )
+
+    async def read_batch_results(
+            self,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+    ) -> BatchResult[bytes]:
+        results = await self._read_cached_batch(
+            provider, paths, bucket, concurrency, return_exceptions=True
+        )
+        return BatchResult.from_results(paths, results)
+
+    async def _store(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            data: bytes,
+            bucket: str | None = None,
+            content_type: str | None = None,
+    ) -> None:
+        key = self._cache_key(provider, path, bucket)
+        await self._cache.invalidate(key)
+        try:
+            await super()._store(
+                provider=provider,
+                path=path,
+                data=data,
+                bucket=bucket,
+                content_type=content_type,
+            )
+        finally:
+            await self._cache.invalidate(key)
+
+    async def _store_stream(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+    ) -> int:
+        key = self._cache_key(provider, path, bucket)
+        await self._cache.invalidate(key)
+        try:
+            return await super()._store_stream(
+                provider=provider,
+                path=path,
+                chunks=chunks,
+                bucket=bucket,
+                content_type=content_type,
+            )
+        finally:
+            await self._cache.invalidate(key)
+
+    @asynccontextmanager
+    async def _invalidating(
+            self,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            bucket: str | None,
+    ) -> AsyncIterator[None]:
+        """
+        Invalidate the paths before and after they are written, so a fetch
+        racing the write cannot cache the old content.
+        """
+        keys = [self._cache_key(provider, path, bucket) for path in paths]
+        for key in keys:
+            await self._cache.invalidate(key)
+        try:
+            yield
+        finally:
+            for key in keys:
+                await self._cache.invalidate(key)
+
+    async def _store_batch(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+    ) -> None:
+        async with self._invalidating(provider, [path for path, _ in data], bucket):
+            await super()._store_batch(
+                provider=provider,
+                data=data,
+                bucket=bucket,
+                concurrency=concurrency,
+                content_types=content_types,
+            )
+
+    async def _store_batch_results(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+    ) -> BatchResult[None]:
+        async with self._invalidating(provider, [path for path, _ in data], bucket):
+            return await super()._store_batch_results(
+                provider=provider,
+                data=data,
+                bucket=bucket,
+                concurrency=concurrency,
+                content_types=content_types,
+            )
+
+    async def register_asset(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            path: str,
+            bucket: str | None = None,
+            max_bytes: int | None = None,
+            content_type: str | None = None,
+    ) -> AssetRecord:
+        # The file was uploaded past the aggregator, so any cached copy is stale
+        await self._cache.invalidate(self._cache_key(provider, path, bucket))
+        return await super().register_asset(
+            provider=provider,
+            asset_id=asset_id,
+            path=path,
+            bucket=bucket,
+            max_bytes=max_bytes,
+            content_type=content_type,
+        )
+
+    async def delete(
+            self,
+            provider: FSProvidersEnum,
+            path: str,
+            bucket: str | None = None,
+    ) -> None:
+        try:
+            await super().delete(provider=provider, path=path, bucket=bucket)
+        finally:
+            await self._cache.invalidate(self._cache_key(provider, path, bucket))
+
+    async def delete_batch(
+            self,
+            provider: FSProvidersEnum,
+            paths: List[str],
+            bucket: str | None = None,
+    ) -> DeleteSummary:
+        try:
+            return await super().delete_batch(
+                provider=provider, paths=paths, bucket=bucket
+            )
+        finally:
+            for path in paths:
+                await self._cache.invalidate(self._cache_key(provider, path, bucket))
+
+    async def delete_files_by_prefix(
+            self,
+            provider: FSProvidersEnum,
+            prefix: str,
+            bucket: str | None = None,
+    ) -> DeleteSummary:
+        try:
+            return await super().delete_files_by_prefix(
+                provider=provider, prefix=prefix, bucket=bucket
+            )
+        finally:
+            logger.debug(f"Invalidating cached files with prefix '{prefix}'")
+            await self._cache.invalidate_prefix(
+                self._cache_key(provider, prefix, bucket)
+            )
@@ -0,0 +1,184 @@
+import uuid
+from typing import Awaitable, Callable, List, Set
+
+from loguru import logger
+
+from shared.dataclasses.services.core.assets import AssetRecord
+from shared.dataclasses.services.core.file_system import DeleteSummary
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.exceptions.assets import AssetCatalogDisabledError
+from ...repositories.database.assets import AssetRepository
+
+# Deletes the given paths of a provider and bucket
+RollbackFunc = Callable[
+    [FSProvidersEnum, List[str], str | None], Awaitable[DeleteSummary]
+]
+
+
+class AssetCatalog:
+    """
+    Records stored objects in the asset catalog, if one is configured.
+    Rows are added once the upload finished; objects whose rows cannot be
+    written are deleted again through `rollback`, so storage and catalog stay
+    consistent without holding a transaction open during the upload.
+    Without a repository recording is skipped and lookups find nothing.
+    """
+
+    def __init__(self, repository: AssetRepository | None, rollback: RollbackFunc):
+        self._repository = repository
+        self._rollback = rollback
+
+    @property
+    def enabled(self) -> bool:
+        return self._repository is not None
+
+    @property
+    def repository(self) -> AssetRepository:
+        """
+        Raises AssetCatalogDisabledError without a catalog.
+        """
+        if self._repository is None:
+            raise AssetCatalogDisabledError()
+        return self._repository
+
+    async def _roll_back(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            paths: List[str],
+            description: str,
+    ) -> None:
+        try:
+            summary = await self._rollback(provider, paths, bucket)
+        except Exception as e:
+            logger.error(f"Failed to roll back {description}: {e}")
+            return
+        if summary.errors:
+            logger.error(f"Failed to roll back {description}: {summary.errors}")
+
+    async def record_written(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            written: List[tuple[str, int | None, str | None]],
+    ) -> None:
+        """
+        Record files just written as (path, size, content type). Existing
+        rows at those paths are updated in place.
+        """
+        if self._repository is None or not written:
+            return
+        try:
+            await self._repository.record_keys(
+                AssetRecord(
+                    asset_id=str(uuid.uuid4()),
+                    provider=provider,
+                    bucket=bucket,
+                    key=path,
+                    size=size,
+                    content_type=content_type,
+                )
+                for path, size, content_type in written
+            )
+        except Exception:
+            paths = [path for path, _, _ in written]
+            await self._roll_back(
+                provider,
+                bucket,
+                paths,
+                f"{len(paths)} files after their catalog write failed",
+            )
+            raise
+
+    async def record_asset(
+            self, record: AssetRecord, rollback_path: str, replace_key: bool = True
+    ) -> AssetRecord:
+        """
+        Add the row of an asset that was just stored, deleting rollback_path
+        if it cannot be written. The asset replaces the rows at its key unless
+        its content is shared.
+        """
+        try:
+            return await self.repository.add(record, replace_key=replace_key)
+        except Exception:
+            await self._roll_back(
+                FSProvidersEnum(record.provider),
+                record.bucket,
+                [rollback_path],
+                f"{rollback_path} after the catalog write of asset "
+                f"{record.asset_id} failed",
+            )
+            raise
+
+    async def record_assets(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            records: List[AssetRecord],
+    ) -> List[AssetRecord]:
+        """
+        Add the rows of assets that were just stored in one transaction,
+        replacing the rows at their keys. Every file is deleted again if the
+        rows cannot be written.
+        """
+        try:
+            return await self.repository.add_batch(records, replace_keys=True)
+        except Exception:
+            paths = [record.key for record in records]
+            await self._roll_back(
+                provider,
+                bucket,
+                paths,
+                f"{len(paths)} files after the catalog write of their batch failed",
+            )
+            raise
+
+    async def get(self, asset_id: str) -> AssetRecord | None:
+        """
+        None if the asset is unknown or the catalog is disabled.
+        """
+        if self._repository is None:
+            return None
+        return await self._repository.get(asset_id)
+
+    async def shared_content(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            paths: List[str],
+    ) -> Set[str]:
+        """
+        The paths that hold content-addressed assets. Their content may be
+        shared, so only deleting the assets deletes it, once none is left.
+        """
+        if self._repository is None:
+            return set()
+        return await self._repository.content_keys(provider, bucket, paths)
+
+    async def forget(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            paths: List[str],
+    ) -> None:
+        """
+        Remove the rows of deleted files.
+        """
+        if self._repository is not None and paths:
+            await self._repository.delete_keys(provider, bucket, paths)
+
+    async def forget_prefix(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            prefix: str,
+            exclude: List[str],
+    ) -> None:
+        """
+        Remove the rows below a deleted prefix, except for the paths that
+        could not be deleted.
+        """
+        if self._repository is not None:
+            await self._repository.delete_prefix(
+                provider, bucket, prefix, exclude=exclude
+            )
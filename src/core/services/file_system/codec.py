@@ -0,0 +1,397 @@
+import asyncio
+from contextlib import aclosing
+from dataclasses import replace
+from typing import AsyncGenerator, AsyncIterable, AsyncIterator, Dict, List, Set
+
+from loguru import logger
+
+from configs.file_system import FileSystemConfig
+from shared.dataclasses.services.core.file_system import ObjectInfo
+from shared.enums.services.core.file_system import (
+    CompressionCodecEnum,
+    FSProvidersEnum,
+)
+from shared.helpers.compression import (
+    CODEC_METADATA_KEY,
+    FRAME_HEADER_SIZE,
+    FRAME_TRAILER_SIZE,
+    SIZE_METADATA_KEY,
+    FrameCompressor,
+    FrameDecompressor,
+    compress_frame,
+    compresses_well,
+    decompress_frame,
+    is_compressible,
+    parse_frame_header,
+    parse_frame_trailer,
+    zstd_available,
+)
+from shared.helpers.metrics import MetricsRegistry
+from .base import BaseFSProcessor
+
+
+class FSCodec:
+    """
+    Transparent compression of stored content. Compressed objects are
+    self-describing frames whose codec and uncompressed size are also
+    recorded in the metadata of the object; content is only decoded when
+    both agree, so files that merely start like a frame are read as stored.
+    """
+
+    def __init__(self, fs_config: FileSystemConfig, metrics: MetricsRegistry):
+        self._fs_config = fs_config
+        self._metrics = metrics
+
+        self._codec = fs_config.COMPRESSION_CODEC
+        if (
+                fs_config.COMPRESSION_ENABLED
+                and self._codec == CompressionCodecEnum.ZSTD
+                and not zstd_available()
+        ):
+            logger.warning("zstandard is not installed. Compressing with gzip.")
+            self._codec = CompressionCodecEnum.GZIP
+        self._level = (
+            fs_config.COMPRESSION_ZSTD_LEVEL
+            if self._codec == CompressionCodecEnum.ZSTD
+            else fs_config.COMPRESSION_GZIP_LEVEL
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._fs_config.COMPRESSION_ENABLED
+
+    def count(self, provider: FSProvidersEnum, raw: int, stored: int) -> None:
+        self._metrics.increment(
+            "file_system.compression.bytes_in", raw, provider=provider
+        )
+        self._metrics.increment(
+            "file_system.compression.bytes_out", stored, provider=provider
+        )
+
+    def _choose_codec(
+            self,
+            content_type: str | None,
+            sample: bytes,
+            size: int | None,
+    ) -> CompressionCodecEnum | None:
+        """
+        Codec to store content with, or None to store it as is: small files,
+        types that are already compressed and content whose leading sample
+        does not shrink are not worth the CPU. size is None while the length
+        of a stream is unknown.
+        """
+        fs_config = self._fs_config
+        if not fs_config.COMPRESSION_ENABLED:
+            return None
+        if size is not None and size < fs_config.COMPRESSION_MIN_BYTES:
+            return None
+        if not is_compressible(content_type, fs_config.COMPRESSION_SKIP_CONTENT_TYPES):
+            return None
+        if not compresses_well(
+                sample[:fs_config.COMPRESSION_SAMPLE_BYTES],
+                fs_config.COMPRESSION_MAX_RATIO,
+        ):
+            return None
+        return self._codec
+
+    def _encode_sync(
+            self, data: bytes, content_type: str | None
+    ) -> tuple[bytes, Dict[str, str] | None]:
+        codec = self._choose_codec(content_type, data, len(data))
+        if codec is None:
+            return data, None
+        metadata = {
+            CODEC_METADATA_KEY: codec.value,
+            SIZE_METADATA_KEY: str(len(data)),
+        }
+        return compress_frame(data, codec, self._level), metadata
+
+    async def encode(
+            self, data: bytes, content_type: str | None
+    ) -> tuple[bytes, Dict[str, str] | None]:
+        """
+        Return the bytes to store for data and the metadata of the object.
+        """
+        if not self.enabled:
+            return data, None
+        return await asyncio.to_thread(self._encode_sync, data, content_type)
+
+    async def encode_batch(
+            self,
+            data: List[tuple[str, bytes]],
+            content_types: List[str | None] | None,
+    ) -> tuple[List[tuple[str, bytes]], List[Dict[str, str] | None] | None]:
+        """
+        Return the files of a batch to store and the metadata of each.
+        """
+        if not self.enabled:
+            return data, None
+        types = content_types or [None] * len(data)
+        encoded = await asyncio.to_thread(
+            lambda: [
+                self._encode_sync(file, content_type)
+                for (_, file), content_type in zip(data, types)
+            ]
+        )
+        stored = [(path, file) for (path, _), (file, _) in zip(data, encoded)]
+        return stored, [file_metadata for _, file_metadata in encoded]
+
+    def count_batch(
+            self,
+            provider: FSProvidersEnum,
+            data: List[tuple[str, bytes]],
+            stored: List[tuple[str, bytes]],
+            metadata: List[Dict[str, str] | None] | None,
+            failed: Set[str],
+    ) -> None:
+        """
+        Count the compression of the files of a batch that were written.
+        """
+        if not metadata:
+            return
+        compressed = [
+            (len(file), len(stored_file))
+            for (path, file), (_, stored_file), file_metadata
+            in zip(data, stored, metadata)
+            if file_metadata and path not in failed
+        ]
+        if compressed:
+            self.count(
+                provider,
+                sum(raw for raw, _ in compressed),
+                sum(size for _, size in compressed),
+            )
+
+    async def encode_stream(
+            self,
+            chunks: AsyncIterable[bytes],
+            content_type: str | None,
+            provider: FSProvidersEnum,
+    ) -> tuple[AsyncIterable[bytes], Dict[str, str] | None]:
+        """
+        Buffer the head of a stream to decide on its compression. Returns the
+        stream to store and the metadata of the object.
+        """
+        if not self.enabled:
+            return chunks, None
+
+        chunks = aiter(chunks)
+        head = bytearray()
+        size = None
+        while len(head) < self._fs_config.COMPRESSION_SAMPLE_BYTES:
+            try:
+                head += await anext(chunks)
+            except StopAsyncIteration:
+                size = len(head)
+                break
+
+        codec = await asyncio.to_thread(
+            self._choose_codec, content_type, bytes(head), size
+        )
+        if codec is None:
+            return self._prepend(bytes(head), chunks), None
+        metadata = {CODEC_METADATA_KEY: codec.value}
+        if size is not None:
+            metadata[SIZE_METADATA_KEY] = str(size)
+        stream = self._compress_stream(codec, bytes(head), chunks, provider)
+        return stream, metadata
+
+    @staticmethod
+    async def _prepend(
+            head: bytes, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        if head:
+            yield head
+        async for chunk in chunks:
+            yield chunk
+
+    async def _compress_stream(
+            self,
+            codec: CompressionCodecEnum,
+            head: bytes,
+            chunks: AsyncIterator[bytes],
+            provider: FSProvidersEnum,
+    ) -> AsyncIterator[bytes]:
+        compressor = FrameCompressor(codec, self._level)
+        raw = stored = 0
+        async for chunk in self._prepend(head, chunks):
+            raw += len(chunk)
+            data = await asyncio.to_thread(compressor.compress, chunk)
+            if data:
+                stored += len(data)
+                yield data
+        data = compressor.flush()
+        stored += len(data)
+        yield data
+        self.count(provider, raw, stored)
+
+    @staticmethod
+    def recorded_codec(info: ObjectInfo) -> str | None:
+        """
+        Codec recorded for an object, from its stored or its logical info.
+        """
+        return info.codec or (info.metadata or {}).get(CODEC_METADATA_KEY)
+
+    async def stored_codec(
+            self,
+            fs_processor: BaseFSProcessor,
+            path: str,
+            bucket: str | None,
+            info: ObjectInfo | None = None,
+    ) -> str | None:
+        """
+        Codec of a stored object, checked before a ranged read because the
+        ranges of a compressed object cannot be read directly. info, as
+        returned by stat, saves the metadata request.
+        """
+        if info is None:
+            info = await fs_processor.stat(path=path, bucket=bucket)
+        return self.recorded_codec(info)
+
+    async def _is_compressed(
+            self,
+            fs_processor: BaseFSProcessor,
+            path: str,
+            bucket: str | None,
+            head: bytes,
+            info: ObjectInfo | None = None,
+    ) -> bool:
+        """
+        Whether content starting with head is a frame this class compressed.
+        Without the info of the object only content that looks like a frame
+        pays for a metadata request.
+        """
+        if parse_frame_header(head) is None:
+            return False
+        return await self.stored_codec(fs_processor, path, bucket, info) is not None
+
+    async def decode(
+            self,
+            fs_processor: BaseFSProcessor,
+            path: str,
+            bucket: str | None,
+            data: bytes,
+            info: ObjectInfo | None = None,
+    ) -> bytes:
+        """
+        Decompress data read from path if it is a compressed frame.
+        """
+        if not await self._is_compressed(fs_processor, path, bucket, data, info):
+            return data
+        return await asyncio.to_thread(decompress_frame, data)
+
+    async def decode_view(
+            self,
+            fs_processor: BaseFSProcessor,
+            path: str,
+            bucket: str | None,
+            view: memoryview,
+            info: ObjectInfo | None = None,
+    ) -> memoryview:
+        """
+        Decompress a buffer read from path if it holds a compressed frame,
+        releasing the buffer; other content is returned as is.
+        """
+        head = bytes(view[:FRAME_HEADER_SIZE])
+        if not await self._is_compressed(fs_processor, path, bucket, head, info):
+            return view
+
+        data = await asyncio.to_thread(decompress_frame, bytes(view))
+        view.release()
+        return memoryview(data).toreadonly()
+
+    async def decode_stream(
+            self,
+            fs_processor: BaseFSProcessor,
+            path: str,
+            bucket: str | None,
+            chunks: AsyncGenerator[bytes, None],
+            info: ObjectInfo | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Decompress a stream read from path if it holds a compressed frame;
+        other content passes through.
+        """
+        async with aclosing(chunks):
+            head = b""
+            async for chunk in chunks:
+                head += chunk
+                if len(head) >= FRAME_HEADER_SIZE:
+                    break
+
+            codec = parse_frame_header(head)
+            if not await self._is_compressed(
+                    fs_processor, path, bucket, head, info
+            ):
+                if head:
+                    yield head
+                async for chunk in chunks:
+                    yield chunk
+                return
+
+            assert codec is not None
+            decompressor = FrameDecompressor(codec)
+            data = await asyncio.to_thread(decompressor.decompress, head)
+            if data:
+                yield data
+            async for chunk in chunks:
+                data = await asyncio.to_thread(decompressor.decompress, chunk)
+                if data:
+                    yield data
+            decompressor.finish()
+
+    @staticmethod
+    async def slice_stream(
+            chunks: AsyncGenerator[bytes, None],
+            offset: int,
+            length: int | None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Yield the bytes of a decoded stream from offset, up to length of them.
+        """
+        async with aclosing(chunks):
+            position = 0
+            remaining = length
+            async for chunk in chunks:
+                if remaining is not None and remaining <= 0:
+                    break
+                end = position + len(chunk)
+                if end > offset:
+                    piece = chunk[max(offset - position, 0):]
+                    if remaining is not None:
+                        piece = piece[:remaining]
+                        remaining -= len(piece)
+                    if piece:
+                        yield piece
+                position = end
+
+    async def logical_info(
+            self,
+            fs_processor: BaseFSProcessor,
+            path: str,
+            bucket: str | None,
+            info: ObjectInfo,
+    ) -> ObjectInfo:
+        """
+        Describe a compressed object by its codec and uncompressed size.
+        """
+        stored_size = info.size or 0
+        if stored_size < FRAME_HEADER_SIZE + FRAME_TRAILER_SIZE:
+            return info
+        metadata = info.metadata or {}
+        codec = metadata.get(CODEC_METADATA_KEY)
+        if codec is None:
+            return info
+
+        if SIZE_METADATA_KEY in metadata:
+            size = int(metadata[SIZE_METADATA_KEY])
+        else:
+            size = parse_frame_trailer(
+                await fs_processor.read_range(
+                    path=path,
+                    bucket=bucket,
+                    offset=stored_size - FRAME_TRAILER_SIZE,
+                    length=FRAME_TRAILER_SIZE,
+                )
+            )
+        return replace(info, size=size, codec=codec)
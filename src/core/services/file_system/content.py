@@ -0,0 +1,257 @@
+import asyncio
+import hashlib
+import json
+import tempfile
+import uuid
+from typing import IO, TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Dict, List
+
+from shared.dataclasses.services.core.assets import AssetRecord
+from shared.dataclasses.services.core.file_system import ContentAddressedWrite
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.helpers.streams import DEFAULT_CHUNK_SIZE
+from .catalog import AssetCatalog
+
+if TYPE_CHECKING:
+    from .aggregator import FSAggregator
+
+
+class ContentStore:
+    """
+    Content-addressed storage and asset references. Content is stored under
+    its SHA-256 digest, so identical uploads are stored once, and a small
+    JSON reference per asset maps its id to its path, so assets resolve
+    without the catalog. Objects are written through the store methods of
+    the aggregator, which compress them and keep caches in step but leave
+    the catalog to this class.
+    """
+
+    def __init__(self, aggregator: "FSAggregator", catalog: AssetCatalog):
+        self._aggregator = aggregator
+        self._catalog = catalog
+
+    def content_path(self, digest: str) -> str:
+        """
+        Storage key of content with the given SHA-256 digest.
+        The leading digest characters spread keys over many prefixes.
+        """
+        prefix = self._aggregator.fs_config.CAS_PREFIX
+        return f"{prefix}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def ref_path(self, asset_id: str) -> str:
+        return f"{self._aggregator.fs_config.CAS_REFS_PREFIX}/{asset_id}.json"
+
+    @staticmethod
+    def _ref(record: AssetRecord) -> bytes:
+        return json.dumps({
+            "asset_id": record.asset_id,
+            "path": record.key,
+            "size": record.size,
+            "content_type": record.content_type,
+        }).encode()
+
+    async def _write_ref(self, record: AssetRecord) -> None:
+        await self._aggregator._store(
+            provider=FSProvidersEnum(record.provider),
+            path=self.ref_path(record.asset_id),
+            data=self._ref(record),
+            bucket=record.bucket,
+            content_type="application/json",
+        )
+
+    async def _read_ref(
+            self, provider: FSProvidersEnum, asset_id: str, bucket: str | None
+    ) -> Dict[str, Any]:
+        """
+        Raises FileNotFoundError if the asset has no reference.
+        """
+        # Asset ids are UUIDs; anything else would address another object
+        try:
+            uuid.UUID(asset_id)
+        except ValueError:
+            raise FileNotFoundError(f"Asset {asset_id} not found.") from None
+        return json.loads(
+            await self._aggregator.read(
+                provider=provider, path=self.ref_path(asset_id), bucket=bucket
+            )
+        )
+
+    async def record(
+            self, record: AssetRecord, rollback_path: str
+    ) -> AssetRecord | None:
+        """
+        Record an asset that was just stored at rollback_path in the catalog,
+        if enabled, or in its reference object otherwise.
+        Returns the catalog entry, or None without a catalog.
+        """
+        if self._catalog.enabled:
+            return await self._catalog.record_asset(record, rollback_path)
+        await self._write_ref(record)
+        return None
+
+    async def record_batch(
+            self,
+            provider: FSProvidersEnum,
+            bucket: str | None,
+            records: List[AssetRecord],
+            concurrency: int | None = None,
+    ) -> tuple[List[AssetRecord | None], Dict[str, Exception]]:
+        """
+        Record assets that were just stored, in the catalog in one
+        transaction if enabled, or in their reference objects otherwise.
+        Returns the catalog entries, None without a catalog, and the errors
+        by asset path.
+        """
+        if self._catalog.enabled:
+            try:
+                recorded = await self._catalog.record_assets(provider, bucket, records)
+            except Exception as e:
+                return [None] * len(records), {record.key: e for record in records}
+            return list(recorded), {}
+
+        written = await self._aggregator._store_batch_results(
+            provider=provider,
+            data=[(self.ref_path(r.asset_id), self._ref(r)) for r in records],
+            bucket=bucket,
+            concurrency=concurrency,
+            content_types=["application/json"] * len(records),
+        )
+        errors = {
+            record.key: written.errors[self.ref_path(record.asset_id)]
+            for record in records
+            if self.ref_path(record.asset_id) in written.errors
+        }
+        return [None] * len(records), errors
+
+    @staticmethod
+    def _spool_chunk(spool: IO[bytes], hasher: Any, chunk: bytes) -> None:
+        hasher.update(chunk)
+        spool.write(chunk)
+
+    @staticmethod
+    async def _iter_spool(spool: IO[bytes]) -> AsyncIterator[bytes]:
+        await asyncio.to_thread(spool.seek, 0)
+        while chunk := await asyncio.to_thread(spool.read, DEFAULT_CHUNK_SIZE):
+            yield chunk
+
+    async def write(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+            filename: str | None = None,
+    ) -> ContentAddressedWrite:
+        """
+        Store the content under a key derived from its SHA-256 digest.
+        The digest is computed in the same pass that spools the stream, then
+        the upload is skipped if the content is already stored.
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        with tempfile.SpooledTemporaryFile(
+            max_size=self._aggregator.fs_config.CAS_SPOOL_MEMORY_BYTES
+        ) as spool:
+            async for chunk in chunks:
+                await asyncio.to_thread(self._spool_chunk, spool, hasher, chunk)
+                size += len(chunk)
+
+            digest = hasher.hexdigest()
+            path = self.content_path(digest)
+            # With the catalog the content check is an indexed query
+            # instead of a HEAD request.
+            if self._catalog.enabled:
+                deduplicated = await self._catalog.repository.key_exists(
+                    provider, bucket, path
+                )
+            else:
+                deduplicated = await self._aggregator.exists(
+                    provider=provider, path=path, bucket=bucket
+                )
+            if not deduplicated:
+                await self._aggregator._store_stream(
+                    provider=provider,
+                    path=path,
+                    chunks=self._iter_spool(spool),
+                    bucket=bucket,
+                    content_type=content_type,
+                )
+
+        ref = {
+            "asset_id": asset_id,
+            "digest": digest,
+            "path": path,
+            "size": size,
+            "content_type": content_type,
+            "filename": filename,
+        }
+        ref_path = self.ref_path(asset_id)
+        await self._aggregator._store(
+            provider=provider,
+            path=ref_path,
+            data=json.dumps(ref).encode(),
+            bucket=bucket,
+            content_type="application/json",
+        )
+        if self._catalog.enabled:
+            # The content may be shared with other assets, so only the
+            # reference is rolled back if the asset cannot be recorded.
+            await self._catalog.record_asset(
+                AssetRecord(
+                    asset_id=asset_id,
+                    provider=provider,
+                    bucket=bucket,
+                    key=path,
+                    size=size,
+                    content_type=content_type,
+                    digest=digest,
+                ),
+                rollback_path=ref_path,
+                replace_key=False,
+            )
+        return ContentAddressedWrite(
+            asset_id=asset_id,
+            digest=digest,
+            path=path,
+            size=size,
+            deduplicated=deduplicated,
+        )
+
+    async def resolve(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            bucket: str | None = None,
+    ) -> str:
+        """
+        Return the content path an asset id points to, from the catalog or
+        the reference object of the asset.
+        Raises FileNotFoundError if the asset is unknown.
+        """
+        record = await self._catalog.get(asset_id)
+        if record is not None:
+            return record.key
+        return (await self._read_ref(provider, asset_id, bucket))["path"]
+
+    async def release(
+            self,
+            provider: FSProvidersEnum,
+            asset_id: str,
+            bucket: str | None = None,
+    ) -> List[str]:
+        """
+        Remove an asset from the catalog and return the paths to delete with
+        it: its reference object, and its content unless other assets share
+        it. Without a catalog references are not counted, so the content of
+        content-addressed assets is kept.
+        Raises FileNotFoundError if the asset is unknown.
+        """
+        ref_path = self.ref_path(asset_id)
+        if self._catalog.enabled:
+            record, shared = await self._catalog.repository.delete(asset_id)
+            if record is None:
+                raise FileNotFoundError(f"Asset {asset_id} not found.")
+            return [ref_path] if shared else [ref_path, record.key]
+
+        ref = await self._read_ref(provider, asset_id, bucket)
+        return [ref_path] if ref.get("digest") else [ref_path, ref["path"]]
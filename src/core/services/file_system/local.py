@@ -1,14 +1,63 @@
 import asyncio
+import json
+import mimetypes
+import mmap
 import os
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    TypeVar,
+)
+from uuid import uuid4
 
 from loguru import logger
-import aiofiles
 
 from configs.file_system import FileSystemConfig
+from shared.dataclasses.services.core.file_system import (
+    BatchResult,
+    DeleteSummary,
+    ObjectInfo,
+)
 from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.helpers.group_commit import GroupCommitter
+from shared.helpers.streams import DEFAULT_CHUNK_SIZE
 from .base import BaseFSProcessor
 
+R = TypeVar("R")
+
+# Files are written next to their target under this suffix and renamed into
+# place once complete; listings skip them.
+TEMP_FILE_SUFFIX = ".tmp-write"
+# Metadata of a file is kept in a hidden sidecar file next to it, keyed by
+# the ETag of the version it describes; listings skip them.
+METADATA_FILE_SUFFIX = ".metadata.json"
+
+_default_executor: ThreadPoolExecutor | None = None
+
+
+def get_default_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used for blocking file system calls.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="local-fs",
+        )
+    return _default_executor
+
 
 class LocalFSProcessor(BaseFSProcessor):
     """
@@ -16,13 +65,51 @@ class LocalFSProcessor(BaseFSProcessor):
     It inherits from the BaseFSProcessor class.
     """
 
-    def __init__(self):
-        self.__fs_config = FileSystemConfig()
-        self.__local_s3_path = self.__get_local_path(
-            path=self.__fs_config.LOCAL_AWS_S3_PATH
+    def __init__(
+            self,
+            target_provider: FSProvidersEnum = FSProvidersEnum.LOCAL,
+            executor: ThreadPoolExecutor | None = None,
+            fs_config: FileSystemConfig | None = None,
+    ):
+        """
+        target_provider is fixed for the lifetime of the processor, so one
+        instance can be shared by concurrent requests. A processor created
+        for FSProvidersEnum.S3 keeps its files under LOCAL_AWS_S3_PATH.
+        """
+        self.__fs_config = fs_config or FileSystemConfig()
+        self.__target_provider = target_provider
+        # Only used, and never empty, when target_provider is S3
+        self.__local_s3_path = ""
+        self.__local_s3_root = ""
+        if target_provider == FSProvidersEnum.S3:
+            if not self.__fs_config.LOCAL_AWS_S3_PATH:
+                raise ValueError("LOCAL_AWS_S3_PATH must be set for local S3 storage.")
+            self.__local_s3_path = self.__get_local_path(
+                path=self.__fs_config.LOCAL_AWS_S3_PATH
+            )
+            self.__local_s3_root = os.path.realpath(self.__local_s3_path)
+        self.__executor = executor or get_default_executor(
+            self.__fs_config.LOCAL_IO_THREADS
+        )
+        self.__batch_concurrency = self.__fs_config.LOCAL_BATCH_CONCURRENCY
+        self.__mmap_min_bytes = self.__fs_config.LOCAL_MMAP_MIN_BYTES
+        self.__list_batch_size = self.__fs_config.LOCAL_LIST_BATCH_SIZE
+        self.__group_committer = (
+            GroupCommitter(
+                self.__executor,
+                window_seconds=self.__fs_config.LOCAL_GROUP_COMMIT_WINDOW_MS / 1000,
+            )
+            if self.__fs_config.LOCAL_DURABLE_WRITES
+            else None
         )
 
-        self.target_provider: FSProvidersEnum = FSProvidersEnum.LOCAL
+    @property
+    def target_provider(self) -> FSProvidersEnum:
+        return self.__target_provider
+
+    @property
+    def batch_concurrency(self) -> int:
+        return self.__batch_concurrency
 
     @staticmethod
     def __get_local_path(
@@ -33,49 +120,469 @@ class LocalFSProcessor(BaseFSProcessor):
         os.makedirs(local_path, exist_ok=True)
         return local_path
 
+    def local_path(self, path: str) -> str:
+        """
+        Resolve a storage path to the file path on the local disk.
+        """
+        return self.__get_full_path(path)
+
     def __get_full_path(self, path: str) -> str:
         """
         Get the full path to the local S3 folder.
+        Raises ValueError for keys that resolve outside of it.
         """
-        match self.target_provider:
+        match self.__target_provider:
             case FSProvidersEnum.LOCAL:
                 return path
             case FSProvidersEnum.S3:
-                return os.path.join(self.__local_s3_path, path)
+                full_path = os.path.join(self.__local_s3_path, path)
+                root = self.__local_s3_root
+                real_path = os.path.realpath(full_path)
+                if os.path.commonpath([root, real_path]) != root:
+                    raise ValueError(f"Path {path} is outside of the storage root.")
+                return full_path
             case _:
-                raise ValueError(f"Provider {self.target_provider} is not supported.")
+                raise ValueError(
+                    f"Provider {self.__target_provider} is not supported."
+                )
+
+    async def _run_blocking(self, func: Callable[..., R], *args) -> R:
+        """
+        Run a blocking call on the file system thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, partial(func, *args))
+
+    @staticmethod
+    def _etag(stat: os.stat_result) -> str:
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    @classmethod
+    def _object_info(
+            cls,
+            key: str,
+            stat: os.stat_result,
+            content_type: str | None = None,
+            metadata: Dict[str, str] | None = None,
+    ) -> ObjectInfo:
+        return ObjectInfo(
+            key=key,
+            size=stat.st_size,
+            etag=cls._etag(stat),
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            content_type=content_type,
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _metadata_path(full_path: str) -> str:
+        directory, name = os.path.split(full_path)
+        return os.path.join(directory, f".{name}{METADATA_FILE_SUFFIX}")
+
+    @classmethod
+    def _load_metadata_records_sync(cls, full_path: str) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(cls._metadata_path(full_path), mode="rb") as f:
+                records = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return records if isinstance(records, dict) else {}
+
+    @classmethod
+    def _load_metadata_sync(
+            cls, full_path: str, stat: os.stat_result
+    ) -> Dict[str, str] | None:
+        """
+        Metadata recorded for the version of the file described by stat.
+        Files replaced around this class have no record and get None.
+        """
+        return cls._load_metadata_records_sync(full_path).get(cls._etag(stat))
+
+    @classmethod
+    def _metadata_record_sync(
+            cls, file: BinaryIO, full_path: str, metadata: Dict[str, str]
+    ) -> bytes:
+        """
+        Sidecar content describing a written temp file by the ETag it keeps
+        once renamed over full_path. The record of the file it replaces is
+        kept, so readers of that version still find its metadata until the
+        rename.
+        """
+        records = {}
+        try:
+            current = cls._etag(os.stat(full_path))
+        except FileNotFoundError:
+            pass
+        else:
+            previous = cls._load_metadata_records_sync(full_path).get(current)
+            if previous is not None:
+                records[current] = previous
+        file.flush()
+        records[cls._etag(os.fstat(file.fileno()))] = metadata
+        return json.dumps(records).encode()
+
+    @classmethod
+    def _walk_sync(
+            cls,
+            full_dir: str,
+            key_dir: str,
+            name_prefix: str,
+            with_metadata: bool,
+    ) -> Generator[ObjectInfo, None, None]:
+        """
+        Yield every file below full_dir whose name starts with name_prefix.
+        Entries are visited in the lexicographic order of their keys, like
+        an S3 listing, and the file type comes from the directory entry, so
+        no stat call is made unless metadata is requested.
+        """
+        matched = []
+        try:
+            with os.scandir(full_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(name_prefix):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        matched.append((entry.name + "/", entry, True))
+                    elif entry.is_file() and not entry.name.endswith(
+                        (TEMP_FILE_SUFFIX, METADATA_FILE_SUFFIX)
+                    ):
+                        matched.append((entry.name, entry, False))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for name, entry, is_dir in sorted(matched, key=lambda item: item[0]):
+            key = key_dir + name
+            if is_dir:
+                yield from cls._walk_sync(entry.path, key, "", with_metadata)
+            elif with_metadata:
+                try:
+                    yield cls._object_info(key, entry.stat())
+                except FileNotFoundError:
+                    continue
+            else:
+                yield ObjectInfo(key=key)
+
+    @staticmethod
+    def _take_sync(
+            iterator: Iterator[ObjectInfo], count: int, lock: threading.Lock
+    ) -> List[ObjectInfo]:
+        with lock:
+            return list(islice(iterator, count))
+
+    @staticmethod
+    def _close_walker_sync(
+            walker: Generator[ObjectInfo, None, None], lock: threading.Lock
+    ) -> None:
+        # A batch abandoned by a cancelled listing keeps running on its
+        # thread; the walker and its scandir handles are closed after it.
+        with lock:
+            walker.close()
+
+    @classmethod
+    def _stat_sync(cls, full_path: str) -> ObjectInfo:
+        stat = os.stat(full_path)
+        return cls._object_info(
+            full_path,
+            stat,
+            mimetypes.guess_type(full_path)[0],
+            cls._load_metadata_sync(full_path, stat),
+        )
+
+    @staticmethod
+    def _read_sync(full_path: str) -> bytes:
+        with open(full_path, mode="rb") as f:
+            return f.read()
+
+    @classmethod
+    def _read_with_info_sync(cls, full_path: str) -> tuple[bytes, ObjectInfo]:
+        # Files are replaced by rename, so the descriptor keeps reading the
+        # version it was stat'ed as.
+        with open(full_path, mode="rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        info = cls._object_info(
+            full_path,
+            stat,
+            mimetypes.guess_type(full_path)[0],
+            cls._load_metadata_sync(full_path, stat),
+        )
+        return data, info
+
+    @staticmethod
+    def _read_mapped_sync(full_path: str, min_size: int) -> memoryview:
+        with open(full_path, mode="rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size < min_size:
+                return memoryview(f.read()).toreadonly()
+            # The mapping outlives the file descriptor and is unmapped once
+            # the last view of it is released.
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mapped)
+
+    @staticmethod
+    def _read_range_sync(full_path: str, offset: int, length: int | None) -> bytes:
+        with open(full_path, mode="rb") as f:
+            f.seek(offset)
+            return f.read(-1 if length is None else length)
+
+    @staticmethod
+    def _open_for_read_sync(full_path: str, offset: int) -> BinaryIO:
+        file = open(full_path, mode="rb")
+        file.seek(offset)
+        return file
+
+    @staticmethod
+    def _parent_dir(full_path: str) -> str:
+        """
+        Directory of a file; bare file names are in the working directory.
+        """
+        return os.path.dirname(os.path.abspath(full_path))
+
+    @classmethod
+    def _open_temp_sync(cls, full_path: str, make_dirs: bool = True) -> BinaryIO:
+        directory = cls._parent_dir(full_path)
+        name = os.path.basename(full_path)
+        if make_dirs:
+            os.makedirs(directory, exist_ok=True)
+        return open(
+            os.path.join(directory, f".{name}.{uuid4().hex}{TEMP_FILE_SUFFIX}"),
+            mode="xb",
+        )
+
+    @staticmethod
+    def _replace_sync(file: BinaryIO, full_path: str) -> None:
+        file.close()
+        os.replace(file.name, full_path)
+
+    @staticmethod
+    def _discard_sync(file: BinaryIO) -> None:
+        file.close()
+        try:
+            os.remove(file.name)
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def _write_sync(
+            cls, full_path: str, data: bytes, make_dirs: bool = True
+    ) -> None:
+        file = cls._open_temp_sync(full_path, make_dirs)
+        try:
+            file.write(data)
+            cls._replace_sync(file, full_path)
+        except BaseException:
+            cls._discard_sync(file)
+            raise
+
+    @staticmethod
+    def _make_dirs_sync(dir_names: List[str]) -> None:
+        for dir_name in dir_names:
+            os.makedirs(dir_name, exist_ok=True)
+
+    @classmethod
+    def _delete_sync(cls, full_path: str) -> None:
+        try:
+            os.remove(full_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File {full_path} not found.") from None
+        try:
+            os.remove(cls._metadata_path(full_path))
+        except FileNotFoundError:
+            pass
 
     async def list(self, prefix: str, bucket: str | None = None) -> List[str]:
         """
-        Get a list of files in the folder.
+        Get the keys of all files below the prefix.
+        """
+        return [obj.key async for obj in self.iter_list(prefix)]
+
+    async def iter_list(
+            self,
+            prefix: str,
+            bucket: str | None = None,
+            with_metadata: bool = False,
+    ) -> AsyncIterator[ObjectInfo]:
         """
-        prefix = self.__get_full_path(prefix)
-        return await asyncio.to_thread(
-            lambda: [
-                os.path.join(prefix, file)
-                for file in os.listdir(prefix)
-                if os.path.isfile(os.path.join(prefix, file))
-            ]
+        Stream the files whose keys start with the prefix, recursively, with
+        the same key semantics as S3. The directory tree is walked on the
+        thread pool and handed over LOCAL_LIST_BATCH_SIZE entries at a time.
+        """
+        split = prefix.rfind("/") + 1
+        key_dir, name_prefix = prefix[:split], prefix[split:]
+        walker = self._walk_sync(
+            self.__get_full_path(key_dir or "."), key_dir, name_prefix, with_metadata
         )
+        lock = threading.Lock()
+        try:
+            while batch := await self._run_blocking(
+                self._take_sync, walker, self.__list_batch_size, lock
+            ):
+                for obj in batch:
+                    yield obj
+        finally:
+            await self._run_blocking(self._close_walker_sync, walker, lock)
+
+    async def exists(self, path: str, bucket: str | None = None) -> bool:
+        """
+        Check whether the file exists with a single stat call.
+        """
+        return await self._run_blocking(os.path.isfile, self.__get_full_path(path))
+
+    async def stat(self, path: str, bucket: str | None = None) -> ObjectInfo:
+        """
+        Get the size, modification time and a synthetic ETag of the file.
+        """
+        return await self._run_blocking(self._stat_sync, self.__get_full_path(path))
 
     async def read(self, path: str, bucket: str | None = None) -> bytes:
         """
         Process the data and return the result.
         """
-        async with aiofiles.open(self.__get_full_path(path), mode="rb") as f:
-            return await f.read()
+        return await self._run_blocking(self._read_sync, self.__get_full_path(path))
+
+    async def read_with_info(
+            self, path: str, bucket: str | None = None
+    ) -> tuple[bytes, ObjectInfo]:
+        """
+        Read the file and describe it from the same open descriptor.
+        """
+        return await self._run_blocking(
+            self._read_with_info_sync, self.__get_full_path(path)
+        )
+
+    async def read_mapped(
+            self, path: str, bucket: str | None = None
+    ) -> tuple[memoryview, ObjectInfo | None]:
+        """
+        Memory-map the file and return a read-only view of it.
+        Pages are loaded from the page cache on access and shared with every
+        other reader of the file; files below LOCAL_MMAP_MIN_BYTES are read
+        into memory instead. The file is not described, stat it if needed.
+        """
+        view = await self._run_blocking(
+            self._read_mapped_sync, self.__get_full_path(path), self.__mmap_min_bytes
+        )
+        return view, None
+
+    async def read_range(
+            self,
+            path: str,
+            bucket: str | None = None,
+            offset: int = 0,
+            length: int | None = None,
+    ) -> bytes:
+        """
+        Seek to offset and read a byte range of the file.
+        """
+        return await self._run_blocking(
+            self._read_range_sync, self.__get_full_path(path), offset, length
+        )
+
+    async def iter_read(
+            self,
+            path: str,
+            bucket: str | None = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            offset: int = 0,
+            length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the file, or a byte range of it, in chunks.
+        """
+        file = await self._run_blocking(
+            self._open_for_read_sync, self.__get_full_path(path), offset
+        )
+        try:
+            remaining = length
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await self._run_blocking(file.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await self._run_blocking(file.close)
 
     async def read_batch(
-            self, paths: List[str], bucket: str | None = None
+            self,
+            paths: List[str],
+            bucket: str | None = None,
+            concurrency: int | None = None,
     ) -> List[bytes]:
         """
-        Process the data and return the result.
+        Read the files in parallel on the file system thread pool.
         """
-        files: list[bytes] = []
-        for path in paths:
-            files.append(await self.read(path))
+        return await self._run_batch(
+            self.read,
+            paths,
+            concurrency=concurrency or self.__batch_concurrency,
+        )
 
-        return files
+    async def read_batch_results(
+            self,
+            paths: List[str],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+    ) -> BatchResult[bytes]:
+        """
+        Read the files in parallel on the file system thread pool, collecting
+        the failures per path.
+        """
+        return await self._run_batch_results(
+            self.read,
+            paths,
+            keys=paths,
+            concurrency=concurrency or self.__batch_concurrency,
+        )
+
+    async def _commit(
+            self,
+            file: BinaryIO,
+            full_path: str,
+            metadata: Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Rename a completely written temp file over the target, so readers
+        only ever see the old or the new file. With durable writes the data
+        is synced before the rename and the directory entry after it, both
+        as part of a group commit. Metadata is recorded before the rename.
+        """
+        if metadata:
+            record = await self._run_blocking(
+                self._metadata_record_sync, file, full_path, metadata
+            )
+            await self._write_file(
+                self._metadata_path(full_path), record, make_dirs=False
+            )
+        if self.__group_committer is None:
+            await self._run_blocking(self._replace_sync, file, full_path)
+            return
+
+        await self._run_blocking(file.flush)
+        await self.__group_committer.sync(file.fileno())
+        await self._run_blocking(self._replace_sync, file, full_path)
+        await self.__group_committer.sync(self._parent_dir(full_path))
+
+    async def _write_file(
+            self,
+            full_path: str,
+            data: bytes,
+            make_dirs: bool = True,
+            metadata: Dict[str, str] | None = None,
+    ) -> None:
+        if self.__group_committer is None and not metadata:
+            await self._run_blocking(self._write_sync, full_path, data, make_dirs)
+            return
+
+        file = await self._run_blocking(self._open_temp_sync, full_path, make_dirs)
+        try:
+            await self._run_blocking(file.write, data)
+            await self._commit(file, full_path, metadata)
+        except BaseException:
+            await self._run_blocking(self._discard_sync, file)
+            raise
 
     async def write(
             self,
@@ -83,49 +590,142 @@ class LocalFSProcessor(BaseFSProcessor):
             data: bytes,
             bucket: str | None = None,
             content_type: str | None = None,
+            metadata: Dict[str, str] | None = None,
     ) -> None:
         """
-        Process the data and return the result.
+        Write the file atomically through a temp file.
+        Metadata is kept in a sidecar file, the content type is not stored.
         """
         logger.warning(f"Writing file {path} to local storage.")
+        await self._write_file(self.__get_full_path(path), data, metadata=metadata)
+
+    async def write_stream(
+            self,
+            path: str,
+            chunks: AsyncIterable[bytes],
+            bucket: str | None = None,
+            content_type: str | None = None,
+            metadata: Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Append the chunks to a temp file as they arrive and rename it into
+        place at the end. The temp file is removed if the stream fails.
+        """
+        logger.warning(f"Streaming file {path} to local storage.")
         full_path = self.__get_full_path(path)
-        dir_name = os.path.dirname(full_path)
-        os.makedirs(dir_name, exist_ok=True)  # Ensure the directory exists
-        async with aiofiles.open(full_path, mode="wb") as f:
-            await f.write(data)
+        file = await self._run_blocking(self._open_temp_sync, full_path)
+        try:
+            async for chunk in chunks:
+                await self._run_blocking(file.write, chunk)
+            await self._commit(file, full_path, metadata)
+        except BaseException:
+            await self._run_blocking(self._discard_sync, file)
+            raise
+
+    async def _prepare_write_batch(
+            self,
+            data: List[tuple[str, bytes]],
+            metadata: List[Dict[str, str] | None] | None,
+    ) -> List[tuple[str, bytes, Dict[str, str] | None]]:
+        """
+        Resolve the full paths of a batch and create every target directory
+        once for the whole batch.
+        """
+        logger.warning(f"Writing {len(data)} files to local storage.")
+        full_data = [
+            (self.__get_full_path(path), file, file_metadata)
+            for (path, file), file_metadata
+            in zip(data, metadata or [None] * len(data))
+        ]
+        dir_names = list({self._parent_dir(path) for path, _, _ in full_data})
+        await self._run_blocking(self._make_dirs_sync, dir_names)
+        return full_data
+
+    async def _write_batch_item(
+            self, item: tuple[str, bytes, Dict[str, str] | None]
+    ) -> None:
+        full_path, file, metadata = item
+        await self._write_file(full_path, file, make_dirs=False, metadata=metadata)
 
     async def write_batch(
-            self, data: List[tuple[str, bytes]], bucket: str | None = None
+            self,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+            metadata: List[Dict[str, str] | None] | None = None,
     ) -> None:
         """
-        Process the data and return the result.
+        Write the files in parallel on the file system thread pool.
+        Metadata is kept in sidecar files, content types are not stored.
         """
-        for path, file in data:
-            await self.write(path, file)
+        await self._run_batch(
+            self._write_batch_item,
+            await self._prepare_write_batch(data, metadata),
+            concurrency=concurrency or self.__batch_concurrency,
+        )
+
+    async def write_batch_results(
+            self,
+            data: List[tuple[str, bytes]],
+            bucket: str | None = None,
+            concurrency: int | None = None,
+            content_types: List[str | None] | None = None,
+            metadata: List[Dict[str, str] | None] | None = None,
+    ) -> BatchResult[None]:
+        """
+        Write the files in parallel on the file system thread pool, collecting
+        the failures per path.
+        """
+        return await self._run_batch_results(
+            self._write_batch_item,
+            await self._prepare_write_batch(data, metadata),
+            keys=[path for path, _ in data],
+            concurrency=concurrency or self.__batch_concurrency,
+        )
 
     async def delete(self, path: str, bucket: str | None = None) -> None:
         """
         Process the data and return the result.
         """
-        path = self.__get_full_path(path)
-        if os.path.exists(path):
-            await asyncio.to_thread(os.remove, path)
-        else:
-            raise FileNotFoundError(f"File {path} not found.")
+        await self._run_blocking(self._delete_sync, self.__get_full_path(path))
 
-    async def delete_batch(self, paths: List[str], bucket: str | None = None) -> None:
+    async def delete_batch(
+            self, paths: List[str], bucket: str | None = None
+    ) -> DeleteSummary:
         """
-        Process the data and return the result.
+        Delete the files in parallel on the file system thread pool.
+        Failures are reported per key; files that are already gone count as
+        deleted, as they do on S3.
         """
-        for path in paths:
-            await self.delete(path)
+        async def delete(path: str) -> None:
+            try:
+                await self._run_blocking(
+                    self._delete_sync, self.__get_full_path(path)
+                )
+            except FileNotFoundError:
+                pass
+
+        result = await self._run_batch_results(
+            delete,
+            paths,
+            keys=paths,
+            concurrency=self.__batch_concurrency,
+        )
+        errors = {key: str(e) for key, e in result.errors.items()}
+        return DeleteSummary(deleted=len(paths) - len(errors), errors=errors)
 
     async def delete_files_by_prefix(
             self, prefix: str, bucket: str | None = None
-    ) -> None:
+    ) -> DeleteSummary:
         """
         Process the data and return the result.
         """
         files = await self.list(prefix)
-        for file in files:
-            await self.delete(file)
+        summary = await self.delete_batch(files)
+        if summary.errors:
+            logger.warning(
+                f"Failed to delete {len(summary.errors)} files with prefix "
+                f"'{prefix}'"
+            )
+        return summary
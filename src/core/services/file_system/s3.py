@@ -1,9 +1,27 @@
 from dataclasses import dataclass
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List
 
+from botocore.exceptions import ClientError
+
+from shared.dataclasses.services.core.file_system import (
+    BatchResult,
+    DeleteSummary,
+    ObjectInfo,
+    PresignedMultipartUpload,
+)
+from shared.helpers.concurrency import AdaptiveConcurrencyLimiter
+from shared.helpers.streams import DEFAULT_CHUNK_SIZE
 from .base import BaseFSProcessor
 from ...repositories.aws.s3 import S3Repository
 
+# Errors caused by the parts a client reported, not by the service
+MULTIPART_CLIENT_ERROR_CODES = frozenset(
+    {"EntityTooSmall", "InvalidPart", "InvalidPartOrder", "NoSuchUpload"}
+)
+
+# File, content type and metadata of one write of a batch
+_BatchWriteItem = tuple[tuple[str, bytes], str | None, Dict[str, str] | None]
+
 
 @dataclass
 class S3FSProcessorConfig:
@@ -12,6 +30,8 @@ class S3FSProcessorConfig:
     """
 
     s3_repository: S3Repository
+    batch_concurrency: int = 32
+    parallel_reads: bool = False
 
 
 class S3FSProcessor(BaseFSProcessor):
@@ -26,6 +46,16 @@ class S3FSProcessor(BaseFSProcessor):
 
     def __init__(self, config: S3FSProcessorConfig):
         self._repository = config.s3_repository
+        self._batch_concurrency = config.batch_concurrency
+        self._parallel_reads = config.parallel_reads
+
+    @property
+    def batch_limiter(self) -> AdaptiveConcurrencyLimiter | None:
+        return self._repository.limiter
+
+    @property
+    def batch_concurrency(self) -> int:
+        return self._batch_concurrency
 
     async def list(
         self,
@@ -40,6 +70,53 @@ class S3FSProcessor(BaseFSProcessor):
 
         return await self._repository.list_file(bucket, prefix)
 
+    async def iter_list(
+        self,
+        prefix: str,
+        bucket: str | None,
+        with_metadata: bool = False,
+    ) -> AsyncIterator[ObjectInfo]:
+        """
+        Stream files in the S3 bucket with the given prefix page by page.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        async for obj in self._repository.iter_files(
+            bucket, prefix, with_metadata=with_metadata
+        ):
+            yield obj
+
+    async def exists(
+        self,
+        path: str,
+        bucket: str | None,
+    ) -> bool:
+        """
+        Check whether a file exists in the S3 bucket with a HEAD request.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        return await self._repository.file_exists(bucket, path)
+
+    async def stat(
+        self,
+        path: str,
+        bucket: str | None,
+    ) -> ObjectInfo:
+        """
+        Get the metadata of a file in the S3 bucket with a HEAD request.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        try:
+            return await self._repository.get_file_info(bucket, path)
+        except ClientError as e:
+            self._raise_not_found(e, bucket, path)
+            raise
+
     async def read(
         self,
         path: str,
@@ -51,24 +128,109 @@ class S3FSProcessor(BaseFSProcessor):
         if bucket is None:
             raise ValueError(self.errors["bucket_cannot_be_none"])
 
-        return await self._repository.get_file(bucket, path)
+        try:
+            return await self._repository.get_file(
+                bucket, path, parallel=self._parallel_reads
+            )
+        except ClientError as e:
+            self._raise_not_found(e, bucket, path)
+            raise
 
-    async def read_batch(
+    async def read_with_info(
         self,
-        paths: List[str],
+        path: str,
         bucket: str | None,
-    ) -> List[bytes]:
+    ) -> tuple[bytes, ObjectInfo]:
         """
-        Read multiple files from the S3 bucket.
+        Read a file from the S3 bucket with the ETag and metadata of its GET
+        response.
         """
         if bucket is None:
             raise ValueError(self.errors["bucket_cannot_be_none"])
 
-        files = []
-        for path in paths:
-            files.append(await self.read(path=path, bucket=bucket))
+        try:
+            return await self._repository.get_file_with_info(
+                bucket, path, parallel=self._parallel_reads
+            )
+        except ClientError as e:
+            self._raise_not_found(e, bucket, path)
+            raise
 
-        return files
+    async def read_range(
+        self,
+        path: str,
+        bucket: str | None,
+        offset: int,
+        length: int | None = None,
+    ) -> bytes:
+        """
+        Read a byte range of a file from the S3 bucket with a ranged GET.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        return await self._repository.get_file_range(bucket, path, offset, length)
+
+    async def iter_read(
+        self,
+        path: str,
+        bucket: str | None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a file, or a byte range of it, from the S3 bucket.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        async for chunk in self._repository.iter_file(
+            bucket, path, chunk_size, offset=offset, length=length
+        ):
+            yield chunk
+
+    def _batch_reader(self, bucket: str | None) -> Callable[[str], Awaitable[bytes]]:
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        async def read(path: str) -> bytes:
+            return await self.read(path=path, bucket=bucket)
+
+        return read
+
+    async def read_batch(
+        self,
+        paths: List[str],
+        bucket: str | None,
+        concurrency: int | None = None,
+    ) -> List[bytes]:
+        """
+        Read multiple files from the S3 bucket concurrently.
+        The result keeps the order of the given paths.
+        """
+        return await self._run_batch(
+            self._batch_reader(bucket),
+            paths,
+            concurrency=concurrency or self._batch_concurrency,
+        )
+
+    async def read_batch_results(
+        self,
+        paths: List[str],
+        bucket: str | None,
+        concurrency: int | None = None,
+    ) -> BatchResult[bytes]:
+        """
+        Read multiple files from the S3 bucket concurrently, collecting the
+        failures per path.
+        """
+        return await self._run_batch_results(
+            self._batch_reader(bucket),
+            paths,
+            keys=paths,
+            concurrency=concurrency or self._batch_concurrency,
+        )
 
     async def write(
         self,
@@ -76,31 +238,202 @@ class S3FSProcessor(BaseFSProcessor):
         data: bytes,
         bucket: str | None,
         content_type: str | None = None,
+        metadata: Dict[str, str] | None = None,
     ) -> None:
         """
-        Write a file to the S3 bucket.
+        Write a file to the S3 bucket, with metadata as user-defined metadata.
         """
         if bucket is None:
             raise ValueError(self.errors["bucket_cannot_be_none"])
 
-        await self._repository.put_file(bucket, path, data, content_type=content_type)
+        await self._repository.put_file(
+            bucket, path, data, content_type=content_type, metadata=metadata
+        )
+
+    async def write_stream(
+        self,
+        path: str,
+        chunks: AsyncIterable[bytes],
+        bucket: str | None,
+        content_type: str | None = None,
+        metadata: Dict[str, str] | None = None,
+    ) -> None:
+        """
+        Stream a file to the S3 bucket, using multipart upload for large bodies.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        await self._repository.put_file(
+            bucket, path, chunks, content_type=content_type, metadata=metadata
+        )
+
+    def _batch_writer(
+        self, bucket: str | None
+    ) -> Callable[[_BatchWriteItem], Awaitable[None]]:
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        async def write(item: _BatchWriteItem) -> None:
+            (path, file), content_type, file_metadata = item
+            await self.write(
+                path=path,
+                data=file,
+                bucket=bucket,
+                content_type=content_type,
+                metadata=file_metadata,
+            )
+
+        return write
+
+    @staticmethod
+    def _batch_write_items(
+        data: List[tuple[str, bytes]],
+        content_types: List[str | None] | None,
+        metadata: List[Dict[str, str] | None] | None,
+    ) -> List[_BatchWriteItem]:
+        return list(zip(
+            data,
+            content_types or [None] * len(data),
+            metadata or [None] * len(data),
+        ))
 
     async def write_batch(
         self,
         data: List[tuple[str, bytes]],
         bucket: str | None,
+        concurrency: int | None = None,
+        content_types: List[str | None] | None = None,
+        metadata: List[Dict[str, str] | None] | None = None,
     ) -> None:
         """
-        Write multiple files to the S3 bucket.
+        Write multiple files to the S3 bucket concurrently.
+        content_types and metadata, if given, hold the content type and
+        metadata of each file.
+        """
+        await self._run_batch(
+            self._batch_writer(bucket),
+            self._batch_write_items(data, content_types, metadata),
+            concurrency=concurrency or self._batch_concurrency,
+        )
+
+    async def write_batch_results(
+        self,
+        data: List[tuple[str, bytes]],
+        bucket: str | None,
+        concurrency: int | None = None,
+        content_types: List[str | None] | None = None,
+        metadata: List[Dict[str, str] | None] | None = None,
+    ) -> BatchResult[None]:
+        """
+        Write multiple files to the S3 bucket concurrently, collecting the
+        failures per path.
+        """
+        return await self._run_batch_results(
+            self._batch_writer(bucket),
+            self._batch_write_items(data, content_types, metadata),
+            keys=[path for path, _ in data],
+            concurrency=concurrency or self._batch_concurrency,
+        )
+
+    @property
+    def supports_presigned_urls(self) -> bool:
+        return True
+
+    async def presign_download(
+        self,
+        path: str,
+        bucket: str | None,
+        expires_in: int,
+    ) -> str:
+        """
+        Presigned URL to GET the file straight from S3.
         """
         if bucket is None:
             raise ValueError(self.errors["bucket_cannot_be_none"])
 
-        for pair in data:
-            path, file = pair
-            await self.write(path=path, data=file, bucket=bucket)
+        return await self._repository.presign_get_file(bucket, path, expires_in)
 
-        return None
+    async def presign_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        expires_in: int,
+        content_type: str | None = None,
+    ) -> str:
+        """
+        Presigned URL to PUT the file straight to S3, with content_type, if
+        given, as the only accepted Content-Type.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        return await self._repository.presign_put_file(
+            bucket, path, expires_in, content_type=content_type
+        )
+
+    async def presign_multipart_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        part_count: int,
+        expires_in: int,
+        content_type: str | None = None,
+    ) -> PresignedMultipartUpload:
+        """
+        Start a multipart upload and presign a URL for each of its parts.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        upload_id = await self._repository.create_multipart_upload(
+            bucket, path, content_type=content_type
+        )
+        try:
+            part_urls = await self._repository.presign_file_parts(
+                bucket, path, upload_id, part_count, expires_in
+            )
+        except BaseException:
+            await self._repository.abort_multipart_upload(bucket, path, upload_id)
+            raise
+        return PresignedMultipartUpload(upload_id=upload_id, part_urls=part_urls)
+
+    async def complete_multipart_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        upload_id: str,
+        parts: List[tuple[int, str]],
+    ) -> None:
+        """
+        Assemble the parts, given as part number and ETag, into the file.
+        Raises ValueError if the parts or the upload id are not valid.
+        """
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        try:
+            await self._repository.complete_multipart_upload(
+                bucket,
+                path,
+                upload_id,
+                [{"PartNumber": number, "ETag": etag} for number, etag in parts],
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in MULTIPART_CLIENT_ERROR_CODES:
+                raise ValueError(e.response["Error"].get("Message", str(e))) from e
+            raise
+
+    async def abort_multipart_upload(
+        self,
+        path: str,
+        bucket: str | None,
+        upload_id: str,
+    ) -> None:
+        if bucket is None:
+            raise ValueError(self.errors["bucket_cannot_be_none"])
+
+        await self._repository.abort_multipart_upload(bucket, path, upload_id)
 
     async def delete(
         self,
@@ -119,27 +452,36 @@ class S3FSProcessor(BaseFSProcessor):
         self,
         paths: List[str],
         bucket: str | None,
-    ) -> None:
+    ) -> DeleteSummary:
         """
-        Delete multiple files from the S3 bucket.
+        Delete multiple files from the S3 bucket in chunks of up to 1000 keys.
         """
         if bucket is None:
             raise ValueError(self.errors["bucket_cannot_be_none"])
 
-        await self._repository.delete_files(bucket, paths)
+        return await self._repository.delete_files(bucket, paths)
 
     async def delete_files_by_prefix(
         self,
         prefix: str,
         bucket: str | None,
-    ) -> None:
+    ) -> DeleteSummary:
         """
         Delete all files in the S3 bucket with the given prefix.
         """
         if bucket is None:
             raise ValueError(self.errors["bucket_cannot_be_none"])
 
-        await self._repository.delete_files_by_prefix(bucket, prefix)
+        return await self._repository.delete_files_by_prefix(bucket, prefix)
+
+    @staticmethod
+    def _raise_not_found(error: ClientError, bucket: str, path: str) -> None:
+        """
+        Translate a missing object error into FileNotFoundError, like the
+        local file system does.
+        """
+        if error.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            raise FileNotFoundError(f"File s3://{bucket}/{path} not found.") from error
 
     @classmethod
     def resolve_path(cls, path: str) -> tuple[str, str]:
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List
+
+from loguru import logger
+
+from shared.helpers.metrics import (
+    Histogram,
+    MetricKey,
+    MetricsRegistry,
+    MetricsSnapshot,
+)
+
+# PutMetricData accepts up to 1000 datums, but the 1 MB payload limit is
+# the tighter bound once histograms carry their value arrays.
+CW_MAX_DATUMS_PER_REQUEST = 500
+
+
+class CloudWatchMetricsPublisher:
+    """
+    Publishes a MetricsRegistry to CloudWatch from a background task.
+    Counters and histograms are sent as deltas since the last successful
+    publish and gauges as their current value. Recording stays in memory,
+    so publishing never adds latency to the operations being measured.
+    """
+
+    def __init__(
+            self,
+            metrics: MetricsRegistry,
+            namespace: str,
+            client_provider: Callable[[], Awaitable[Any]],
+            interval_seconds: float = 60.0,
+    ):
+        """
+        client_provider returns an object with an async put_metric_data
+        method, such as AwsClientFactory.get_cloudwatch_client or a local stub.
+        """
+        self._metrics = metrics
+        self._namespace = namespace
+        self._client_provider = client_provider
+        self._interval_seconds = interval_seconds
+        self._client: Any = None
+        self._task: asyncio.Task | None = None
+        self._published = MetricsSnapshot(counters={}, gauges={}, histograms={})
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and flush what was recorded since the last
+        publish.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.publish()
+        if self._client is not None and hasattr(self._client, "close"):
+            await self._client.close()
+        self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            await self.publish()
+
+    async def publish(self) -> int:
+        """
+        Send one aggregated batch and return the number of datums sent.
+        Failed batches are kept and merged into the next publish.
+        """
+        snapshot = self._metrics.snapshot()
+        datums = self.build_datums(snapshot, self._published)
+        if not datums:
+            return 0
+
+        try:
+            if self._client is None:
+                self._client = await self._client_provider()
+            for start in range(0, len(datums), CW_MAX_DATUMS_PER_REQUEST):
+                await self._client.put_metric_data(
+                    Namespace=self._namespace,
+                    MetricData=datums[start:start + CW_MAX_DATUMS_PER_REQUEST],
+                )
+        except Exception as e:
+            logger.warning(f"Failed to publish metrics to CloudWatch: {e}")
+            return 0
+
+        self._published = snapshot
+        return len(datums)
+
+    @staticmethod
+    def _dimensions(key: MetricKey) -> List[Dict[str, str]]:
+        return [{"Name": name, "Value": value} for name, value in key[1]]
+
+    @classmethod
+    def build_datums(
+            cls,
+            snapshot: MetricsSnapshot,
+            previous: MetricsSnapshot,
+    ) -> List[Dict[str, Any]]:
+        datums: List[Dict[str, Any]] = []
+        for key, value in snapshot.counters.items():
+            delta = value - previous.counters.get(key, 0)
+            if delta:
+                datums.append(
+                    {
+                        "MetricName": key[0],
+                        "Dimensions": cls._dimensions(key),
+                        "Value": delta,
+                        "Unit": "Bytes" if ".bytes_" in key[0] else "Count",
+                    }
+                )
+
+        for key, value in snapshot.gauges.items():
+            datums.append(
+                {
+                    "MetricName": key[0],
+                    "Dimensions": cls._dimensions(key),
+                    "Value": value,
+                    "Unit": "Count",
+                }
+            )
+
+        for key, histogram in snapshot.histograms.items():
+            values, counts = cls._histogram_delta(
+                histogram, previous.histograms.get(key)
+            )
+            if values:
+                datums.append(
+                    {
+                        "MetricName": key[0],
+                        "Dimensions": cls._dimensions(key),
+                        "Values": values,
+                        "Counts": counts,
+                        "Unit": "Milliseconds",
+                    }
+                )
+        return datums
+
+    @staticmethod
+    def _histogram_delta(
+            histogram: Histogram,
+            previous: Histogram | None,
+    ) -> tuple[List[float], List[float]]:
+        values: List[float] = []
+        counts: List[float] = []
+        for index, count in enumerate(histogram.counts):
+            delta = count - (previous.counts[index] if previous else 0)
+            if delta:
+                values.append(histogram.bucket_value(index))
+                counts.append(delta)
+        return values, counts
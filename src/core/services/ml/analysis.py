@@ -0,0 +1,98 @@
+"""
+CPU-bound document analysis.
+
+Functions in this module run inside the analysis process pool, so they must
+stay top-level and only take and return picklable values.
+"""
+
+import json
+import math
+import mmap
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+PRINTABLE_BYTES = frozenset(range(0x20, 0x7F)) | {0x09, 0x0A, 0x0D}
+TEXT_PRINTABLE_RATIO = 0.95
+
+
+@dataclass
+class ChunkStats:
+    size: int = 0
+    lines: int = 0
+    words: int = 0
+    starts_inside_word: bool = False
+    ends_inside_word: bool = False
+    byte_counts: Dict[int, int] = field(default_factory=dict)
+
+    def to_json(self) -> bytes:
+        return json.dumps(asdict(self)).encode()
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "ChunkStats":
+        fields = json.loads(data)
+        fields["byte_counts"] = {
+            int(byte): count for byte, count in fields["byte_counts"].items()
+        }
+        return cls(**fields)
+
+
+def analyze_chunk(chunk: bytes) -> ChunkStats:
+    """
+    Collect the statistics of one chunk of a document.
+    """
+    return ChunkStats(
+        size=len(chunk),
+        lines=chunk.count(b"\n"),
+        words=len(chunk.split()),
+        starts_inside_word=bool(chunk) and not chunk[:1].isspace(),
+        ends_inside_word=bool(chunk) and not chunk[-1:].isspace(),
+        byte_counts=dict(Counter(chunk)),
+    )
+
+
+def analyze_file_range(path: str, offset: int, length: int) -> ChunkStats:
+    """
+    Collect the statistics of a byte range of a local file.
+    The worker maps the file itself, so the range is read straight from the
+    page cache instead of being copied through the parent process.
+    """
+    if length <= 0:
+        return analyze_chunk(b"")
+    with open(path, mode="rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return analyze_chunk(mapped[offset:offset + length])
+
+
+def merge_chunk_stats(chunks: List[ChunkStats]) -> Dict[str, Any]:
+    """
+    Combine the statistics of consecutive chunks into the document analysis.
+    A word split across a chunk boundary is only counted once.
+    """
+    size = lines = words = 0
+    byte_counts: Counter = Counter()
+    previous: ChunkStats | None = None
+    for stats in chunks:
+        size += stats.size
+        lines += stats.lines
+        words += stats.words
+        if previous and previous.ends_inside_word and stats.starts_inside_word:
+            words -= 1
+        byte_counts.update(stats.byte_counts)
+        if stats.size:
+            previous = stats
+
+    printable = sum(byte_counts[b] for b in PRINTABLE_BYTES)
+    printable_ratio = printable / size if size else 1.0
+    entropy = -sum(
+        count / size * math.log2(count / size) for count in byte_counts.values()
+    ) if size else 0.0
+    return {
+        "size": size,
+        "lines": lines,
+        "words": words,
+        "distinct_bytes": len(byte_counts),
+        "entropy_bits_per_byte": round(entropy, 4),
+        "printable_ratio": round(printable_ratio, 4),
+        "is_text": printable_ratio >= TEXT_PRINTABLE_RATIO,
+    }
@@ -0,0 +1,381 @@
+import asyncio
+import hashlib
+import json
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Set, Tuple
+from uuid import uuid4
+
+from loguru import logger
+
+from configs.ml import MLConfig
+from shared.dataclasses.services.core.file_system import ObjectInfo
+from shared.dataclasses.services.core.jobs import Job
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.enums.services.core.jobs import JobStatusEnum
+from shared.exceptions.jobs import (
+    JobNotFinishedError,
+    JobNotFoundError,
+    JobNotRetryableError,
+    JobQueueFullError,
+)
+from shared.helpers.concurrency import map_bounded
+from .analysis import (
+    ChunkStats,
+    analyze_chunk,
+    analyze_file_range,
+    merge_chunk_stats,
+)
+from ..file_system.aggregator import FSAggregator
+
+# Share of the progress bar covered by the analysis, the rest is storing.
+ANALYSIS_PROGRESS_SHARE = 0.95
+
+
+@dataclass
+class JobManagerConfig:
+    file_system_aggregator: FSAggregator
+    executor: Executor
+    ml_config: MLConfig
+
+    provider: FSProvidersEnum = FSProvidersEnum.S3
+    bucket: str | None = None
+
+
+class JobManager:
+    """
+    Runs document analysis jobs in the background.
+    Submitting only enqueues the job; a fixed number of runner tasks split
+    the input into byte-range shards, analyse the shards in parallel on the
+    process pool and store the merged result, so the event loop never does
+    the CPU-heavy work. Every shard is checkpointed, and a retried job only
+    processes the shards that are missing.
+    """
+
+    def __init__(self, config: JobManagerConfig):
+        self._aggregator = config.file_system_aggregator
+        self._executor = config.executor
+        self._ml_config = config.ml_config
+        self._provider = config.provider
+        self._bucket = config.bucket
+
+        self._queue: asyncio.Queue[str] = asyncio.Queue(
+            maxsize=self._ml_config.QUEUE_SIZE
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._runners: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._runners:
+            return
+        self._runners = [
+            asyncio.create_task(self._run())
+            for _ in range(self._ml_config.CONCURRENT_JOBS)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the runners. Jobs that have not finished are cancelled.
+        """
+        for runner in self._runners:
+            runner.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        self._runners = []
+
+        for job in self._jobs.values():
+            if not job.status.finished:
+                self._finish(job, JobStatusEnum.CANCELLED)
+
+    def submit(self, asset_id: str) -> Job:
+        """
+        Queue an analysis of the asset and return the job right away.
+        Raises JobQueueFullError when the queue is full.
+        """
+        self._prune()
+        job = Job(job_id=str(uuid4()), asset_id=asset_id)
+        try:
+            self._queue.put_nowait(job.job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(self._queue.qsize()) from None
+
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a queued or running job. Finished jobs are left as they are.
+        """
+        job = self.get(job_id)
+        if job.status.finished:
+            return job
+
+        self._finish(job, JobStatusEnum.CANCELLED)
+        if job.task is not None:
+            job.task.cancel()
+        return job
+
+    def retry(self, job_id: str) -> Job:
+        """
+        Queue a failed or cancelled job again. Shards checkpointed by the
+        earlier attempts are not processed again.
+        """
+        job = self.get(job_id)
+        if job.status not in (JobStatusEnum.FAILED, JobStatusEnum.CANCELLED):
+            raise JobNotRetryableError(job_id, job.status)
+        if job.task is not None:
+            # A cancelled attempt that has not wound down yet.
+            raise JobNotRetryableError(job_id, JobStatusEnum.RUNNING)
+
+        try:
+            self._queue.put_nowait(job.job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(self._queue.qsize()) from None
+
+        job.status = JobStatusEnum.QUEUED
+        job.progress = 0.0
+        job.error = None
+        job.started_at = None
+        job.finished_at = None
+        job.attempts += 1
+        return job
+
+    async def get_result(self, job_id: str) -> Dict[str, Any]:
+        job = self.get(job_id)
+        if job.status != JobStatusEnum.SUCCEEDED or job.result_path is None:
+            raise JobNotFinishedError(job_id, job.status)
+
+        data = await self._aggregator.read(
+            provider=self._provider,
+            path=job.result_path,
+            bucket=self._bucket,
+        )
+        return json.loads(data)
+
+    def result_path(self, job_id: str) -> str:
+        return f"{self._ml_config.RESULTS_PREFIX}/{job_id}.json"
+
+    @staticmethod
+    def _finish(
+            job: Job,
+            status: JobStatusEnum,
+            error: str | None = None,
+    ) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+
+    def _prune(self) -> None:
+        """
+        Forget finished jobs older than the retention period.
+        """
+        now = datetime.now(timezone.utc)
+        retention = self._ml_config.JOB_RETENTION_SECONDS
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None
+            and (now - job.finished_at).total_seconds() > retention
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == JobStatusEnum.QUEUED:
+                    await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Job) -> None:
+        job.status = JobStatusEnum.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        job.task = asyncio.create_task(self._process(job))
+        try:
+            result_path = await job.task
+        except asyncio.CancelledError:
+            current_task = asyncio.current_task()
+            if current_task is not None and current_task.cancelling():
+                raise
+            if not job.status.finished:
+                self._finish(job, JobStatusEnum.CANCELLED)
+        except FileNotFoundError as e:
+            logger.warning(f"Input of analysis job {job.job_id} not found: {e}")
+            if not job.status.finished:
+                self._finish(
+                    job, JobStatusEnum.FAILED, error=f"Asset {job.asset_id} not found"
+                )
+        except Exception as e:
+            logger.exception(f"Analysis job {job.job_id} failed: {e}")
+            if not job.status.finished:
+                self._finish(job, JobStatusEnum.FAILED, error=str(e))
+        else:
+            if not job.status.finished:
+                job.result_path = result_path
+                job.progress = 1.0
+                self._finish(job, JobStatusEnum.SUCCEEDED)
+        finally:
+            job.task = None
+
+    async def _resolve_input(self, asset_id: str) -> str:
+        """
+        Map an asset id to its storage path through the catalog or the
+        reference object of the asset.
+        Raises FileNotFoundError for unknown asset ids.
+        """
+        return await self._aggregator.resolve_asset(
+            provider=self._provider,
+            asset_id=asset_id,
+            bucket=self._bucket,
+        )
+
+    def _checkpoint_prefix(self, path: str, info: ObjectInfo) -> str:
+        """
+        Checkpoints are keyed by the input version and the shard size, so a
+        retry of the same input resumes while a changed input starts over.
+        """
+        key = hashlib.sha256(
+            json.dumps(
+                [path, info.etag, info.size, self._ml_config.SHARD_SIZE]
+            ).encode()
+        ).hexdigest()
+        return f"{self._ml_config.CHECKPOINTS_PREFIX}/{key}/"
+
+    def _shards(self, size: int) -> List[Tuple[int, int, int]]:
+        """
+        Split the input into (index, offset, length) byte ranges.
+        """
+        shard_size = self._ml_config.SHARD_SIZE
+        return [
+            (index, offset, min(shard_size, size - offset))
+            for index, offset in enumerate(range(0, size, shard_size))
+        ]
+
+    async def _completed_shards(self, checkpoint_prefix: str) -> Set[str]:
+        try:
+            return {
+                obj.key.rsplit("/", 1)[-1]
+                async for obj in self._aggregator.iter_list(
+                    provider=self._provider,
+                    prefix=checkpoint_prefix,
+                    bucket=self._bucket,
+                )
+            }
+        except FileNotFoundError:
+            return set()
+
+    async def _process_shard(
+            self,
+            path: str,
+            info: ObjectInfo,
+            local_path: str | None,
+            checkpoint_prefix: str,
+            completed: Set[str],
+            shard: Tuple[int, int, int],
+    ) -> ChunkStats:
+        """
+        Analyse one byte range on the process pool and checkpoint the result.
+        Shards checkpointed by an earlier attempt are loaded instead. Files on
+        the local disk are mapped by the worker rather than read here.
+        """
+        index, offset, length = shard
+        checkpoint_name = f"{index}.json"
+        checkpoint_path = f"{checkpoint_prefix}{checkpoint_name}"
+        if checkpoint_name in completed:
+            try:
+                return ChunkStats.from_json(
+                    await self._aggregator.read(
+                        provider=self._provider,
+                        path=checkpoint_path,
+                        bucket=self._bucket,
+                    )
+                )
+            except (FileNotFoundError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Ignoring checkpoint {checkpoint_path}: {e}")
+
+        loop = asyncio.get_running_loop()
+        if local_path is not None:
+            stats = await loop.run_in_executor(
+                self._executor, analyze_file_range, local_path, offset, length
+            )
+        else:
+            data = await self._aggregator.read_range(
+                provider=self._provider,
+                path=path,
+                offset=offset,
+                length=length,
+                bucket=self._bucket,
+                info=info,
+            )
+            stats = await loop.run_in_executor(self._executor, analyze_chunk, data)
+        await self._aggregator.write(
+            provider=self._provider,
+            path=checkpoint_path,
+            data=stats.to_json(),
+            bucket=self._bucket,
+            content_type="application/json",
+        )
+        return stats
+
+    async def _process(self, job: Job) -> str:
+        path = await self._resolve_input(job.asset_id)
+        info = await self._aggregator.stat(
+            provider=self._provider, path=path, bucket=self._bucket
+        )
+        shards = self._shards(info.size or 0)
+        checkpoint_prefix = self._checkpoint_prefix(path, info)
+        completed = await self._completed_shards(checkpoint_prefix)
+        # Compressed files are decoded by the aggregator, not read in place
+        local_path = (
+            None if info.codec
+            else self._aggregator.local_path(self._provider, path)
+        )
+        job.shards_total = len(shards)
+        job.shards_done = 0
+
+        async def process_shard(shard: Tuple[int, int, int]) -> ChunkStats:
+            stats = await self._process_shard(
+                path, info, local_path, checkpoint_prefix, completed, shard
+            )
+            job.shards_done += 1
+            job.progress = ANALYSIS_PROGRESS_SHARE * job.shards_done / len(shards)
+            return stats
+
+        shard_stats = await map_bounded(
+            process_shard, shards, self._ml_config.SHARD_CONCURRENCY
+        )
+        result = {
+            "job_id": job.job_id,
+            "asset_id": job.asset_id,
+            "path": path,
+            "content_type": info.content_type,
+            "shards": len(shards),
+            **merge_chunk_stats(shard_stats),
+        }
+        result_path = self.result_path(job.job_id)
+        await self._aggregator.write(
+            provider=self._provider,
+            path=result_path,
+            data=json.dumps(result).encode(),
+            bucket=self._bucket,
+            content_type="application/json",
+        )
+
+        try:
+            await self._aggregator.delete_files_by_prefix(
+                provider=self._provider,
+                prefix=checkpoint_prefix,
+                bucket=self._bucket,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to remove checkpoints {checkpoint_prefix}: {e}")
+        return result_path
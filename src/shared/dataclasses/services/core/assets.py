@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class AssetRecord:
+    """
+    Catalog entry of a stored asset.
+    """
+
+    asset_id: str
+    provider: str
+    bucket: str | None
+    key: str
+    size: int | None = None
+    content_type: str | None = None
+    digest: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class AssetUpload:
+    """
+    Content of an asset to store in a batch upload.
+    """
+
+    asset_id: str
+    path: str
+    data: bytes
+    content_type: str | None = None
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class BatchResult(Generic[T]):
+    """
+    Outcome of a batch operation executed in partial-failure mode.
+    Results keep the order of the input, failed items are left as None.
+    """
+
+    results: List[T | None] = field(default_factory=list)
+    errors: dict[str, BaseException] = field(default_factory=dict)
+
+    @classmethod
+    def from_results(
+            cls, keys: Sequence[str], results: Sequence[Any]
+    ) -> "BatchResult[T]":
+        """
+        Build the outcome from results gathered with return_exceptions,
+        where a failed item holds its exception.
+        """
+        batch_result: BatchResult[T] = cls()
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                batch_result.errors[key] = result
+                batch_result.results.append(None)
+            else:
+                batch_result.results.append(result)
+        return batch_result
+
+    @property
+    def failed(self) -> List[str]:
+        return list(self.errors)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """
+    Storage-agnostic description of a listed object.
+    Metadata fields are only filled when requested and available.
+    """
+
+    key: str
+    size: int | None = None
+    etag: str | None = None
+    last_modified: datetime | None = None
+    content_type: str | None = None
+    metadata: Dict[str, str] | None = None
+    # Codec of a compressed object; size is then its uncompressed size
+    codec: str | None = None
+
+
+@dataclass
+class DeleteSummary:
+    """
+    Outcome of a bulk delete: number of removed keys and failures per key.
+    """
+
+    deleted: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> List[str]:
+        return list(self.errors)
+
+    def merge(self, other: "DeleteSummary") -> "DeleteSummary":
+        self.deleted += other.deleted
+        self.errors.update(other.errors)
+        return self
+
+
+@dataclass(frozen=True)
+class ContentAddressedWrite:
+    """
+    Result of a content-addressed write.
+    `deduplicated` is set when the content was already stored and the upload
+    to the backend was skipped.
+    """
+
+    asset_id: str
+    digest: str
+    path: str
+    size: int
+    deduplicated: bool
+
+
+@dataclass(frozen=True)
+class PresignedMultipartUpload:
+    """
+    Multipart upload started for a client, with one presigned URL per part.
+    Part n + 1 is uploaded to part_urls[n].
+    """
+
+    upload_id: str
+    part_urls: List[str]
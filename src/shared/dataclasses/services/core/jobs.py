@@ -0,0 +1,27 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from shared.enums.services.core.jobs import JobStatusEnum
+
+
+@dataclass
+class Job:
+    """
+    State of an analysis job. Progress goes from 0.0 to 1.0.
+    """
+
+    job_id: str
+    asset_id: str
+    status: JobStatusEnum = JobStatusEnum.QUEUED
+    progress: float = 0.0
+    shards_total: int = 0
+    shards_done: int = 0
+    attempts: int = 1
+    result_path: str | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    task: asyncio.Task | None = field(default=None, repr=False, compare=False)
@@ -4,3 +4,13 @@ from enum import StrEnum
 class FSProvidersEnum(StrEnum):
     LOCAL = "LOCAL"
     S3 = "S3"
+
+
+class UploadStatusEnum(StrEnum):
+    STORED = "STORED"
+    FAILED = "FAILED"
+
+
+class CompressionCodecEnum(StrEnum):
+    ZSTD = "zstd"
+    GZIP = "gzip"
@@ -0,0 +1,17 @@
+from enum import StrEnum
+
+
+class JobStatusEnum(StrEnum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+    @property
+    def finished(self) -> bool:
+        return self in (
+            JobStatusEnum.SUCCEEDED,
+            JobStatusEnum.FAILED,
+            JobStatusEnum.CANCELLED,
+        )
@@ -0,0 +1,35 @@
+class AssetCatalogDisabledError(RuntimeError):
+    """
+    Raised when a catalog query is made while the asset catalog is disabled.
+    """
+
+    def __init__(self):
+        super().__init__("Asset catalog is disabled")
+
+
+class FileTooLargeError(ValueError):
+    """
+    Raised for an uploaded file larger than the accepted size.
+    """
+
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"File of {size} bytes exceeds the limit of {limit} bytes")
+        self.size = size
+        self.limit = limit
+
+
+class PresignedUrlsUnsupportedError(RuntimeError):
+    """
+    Raised when presigned URLs are requested from a backend that cannot
+    issue them.
+    """
+
+    def __init__(self, provider: str):
+        super().__init__(f"Provider {provider} does not issue presigned URLs")
+        self.provider = provider
+
+
+class InvalidTransferTokenError(ValueError):
+    """
+    Raised for a transfer token that is malformed, forged or expired.
+    """
@@ -0,0 +1,8 @@
+class RangeNotSatisfiableError(ValueError):
+    """
+    Raised when a requested byte range lies outside of the resource.
+    """
+
+    def __init__(self, size: int):
+        super().__init__(f"Requested range not satisfiable for size {size}")
+        self.size = size
@@ -0,0 +1,40 @@
+class JobNotFoundError(LookupError):
+    """
+    Raised when a job id is unknown or its job has expired.
+    """
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Job {job_id} not found")
+        self.job_id = job_id
+
+
+class JobQueueFullError(RuntimeError):
+    """
+    Raised when the job queue cannot take another job.
+    """
+
+    def __init__(self, size: int):
+        super().__init__(f"Job queue is full ({size} jobs waiting)")
+        self.size = size
+
+
+class JobNotFinishedError(RuntimeError):
+    """
+    Raised when the result of a job that has not succeeded is requested.
+    """
+
+    def __init__(self, job_id: str, status: str):
+        super().__init__(f"Job {job_id} has no result, its status is {status}")
+        self.job_id = job_id
+        self.status = status
+
+
+class JobNotRetryableError(RuntimeError):
+    """
+    Raised when a job that has not failed or been cancelled is retried.
+    """
+
+    def __init__(self, job_id: str, status: str):
+        super().__init__(f"Job {job_id} cannot be retried, its status is {status}")
+        self.job_id = job_id
+        self.status = status
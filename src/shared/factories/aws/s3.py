@@ -1,7 +1,10 @@
-from contextlib import asynccontextmanager
-from typing import Optional
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from itertools import cycle
+from typing import Any, Iterator, Optional
 
 import aioboto3
+from aiobotocore.config import AioConfig
 from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from botocore.config import Config
 from mypy_boto3_cloudwatch.client import CloudWatchClient
@@ -15,12 +18,24 @@ class AwsClientFactory:
     def __init__(self, aws_env_config: AwsEnvConfig) -> None:
         self.aws_env_config = aws_env_config
         self.http_session: Optional[ClientSession] = None
-        self.aws_config: Config = Config(
+        self.aws_config: Config = AioConfig(
             region_name=self.aws_env_config.TARGET_REGION,
+            # Retries are done by the S3 client, which only retries idempotent
+            # operations and feeds throttling into the adaptive limiter.
             retries={"max_attempts": 1, "mode": "standard"},
+            max_pool_connections=self.aws_env_config.S3_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=self.aws_env_config.S3_TCP_KEEPALIVE,
+            connector_args={
+                "keepalive_timeout": self.aws_env_config.S3_KEEPALIVE_TIMEOUT,
+            },
         )
         self.session: Optional[aioboto3.Session] = None
 
+        self._s3_clients: list[Any] = []
+        self._s3_clients_cycle: Optional[Iterator[Any]] = None
+        self._s3_exit_stack: Optional[AsyncExitStack] = None
+        self._s3_lock = asyncio.Lock()
+
     async def initialize_http_session(self) -> None:
         """Initialize an async HTTP session."""
         self.http_session = ClientSession(
@@ -70,14 +85,58 @@ class AwsClientFactory:
         else:
             raise ValueError(AWS_ERROR)
 
+    @property
+    def s3_clients_opened(self) -> bool:
+        return bool(self._s3_clients)
+
+    async def open_s3_clients(self) -> None:
+        """Open the shared pool of long-lived S3 clients."""
+        async with self._s3_lock:
+            if self._s3_clients:
+                return
+
+            if not self.session:
+                await self.initialize_aws_session()
+            if not self.session:
+                raise ValueError(AWS_ERROR)
+
+            exit_stack = AsyncExitStack()
+            try:
+                for _ in range(self.aws_env_config.S3_CLIENT_POOL_SIZE):
+                    client = await exit_stack.enter_async_context(
+                        self.session.client("s3", config=self.aws_config)
+                    )
+                    self._s3_clients.append(client)
+            except BaseException:
+                self._s3_clients.clear()
+                await exit_stack.aclose()
+                raise
+
+            self._s3_exit_stack = exit_stack
+            self._s3_clients_cycle = cycle(self._s3_clients)
+
+    async def close_s3_clients(self) -> None:
+        """Close every client of the shared S3 pool."""
+        async with self._s3_lock:
+            exit_stack = self._s3_exit_stack
+            self._s3_clients.clear()
+            self._s3_clients_cycle = None
+            self._s3_exit_stack = None
+
+            if exit_stack:
+                await exit_stack.aclose()
+
     @asynccontextmanager
     async def get_s3_client(self):
-        if not self.session:
-            await self.initialize_aws_session()
+        """
+        Yield a client from the shared pool, opening the pool on first use.
+        Clients are handed out round-robin and stay open after the block exits.
+        """
+        if not self._s3_clients_cycle:
+            await self.open_s3_clients()
 
-        if self.session:
-            async with self.session.client("s3", config=self.aws_config) as client:
-                yield client
+        if self._s3_clients_cycle:
+            yield next(self._s3_clients_cycle)
         else:
             raise ValueError(AWS_ERROR)
 
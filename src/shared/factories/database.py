@@ -0,0 +1,60 @@
+import asyncio
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from configs.database import DatabaseConfig
+
+ALEMBIC_INI_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "alembic.ini",
+)
+DATABASE_ERROR = "Database engine is not initialized."
+
+
+class DatabaseFactory:
+    def __init__(self, database_config: DatabaseConfig) -> None:
+        self.database_config = database_config
+        self.engine: Optional[AsyncEngine] = None
+        self.session_maker: Optional[async_sessionmaker[AsyncSession]] = None
+
+    async def open(self) -> None:
+        """Create the engine and the session factory."""
+        if self.engine is not None:
+            return
+
+        self.engine = create_async_engine(
+            self.database_config.URL,
+            echo=self.database_config.ECHO,
+            pool_pre_ping=True,
+        )
+        self.session_maker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def migrate(self) -> None:
+        """Apply every pending Alembic migration."""
+        config = AlembicConfig(ALEMBIC_INI_PATH)
+        config.set_main_option("sqlalchemy.url", self.database_config.URL)
+        # Keep the application's logging setup instead of alembic.ini's
+        config.attributes["configure_logger"] = False
+        # env.py runs the migrations on its own event loop
+        await asyncio.to_thread(command.upgrade, config, "head")
+
+    def get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        if self.session_maker is None:
+            raise ValueError(DATABASE_ERROR)
+        return self.session_maker
+
+    async def close(self) -> None:
+        """Dispose of the engine and its pooled connections."""
+        if self.engine is not None:
+            await self.engine.dispose()
+        self.engine = None
+        self.session_maker = None
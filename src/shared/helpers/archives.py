@@ -0,0 +1,68 @@
+import posixpath
+import tarfile
+import zipfile
+from typing import IO, Iterator
+
+from shared.exceptions.assets import FileTooLargeError
+
+
+def safe_relative_path(name: str) -> str:
+    """
+    Normalise an uploaded file or archive member name into a relative
+    storage path. Raises ValueError for names that are empty or would escape
+    the storage root.
+    """
+    path = posixpath.normpath(name.replace("\\", "/")).lstrip("/")
+    if path in ("", ".") or path == ".." or path.startswith("../"):
+        raise ValueError(f"Unsafe file name: {name!r}")
+    return path
+
+
+def is_archive(fileobj: IO[bytes]) -> bool:
+    """
+    Whether fileobj holds a zip or tar archive that iter_archive can read.
+    """
+    try:
+        if zipfile.is_zipfile(fileobj):
+            return True
+        fileobj.seek(0)
+        return tarfile.is_tarfile(fileobj)
+    finally:
+        fileobj.seek(0)
+
+
+def iter_archive(
+        fileobj: IO[bytes],
+        max_member_bytes: int,
+) -> Iterator[tuple[str, bytes | Exception]]:
+    """
+    Yield the name and content of every regular file in a zip or tar
+    archive (optionally gzip, bzip2 or xz compressed), one at a time.
+    Members larger than max_member_bytes are yielded with a
+    FileTooLargeError instead of their content and are never decompressed.
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if info.file_size > max_member_bytes:
+                    error = FileTooLargeError(info.file_size, max_member_bytes)
+                    yield info.filename, error
+                    continue
+                yield info.filename, archive.read(info)
+        return
+
+    fileobj.seek(0)
+    with tarfile.open(fileobj=fileobj, mode="r:*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            if member.size > max_member_bytes:
+                error = FileTooLargeError(member.size, max_member_bytes)
+                yield member.name, error
+                continue
+            extracted = archive.extractfile(member)
+            yield member.name, extracted.read() if extracted else b""
+
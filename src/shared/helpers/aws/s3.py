@@ -1,26 +1,136 @@
+import random
 from functools import wraps
+from inspect import isasyncgenfunction
 from loguru import logger
 
-from botocore.exceptions import ClientError, EndpointConnectionError, NoCredentialsError
+from botocore.exceptions import (
+    ClientError,
+    ConnectionError as BotocoreConnectionError,
+    EndpointConnectionError,
+    HTTPClientError,
+    NoCredentialsError,
+)
+
+S3_THROTTLING_ERROR_CODES = frozenset(
+    {
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+        "TooManyRequestsException",
+        "503",
+        "ServiceUnavailable",
+    }
+)
+S3_TRANSIENT_ERROR_CODES = frozenset(
+    {
+        "InternalError",
+        "RequestTimeout",
+        "RequestTimeoutException",
+        "500",
+        "502",
+        "504",
+    }
+)
+# Operations that leave S3 in the same state however often they are sent.
+# CreateMultipartUpload and CompleteMultipartUpload are deliberately missing:
+# a retry after a lost response creates an orphaned upload or fails on an
+# upload that already completed.
+S3_IDEMPOTENT_OPERATIONS = frozenset(
+    {
+        "AbortMultipartUpload",
+        "CopyObject",
+        "DeleteObject",
+        "DeleteObjects",
+        "GetObject",
+        "HeadBucket",
+        "HeadObject",
+        "ListObjects",
+        "ListObjectsV2",
+        "ListParts",
+        "PutObject",
+        "UploadPart",
+    }
+)
+
+
+def _client_error_code(e: ClientError) -> str:
+    return str(e.response.get("Error", {}).get("Code", ""))
+
+
+def _client_error_status(e: ClientError) -> int:
+    return int(e.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0)
+
+
+def is_s3_throttling_error(e: BaseException) -> bool:
+    """
+    Whether S3 asked the caller to slow down.
+    """
+    if not isinstance(e, ClientError):
+        return False
+    return (
+        _client_error_code(e) in S3_THROTTLING_ERROR_CODES
+        or _client_error_status(e) in (429, 503)
+    )
+
+
+def is_s3_retryable_error(e: BaseException) -> bool:
+    """
+    Whether the error is transient: throttling, a server-side failure or a
+    dropped or timed out connection.
+    """
+    if isinstance(e, ClientError):
+        return (
+            is_s3_throttling_error(e)
+            or _client_error_code(e) in S3_TRANSIENT_ERROR_CODES
+            or _client_error_status(e) >= 500
+        )
+    return isinstance(e, (HTTPClientError, BotocoreConnectionError, ConnectionError))
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Exponential backoff with full jitter for the given retry attempt,
+    starting at 1, so concurrent retries spread out instead of colliding.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def _log_s3_exception(func_name: str, e: Exception) -> None:
+    if isinstance(e, ClientError):
+        error_code = e.response["Error"]["Code"]
+        logger.error(f"AWS ClientError in {func_name}: {error_code} - {e}")
+    elif isinstance(e, NoCredentialsError):
+        logger.error(f"AWS credentials not found in {func_name}.")
+    elif isinstance(e, EndpointConnectionError):
+        logger.error(f"Could not connect to the AWS endpoint in {func_name}.")
+    else:
+        logger.error(f"Unexpected error in {func_name}: {str(e)}")
 
 
 def handle_s3_exceptions(func):
+    if isasyncgenfunction(func):
+        @wraps(func)
+        async def generator_wrapper(*args, **kwargs):
+            generator = func(*args, **kwargs)
+            try:
+                async for item in generator:
+                    yield item
+            except Exception as e:
+                _log_s3_exception(func.__name__, e)
+                raise
+            finally:
+                await generator.aclose()
+
+        return generator_wrapper
+
     @wraps(func)
     async def wrapper(*args, **kwargs):
         try:
             return await func(*args, **kwargs)
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            logger.error(f"AWS ClientError in {func.__name__}: {error_code} - {e}")
-            raise
-        except NoCredentialsError:
-            logger.error(f"AWS credentials not found in {func.__name__}.")
-            raise
-        except EndpointConnectionError:
-            logger.error(f"Could not connect to the AWS endpoint in {func.__name__}.")
-            raise
         except Exception as e:
-            logger.error(f"Unexpected error in {func.__name__}: {str(e)}")
+            _log_s3_exception(func.__name__, e)
             raise
 
     return wrapper
@@ -0,0 +1,163 @@
+import fnmatch
+import struct
+import zlib
+from typing import Any, Iterable
+
+from shared.enums.services.core.file_system import CompressionCodecEnum
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# 0x93 never starts UTF-8 text and, as in the PNG signature, the line ending
+# and EOF bytes reveal transfers that rewrite them.
+FRAME_MAGIC = b"\x93SDCZ\r\n\x1a"
+FRAME_HEADER_SIZE = len(FRAME_MAGIC) + 1
+FRAME_TRAILER_SIZE = 8
+
+CODEC_METADATA_KEY = "codec"
+SIZE_METADATA_KEY = "uncompressed-size"
+
+_CODEC_IDS = {
+    CompressionCodecEnum.GZIP: 1,
+    CompressionCodecEnum.ZSTD: 2,
+}
+_CODECS_BY_ID = {codec_id: codec for codec, codec_id in _CODEC_IDS.items()}
+_SIZE = struct.Struct(">Q")
+
+
+def zstd_available() -> bool:
+    return ZSTD_AVAILABLE
+
+
+def _require_zstd() -> None:
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError("zstd compression needs the zstandard package")
+
+
+def parse_frame_header(data: bytes) -> CompressionCodecEnum | None:
+    """
+    Codec of a compressed frame starting at data, None for other content.
+    """
+    if len(data) < FRAME_HEADER_SIZE or not data.startswith(FRAME_MAGIC):
+        return None
+    return _CODECS_BY_ID.get(data[len(FRAME_MAGIC)])
+
+
+def parse_frame_trailer(data: bytes) -> int:
+    """
+    Uncompressed size recorded at the end of a compressed frame.
+    """
+    return _SIZE.unpack(data[-FRAME_TRAILER_SIZE:])[0]
+
+
+def is_compressible(content_type: str | None, skip_patterns: Iterable[str]) -> bool:
+    """
+    Whether content_type is not matched by any of the skipped patterns,
+    e.g. "image/jpeg" or "video/*". Unknown types are compressible.
+    """
+    if not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not any(fnmatch.fnmatchcase(media_type, p) for p in skip_patterns)
+
+
+def compresses_well(sample: bytes, max_ratio: float) -> bool:
+    """
+    Whether a fast trial compression of sample shrinks it to max_ratio of
+    its size, which rules out content that is already compressed whatever
+    its declared type.
+    """
+    return len(zlib.compress(sample, 1)) <= len(sample) * max_ratio
+
+
+class FrameCompressor:
+    """
+    Compresses a stream, one chunk at a time, into a self-describing frame:
+    the magic and codec id, the codec's own stream, then the uncompressed
+    size. Readers recognise the frame by its header, so it is decoded even
+    where object metadata is not kept.
+    """
+
+    def __init__(self, codec: CompressionCodecEnum, level: int):
+        self._codec = codec
+        self._compressor: Any
+        if codec == CompressionCodecEnum.ZSTD:
+            _require_zstd()
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        self._header = FRAME_MAGIC + bytes([_CODEC_IDS[codec]])
+        self._size = 0
+
+    def _with_header(self, data: bytes) -> bytes:
+        if not self._header:
+            return data
+        data, self._header = self._header + data, b""
+        return data
+
+    def compress(self, chunk: bytes) -> bytes:
+        self._size += len(chunk)
+        return self._with_header(self._compressor.compress(chunk))
+
+    def flush(self) -> bytes:
+        return self._with_header(self._compressor.flush()) + _SIZE.pack(self._size)
+
+
+class FrameDecompressor:
+    """
+    Decodes a frame written by FrameCompressor, one chunk at a time.
+    finish() checks that the frame was complete.
+    """
+
+    def __init__(self, codec: CompressionCodecEnum):
+        self._decompressor: Any
+        if codec == CompressionCodecEnum.ZSTD:
+            _require_zstd()
+            self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            self._decompressor = zlib.decompressobj(31)
+        self._header_left = FRAME_HEADER_SIZE
+        self._trailer = bytearray()
+        self._size = 0
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if self._header_left:
+            skipped = min(self._header_left, len(chunk))
+            chunk = chunk[skipped:]
+            self._header_left -= skipped
+        if self._decompressor.eof:
+            self._trailer += chunk
+            return b""
+
+        data = self._decompressor.decompress(chunk)
+        if self._decompressor.eof:
+            self._trailer += self._decompressor.unused_data
+        self._size += len(data)
+        return data
+
+    def finish(self) -> None:
+        if (
+            not self._decompressor.eof
+            or len(self._trailer) != FRAME_TRAILER_SIZE
+            or parse_frame_trailer(bytes(self._trailer)) != self._size
+        ):
+            raise ValueError("Compressed frame is truncated or corrupt")
+
+
+def compress_frame(data: bytes, codec: CompressionCodecEnum, level: int) -> bytes:
+    compressor = FrameCompressor(codec, level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_frame(data: bytes) -> bytes:
+    codec = parse_frame_header(data)
+    if codec is None:
+        raise ValueError("Data is not a compressed frame")
+    decompressor = FrameDecompressor(codec)
+    decoded = decompressor.decompress(data)
+    decompressor.finish()
+    return decoded
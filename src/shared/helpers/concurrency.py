@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit shared by batch operations against one backend.
+    Every success raises the limit by about one per window of `limit`
+    calls, and a throttling signal multiplies it by decrease_factor, at most
+    once per cooldown so a burst of rejections only counts once.
+
+    Slots are reentrant per task context: work started while a slot is held,
+    such as the ranged GETs of one file in a batch read, runs under that
+    slot instead of waiting for another one, so nested fan-outs cannot
+    deadlock.
+    """
+
+    def __init__(
+            self,
+            initial: int,
+            minimum: int = 1,
+            maximum: int = 256,
+            decrease_factor: float = 0.5,
+            cooldown_seconds: float = 1.0,
+    ):
+        self._minimum = max(minimum, 1)
+        self._maximum = max(maximum, self._minimum)
+        self._limit = float(min(max(initial, self._minimum), self._maximum))
+        self._decrease_factor = decrease_factor
+        self._cooldown_seconds = cooldown_seconds
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._holding: ContextVar[bool] = ContextVar(
+            f"adaptive_limiter_{id(self)}", default=False
+        )
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def on_success(self) -> None:
+        self._limit = min(self._limit + 1 / self._limit, self._maximum)
+        self._wake()
+
+    def on_throttle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self._cooldown_seconds:
+            return
+        self._last_decrease = now
+        self._limit = max(self._limit * self._decrease_factor, self._minimum)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire(self) -> None:
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation.
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._holding.get():
+            yield
+            return
+
+        await self._acquire()
+        token = self._holding.set(True)
+        try:
+            yield
+        finally:
+            self._holding.reset(token)
+            self._release()
+
+
+async def _call_limited(
+        func: Callable[[T], Awaitable[R]],
+        item: T,
+        limiter: Optional[AdaptiveConcurrencyLimiter],
+) -> R:
+    if limiter is None:
+        return await func(item)
+    async with limiter.slot():
+        return await func(item)
+
+
+async def map_bounded(
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        concurrency: int,
+        return_exceptions: bool = False,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+) -> List[Any]:
+    """
+    Await func for every item with at most `concurrency` calls in flight,
+    further capped by the adaptive limiter when one is given.
+    Results keep the order of the input. Unless return_exceptions is set,
+    the first error cancels the remaining work and is re-raised.
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+    pending = iter(enumerate(items))
+
+    async def worker() -> None:
+        for index, item in pending:
+            try:
+                results[index] = await _call_limited(func, item, limiter)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(min(max(concurrency, 1), len(items)))
+    ]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+
+    return results
+
+
+async def map_bounded_stream(
+        func: Callable[[T], Awaitable[R]],
+        items: AsyncIterable[T],
+        concurrency: int,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+) -> AsyncIterator[R]:
+    """
+    Await func for every item of an async source with at most `concurrency`
+    calls in flight, yielding results as they complete. The source is only
+    consumed as fast as the calls finish, so memory stays bounded.
+    """
+    pending: set[asyncio.Task] = set()
+
+    async def run(item: T) -> R:
+        return await _call_limited(func, item, limiter)
+
+    try:
+        async for item in items:
+            if len(pending) >= max(concurrency, 1):
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.create_task(run(item)))
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
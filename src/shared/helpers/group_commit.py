@@ -0,0 +1,94 @@
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Dict, List, Set
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+class GroupCommitter:
+    """
+    Merges the fsync calls of concurrent writers into group commits.
+    The first request opens a group and every request arriving within the
+    window joins it. The group is flushed at once: its file descriptors are
+    synced concurrently, so the file system can commit them in one journal
+    transaction, and each directory is synced once however many of its
+    entries changed. The next group collects while the previous one flushes.
+    File descriptors join a group as duplicates owned by the group, so a
+    writer may close its own descriptor, for instance when it is cancelled,
+    while the group still syncs the file.
+    """
+
+    def __init__(self, executor: Executor, window_seconds: float = 0.002):
+        self._executor = executor
+        self._window_seconds = window_seconds
+        self._pending: Dict[int | str, asyncio.Future] = {}
+        self._flushes: Set[asyncio.Task] = set()
+        self._collecting = False
+
+    async def sync(self, target: int | str) -> None:
+        """
+        Wait until target, an open file descriptor or a directory path, is
+        on stable storage.
+        """
+        if isinstance(target, int):
+            # The duplicate stays open until its sync completes, so its
+            # number is unique in the group.
+            target = os.dup(target)
+        future = self._pending.get(target)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            # Nobody may be left to await a failed sync if its writers were
+            # cancelled, so the error is always marked as retrieved.
+            future.add_done_callback(
+                lambda f: f.cancelled() or f.exception()
+            )
+            self._pending[target] = future
+
+        if not self._collecting:
+            self._collecting = True
+            flush = asyncio.create_task(self._flush_after_window())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+        # Several writers can wait on one directory, so one cancelled writer
+        # must not cancel the sync for the others.
+        await asyncio.shield(future)
+
+    @staticmethod
+    def _sync_sync(target: int | str) -> None:
+        if isinstance(target, int):
+            try:
+                _fdatasync(target)
+            finally:
+                os.close(target)
+            return
+
+        fd = os.open(target, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self._window_seconds)
+        group, self._pending = self._pending, {}
+        self._collecting = False
+
+        loop = asyncio.get_running_loop()
+        targets: List[int | str] = list(group)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, self._sync_sync, target)
+                for target in targets
+            ),
+            return_exceptions=True,
+        )
+        for target, result in zip(targets, results):
+            future = group[target]
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)
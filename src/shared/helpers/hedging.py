@@ -0,0 +1,85 @@
+import threading
+from collections import deque
+from typing import Deque
+
+# Unused hedge tokens accumulate up to this many, so a quiet period allows a
+# short burst of hedges but never an unbounded one.
+HEDGE_BUDGET_BURST = 10.0
+
+
+class HedgePolicy:
+    """
+    Decides when a duplicate of a slow read is sent.
+    The hedge delay is either fixed or the configured percentile of the
+    recently observed latencies, clamped to [min_delay_ms, max_delay_ms];
+    max_delay_ms is used until min_samples latencies were recorded.
+    Each request earns budget_ratio hedge tokens and a hedge spends one, so
+    at most that share of requests is duplicated over time.
+    """
+
+    def __init__(
+            self,
+            percentile: float = 95.0,
+            fixed_delay_ms: float | None = None,
+            min_delay_ms: float = 5.0,
+            max_delay_ms: float = 500.0,
+            budget_ratio: float = 0.05,
+            window: int = 1000,
+            min_samples: int = 50,
+    ):
+        self._percentile = percentile
+        self._fixed_delay_ms = fixed_delay_ms
+        self._min_delay_ms = min_delay_ms
+        self._max_delay_ms = max(max_delay_ms, min_delay_ms)
+        self._budget_ratio = budget_ratio
+        self._min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._recorded_since_update = 0
+        self._delay_ms = self._max_delay_ms
+        self._tokens = 0.0
+
+    @property
+    def delay_ms(self) -> float:
+        if self._fixed_delay_ms is not None:
+            return self._fixed_delay_ms
+        return self._delay_ms
+
+    def record(self, latency_ms: float) -> None:
+        """
+        Record the latency of a read, or the time until its hedge answered,
+        which is a lower bound of the latency the hedge cut short.
+        The percentile is recomputed every min_samples records.
+        """
+        with self._lock:
+            self._samples.append(latency_ms)
+            self._recorded_since_update += 1
+            if (
+                len(self._samples) < self._min_samples
+                or self._recorded_since_update < self._min_samples
+            ):
+                return
+
+            self._recorded_since_update = 0
+            ordered = sorted(self._samples)
+            index = min(
+                int(len(ordered) * self._percentile / 100), len(ordered) - 1
+            )
+            self._delay_ms = min(
+                max(ordered[index], self._min_delay_ms), self._max_delay_ms
+            )
+
+    def on_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self._budget_ratio, HEDGE_BUDGET_BURST)
+
+    def try_acquire(self) -> bool:
+        """
+        Spend a hedge token; False when the budget is exhausted.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
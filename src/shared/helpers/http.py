@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from shared.exceptions.http import RangeNotSatisfiableError
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a datetime as an HTTP date (RFC 9110).
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single `bytes=` Range header into (offset, length).
+    Returns None when the header should be ignored and the whole resource
+    served: missing, malformed, non-byte units or multiple ranges.
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_value, dash, end_value = spec.strip().partition("-")
+    if not dash:
+        return None
+
+    if not all(value.isdigit() for value in (start_value, end_value) if value):
+        return None
+    start = int(start_value) if start_value else None
+    end = int(end_value) if end_value else None
+
+    if start is None:
+        # Suffix range: the last N bytes
+        if end is None:
+            return None
+        if end == 0:
+            raise RangeNotSatisfiableError(size)
+        start = max(size - end, 0)
+        end = size - 1
+    elif end is None:
+        end = size - 1
+    elif start > end:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiableError(size)
+
+    end = min(end, size - 1)
+    return start, end - start + 1
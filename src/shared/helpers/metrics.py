@@ -0,0 +1,200 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple
+
+from botocore.exceptions import ClientError
+
+# Upper bounds of the latency buckets in milliseconds; the last bucket is open.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000
+)
+
+Tags = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, Tags]
+
+
+def _make_key(name: str, tags: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((k, str(v)) for k, v in tags.items()))
+
+
+def error_code(error: BaseException) -> str:
+    """
+    AWS error code for a ClientError, otherwise the exception class name.
+    """
+    if isinstance(error, ClientError):
+        return str(error.response.get("Error", {}).get("Code", "ClientError"))
+    return type(error).__name__
+
+
+@dataclass
+class Histogram:
+    bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def copy(self) -> "Histogram":
+        return Histogram(
+            bounds=self.bounds,
+            counts=list(self.counts),
+            count=self.count,
+            total=self.total,
+            min=self.min,
+            max=self.max,
+        )
+
+    def bucket_value(self, index: int) -> float:
+        """
+        Representative value of a bucket, used when publishing the histogram.
+        """
+        if index < len(self.bounds):
+            return min(self.bounds[index], self.max)
+        return self.max
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Estimate a percentile from the buckets. The estimate is the upper
+        bound of the bucket holding the rank, capped at the observed max.
+        """
+        if not self.count:
+            return None
+
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bucket_value(index)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "min": round(self.min, 3) if self.count else None,
+            "max": round(self.max, 3) if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": {
+                **{str(bound): c for bound, c in zip(self.bounds, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+@dataclass
+class MetricsSnapshot:
+    counters: Dict[MetricKey, float]
+    gauges: Dict[MetricKey, float]
+    histograms: Dict[MetricKey, Histogram]
+
+
+class MetricsRegistry:
+    """
+    In-process store of counters, gauges and latency histograms.
+    Recording only updates a few numbers under a lock, so it is cheap enough
+    for the hot path; exporters read snapshots.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._histograms: Dict[MetricKey, Histogram] = {}
+
+    def increment(self, name: str, value: float = 1, **tags: Any) -> None:
+        key = _make_key(name, tags)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_gauge(self, name: str, delta: float, **tags: Any) -> None:
+        key = _make_key(name, tags)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        key = _make_key(name, tags)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def track(self, prefix: str, operation: str, **tags: Any) -> Iterator[None]:
+        """
+        Record the in-flight count, latency and errors of one operation under
+        <prefix>.in_flight, <prefix>.latency_ms and <prefix>.errors.
+        """
+        tags["operation"] = operation
+        self.add_gauge(f"{prefix}.in_flight", 1, **tags)
+        start = time.perf_counter()
+        try:
+            yield
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            self.increment(f"{prefix}.errors", error_code=error_code(e), **tags)
+            raise
+        finally:
+            self.observe(
+                f"{prefix}.latency_ms", (time.perf_counter() - start) * 1000, **tags
+            )
+            self.add_gauge(f"{prefix}.in_flight", -1, **tags)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                counters=dict(self._counters),
+                gauges=dict(self._gauges),
+                histograms={k: h.copy() for k, h in self._histograms.items()},
+            )
+
+    def as_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        snapshot = self.snapshot()
+        return {
+            "counters": [
+                {"name": name, "tags": dict(tags), "value": value}
+                for (name, tags), value in sorted(snapshot.counters.items())
+            ],
+            "gauges": [
+                {"name": name, "tags": dict(tags), "value": value}
+                for (name, tags), value in sorted(snapshot.gauges.items())
+            ],
+            "histograms": [
+                {"name": name, "tags": dict(tags), **histogram.as_dict()}
+                for (name, tags), histogram in sorted(
+                    snapshot.histograms.items(), key=lambda item: item[0]
+                )
+            ],
+        }
+
+
+_default_registry: MetricsRegistry | None = None
+
+
+def get_default_registry() -> MetricsRegistry:
+    """
+    Return the process-wide metrics registry.
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
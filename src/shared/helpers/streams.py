@@ -0,0 +1,29 @@
+from typing import AsyncIterator, Protocol
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+async def iter_chunks(
+        source: AsyncReadable,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Read an async file-like object (e.g. an UploadFile) in fixed-size chunks.
+    """
+    while chunk := await source.read(chunk_size):
+        yield chunk
+
+
+async def iter_bytes(
+        data: bytes,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Serve in-memory content as a chunk stream.
+    """
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from moto.server import ThreadedMotoServer
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from api.v1.dependencies.core.services.file_system import (
+    create_file_system_aggregator_config,
+)
+from configs.aws.s3 import AwsEnvConfig
+from configs.file_system import FileSystemConfig
+from core.models.base import Base
+from core.repositories.aws.s3 import S3Repository
+from core.repositories.database.assets import AssetRepository
+from core.services.file_system.aggregator import FSAggregator
+from shared.helpers.metrics import MetricsRegistry
+
+REGION = "us-east-2"
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+@pytest.fixture
+def make_aggregator(tmp_path, monkeypatch, executor):
+    """
+    Build aggregators that serve both providers from tmp_path, the way the
+    app does while S3 is disabled.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def make(
+            asset_repository: AssetRepository | None = None, **settings
+    ) -> FSAggregator:
+        fs_config = FileSystemConfig(USE_AWS_S3=False, **settings)
+        config = create_file_system_aggregator_config(
+            S3Repository(aws_env_config=AwsEnvConfig()),
+            fs_config,
+            executor,
+            metrics=MetricsRegistry(),
+            asset_repository=asset_repository,
+        )
+        return FSAggregator(config)
+
+    return make
+
+
+@pytest.fixture
+def asset_repository(tmp_path):
+    """
+    Catalog in a SQLite file. Connections are not pooled, so every test
+    can use it from its own event loop.
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}", poolclass=NullPool
+    )
+
+    async def create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield AssetRepository(async_sessionmaker(engine, expire_on_commit=False))
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture(scope="session")
+def moto_endpoint():
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def run_with_s3(moto_endpoint, monkeypatch):
+    """
+    Run a test coroutine function with an S3Repository on a new bucket of
+    the moto server, on its own event loop, and return its result.
+    """
+    monkeypatch.setenv("AWS_ENDPOINT_URL", moto_endpoint)
+
+    def run(test, **settings):
+        async def main():
+            repository = S3Repository(
+                aws_env_config=AwsEnvConfig(
+                    ACCESS_KEY_ID="testing",
+                    SECRET_ACCESS_KEY="testing",
+                    TARGET_REGION=REGION,
+                    **settings,
+                ),
+                metrics=MetricsRegistry(),
+            )
+            bucket = f"test-{uuid.uuid4().hex}"
+            try:
+                async with repository.aws_client_factory.get_s3_client() as client:
+                    await client.create_bucket(
+                        Bucket=bucket,
+                        CreateBucketConfiguration={"LocationConstraint": REGION},
+                    )
+                return await test(repository, bucket)
+            finally:
+                await repository.aws_client_factory.close_s3_clients()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+
+import pytest
+
+from configs.ml import MLConfig
+from core.services.ml import jobs
+from core.services.ml.analysis import analyze_chunk, merge_chunk_stats
+from core.services.ml.jobs import JobManager, JobManagerConfig
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.enums.services.core.jobs import JobStatusEnum
+
+TEXT = b"the quick  brown\nfox jumps\tover the lazy dog\n"
+
+
+def _merge_split(data: bytes, *cuts: int):
+    bounds = [0, *cuts, len(data)]
+    return merge_chunk_stats([
+        analyze_chunk(data[start:end]) for start, end in zip(bounds, bounds[1:])
+    ])
+
+
+@pytest.mark.parametrize("cut", range(len(TEXT) + 1))
+def test_words_split_across_shards_count_once(cut):
+    merged = _merge_split(TEXT, cut)
+
+    assert merged["words"] == len(TEXT.split())
+    assert merged["lines"] == TEXT.count(b"\n")
+    assert merged["size"] == len(TEXT)
+
+
+def test_word_spanning_several_shards_counts_once():
+    assert _merge_split(b"abcdef", 2, 4)["words"] == 1
+    # Empty shards do not separate the pieces of a word
+    assert _merge_split(b"abcdef", 3, 3)["words"] == 1
+    assert _merge_split(b"ab cd", 2, 3)["words"] == 2
+
+
+async def _wait(manager: JobManager, job_id: str):
+    while not manager.get(job_id).status.finished:
+        await asyncio.sleep(0.01)
+    return manager.get(job_id)
+
+
+def test_retried_job_resumes_from_its_checkpoints(
+        make_aggregator, executor, monkeypatch
+):
+    aggregator = make_aggregator()
+    shard_size = 8
+    data = TEXT * 3
+    shards = -(-len(data) // shard_size)
+    analyzed = []
+    failing = {2 * shard_size}
+
+    def analyze_file_range(path, offset, length):
+        analyzed.append(offset)
+        if offset in failing:
+            raise RuntimeError("worker lost")
+        return analyze_chunk(data[offset:offset + length])
+
+    monkeypatch.setattr(jobs, "analyze_file_range", analyze_file_range)
+    manager = JobManager(
+        JobManagerConfig(
+            file_system_aggregator=aggregator,
+            executor=executor,
+            ml_config=MLConfig(SHARD_SIZE=shard_size, SHARD_CONCURRENCY=1),
+        )
+    )
+    asset_id = str(uuid.uuid4())
+
+    async def chunks():
+        yield data
+
+    async def main():
+        await aggregator.write_asset(
+            FSProvidersEnum.S3, asset_id, "doc.txt", chunks()
+        )
+        manager.start()
+        try:
+            job = await _wait(manager, manager.submit(asset_id).job_id)
+            assert job.status == JobStatusEnum.FAILED
+            assert analyzed == [0, shard_size, 2 * shard_size]
+
+            failing.clear()
+            analyzed.clear()
+            job = await _wait(manager, manager.retry(job.job_id).job_id)
+            assert job.status == JobStatusEnum.SUCCEEDED
+            # The first two shards come from their checkpoints
+            assert analyzed == [
+                offset for offset in range(2 * shard_size, len(data), shard_size)
+            ]
+            result = await manager.get_result(job.job_id)
+            assert result["shards"] == shards
+            assert result["words"] == len(data.split())
+            assert await aggregator.list(
+                FSProvidersEnum.S3, MLConfig().CHECKPOINTS_PREFIX
+            ) == []
+        finally:
+            await manager.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+
+import pytest
+
+from shared.dataclasses.services.core.assets import AssetUpload
+from shared.enums.services.core.file_system import FSProvidersEnum
+
+S3 = FSProvidersEnum.S3
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _keys(aggregator, prefix=""):
+    return [
+        (record.key, record.size)
+        for record in await aggregator.list_assets(S3, prefix=prefix)
+    ]
+
+
+def test_writes_are_recorded(make_aggregator, asset_repository):
+    aggregator = make_aggregator(asset_repository)
+
+    async def main():
+        await aggregator.write(S3, "a.txt", b"a", content_type="text/plain")
+        await aggregator.write(S3, "a.txt", b"abc", content_type="text/plain")
+        await aggregator.write_stream(S3, "b.txt", _chunks(b"b", b"b"))
+        await aggregator.write_batch(S3, [("c.txt", b"c"), ("d.txt", b"dddd")])
+        result = await aggregator.write_batch_results(S3, [("e.txt", b"e")])
+        assert result.ok
+        assert await _keys(aggregator) == [
+            ("a.txt", 3), ("b.txt", 2), ("c.txt", 1), ("d.txt", 4), ("e.txt", 1),
+        ]
+
+        await aggregator.delete(S3, "a.txt")
+        await aggregator.delete_files_by_prefix(S3, "d")
+        assert await _keys(aggregator) == [("b.txt", 2), ("c.txt", 1), ("e.txt", 1)]
+
+    asyncio.run(main())
+
+
+def test_registered_upload_keeps_one_row(make_aggregator, asset_repository):
+    aggregator = make_aggregator(asset_repository)
+    asset_id = str(uuid.uuid4())
+
+    async def main():
+        # A local upload is written first and registered when completed
+        await aggregator.write_stream(S3, "up.txt", _chunks(b"data"))
+        record = await aggregator.register_asset(S3, asset_id, "up.txt")
+        assert record.asset_id == asset_id
+        assert [r.asset_id for r in await aggregator.list_assets(S3)] == [asset_id]
+
+    asyncio.run(main())
+
+
+def test_shared_content_outlives_its_first_asset(make_aggregator, asset_repository):
+    aggregator = make_aggregator(asset_repository)
+    first, second = str(uuid.uuid4()), str(uuid.uuid4())
+
+    async def main():
+        await aggregator.write_content_addressed(S3, first, _chunks(b"same"))
+        write = await aggregator.write_content_addressed(S3, second, _chunks(b"same"))
+        assert write.deduplicated
+        path = write.path
+
+        with pytest.raises(ValueError):
+            await aggregator.delete(S3, path)
+        summary = await aggregator.delete_batch(S3, [path])
+        assert summary.failed == [path]
+        assert len(await aggregator.list_assets(S3)) == 2
+
+        await aggregator.delete_asset(S3, first)
+        content = await aggregator.resolve_asset(S3, second)
+        assert await aggregator.read(S3, content) == b"same"
+        await aggregator.delete_asset(S3, second)
+        assert await aggregator.list_assets(S3) == []
+        assert not await aggregator.exists(S3, path)
+        with pytest.raises(FileNotFoundError):
+            await aggregator.delete_asset(S3, second)
+
+    asyncio.run(main())
+
+
+def test_files_are_rolled_back_when_the_catalog_fails(
+        make_aggregator, asset_repository, monkeypatch
+):
+    aggregator = make_aggregator(asset_repository)
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(asset_repository, "record_keys", fail)
+    monkeypatch.setattr(asset_repository, "add_batch", fail)
+    uploads = [
+        AssetUpload(asset_id=str(uuid.uuid4()), path=path, data=b"x")
+        for path in ("a.txt", "b.txt")
+    ]
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await aggregator.write(S3, "w.txt", b"w")
+        result = await aggregator.write_batch_results(S3, [("r.txt", b"r")])
+        assert result.failed == ["r.txt"]
+        result = await aggregator.write_asset_batch(S3, uploads)
+        assert sorted(result.failed) == ["a.txt", "b.txt"]
+
+        assert await aggregator.list(S3, "") == []
+
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.dependencies.core.services.file_system import get_file_system_aggregator
+from api.v1.endpoints.assets.network import network_router
+from shared.helpers.archives import safe_relative_path
+
+MAX_FILE_BYTES = 64
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("a.txt", "a.txt"),
+    ("dir/a.txt", "dir/a.txt"),
+    ("/abs/a.txt", "abs/a.txt"),
+    ("dir/../a.txt", "a.txt"),
+    ("dir\\a.txt", "dir/a.txt"),
+    ("./dir//a.txt", "dir/a.txt"),
+    ("/../a.txt", "a.txt"),
+])
+def test_safe_relative_path(name, expected):
+    assert safe_relative_path(name) == expected
+
+
+@pytest.mark.parametrize("name", [
+    "", ".", "..", "../a.txt", "dir/../../a.txt", "..\\a.txt",
+])
+def test_unsafe_relative_path(name):
+    with pytest.raises(ValueError):
+        safe_relative_path(name)
+
+
+@pytest.fixture
+def client(make_aggregator):
+    aggregator = make_aggregator(
+        BULK_UPLOAD_MAX_FILE_BYTES=MAX_FILE_BYTES, BULK_UPLOAD_BATCH_BYTES=8
+    )
+    app = FastAPI()
+    app.include_router(network_router)
+    app.dependency_overrides[get_file_system_aggregator] = lambda: aggregator
+    with TestClient(app) as client:
+        yield client
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("dir/", b"")
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _tar_gz(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        link = tarfile.TarInfo("link.txt")
+        link.type, link.linkname = tarfile.SYMTYPE, "/etc/passwd"
+        archive.addfile(link)
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def _errors(response) -> dict[str, str | None]:
+    assert response.status_code == 200
+    return {item["filename"]: item["error"] for item in response.json()["assets"]}
+
+
+@pytest.mark.parametrize("build, filename", [
+    (_zip, "upload.zip"),
+    (_tar_gz, "upload.tar.gz"),
+])
+def test_archive_members_are_stored_inside_the_root(
+        client, tmp_path, build, filename
+):
+    archive = build({
+        "dir/a.txt": b"a",
+        "b.txt": b"b",
+        "../escape.txt": b"x",
+        "dir/../../escape.txt": b"x",
+        "/abs.txt": b"abs",
+        "big.bin": b"x" * (MAX_FILE_BYTES + 1),
+    })
+
+    response = client.post(
+        "/upload/bulk", files={"archive": (filename, archive)}
+    )
+
+    assert _errors(response) == {
+        "dir/a.txt": None,
+        "b.txt": None,
+        "../escape.txt": "Unsafe file name: '../escape.txt'",
+        "dir/../../escape.txt": "Unsafe file name: 'dir/../../escape.txt'",
+        "/abs.txt": None,
+        "big.bin": f"File of {MAX_FILE_BYTES + 1} bytes exceeds the limit "
+                   f"of {MAX_FILE_BYTES} bytes",
+    }
+    assert response.json()["stored"] == 3
+    media = tmp_path / "media"
+    assert (media / "dir" / "a.txt").read_bytes() == b"a"
+    assert (media / "abs.txt").read_bytes() == b"abs"
+    assert not (tmp_path / "escape.txt").exists()
+    assert not (media / "big.bin").exists()
+    assert not (media / "link.txt").exists()
+
+
+def test_duplicate_names_are_rejected(client, tmp_path):
+    archive = _zip({"a.txt": b"archive", "dir/./b.txt": b"first"})
+
+    response = client.post(
+        "/upload/bulk",
+        files=[
+            ("files", ("a.txt", b"file")),
+            ("files", ("dir/b.txt", b"second")),
+            ("archive", ("upload.zip", archive)),
+        ],
+    )
+
+    assets = response.json()["assets"]
+    assert [(item["filename"], item["status"]) for item in assets] == [
+        ("a.txt", "STORED"),
+        ("dir/b.txt", "STORED"),
+        ("a.txt", "FAILED"),
+        ("dir/./b.txt", "FAILED"),
+    ]
+    assert assets[2]["error"] == "Duplicate file name: a.txt"
+    assert assets[3]["error"] == "Duplicate file name: dir/b.txt"
+    assert (tmp_path / "media" / "a.txt").read_bytes() == b"file"
+    assert (tmp_path / "media" / "dir" / "b.txt").read_bytes() == b"second"
+
+
+def test_unsupported_archive_is_rejected(client):
+    response = client.post(
+        "/upload/bulk", files={"archive": ("upload.zip", b"not an archive")}
+    )
+
+    assert response.status_code == 400
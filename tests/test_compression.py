@@ -0,0 +1,113 @@
+import asyncio
+import os
+
+import pytest
+
+from core.services.file_system.local import LocalFSProcessor
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.helpers.compression import FRAME_MAGIC
+
+S3 = FSProvidersEnum.S3
+# Starts like a compressed frame, but was never compressed
+FRAME_LIKE = FRAME_MAGIC + b"\x01" + b"userdata" * 10
+
+
+async def _iter_read(aggregator, path, **kwargs) -> bytes:
+    return b"".join([
+        chunk async for chunk in aggregator.iter_read(S3, path, **kwargs)
+    ])
+
+
+def test_frame_like_content_is_read_as_stored(make_aggregator):
+    aggregator = make_aggregator(COMPRESSION_ENABLED=False)
+
+    async def main():
+        await aggregator.write(S3, "m.bin", FRAME_LIKE)
+        info = await aggregator.stat(S3, "m.bin")
+        assert info.codec is None
+        assert info.size == len(FRAME_LIKE)
+        assert await aggregator.read(S3, "m.bin") == FRAME_LIKE
+        assert await _iter_read(aggregator, "m.bin") == FRAME_LIKE
+        assert await aggregator.read_range(S3, "m.bin", 9, 8) == b"userdata"
+        assert bytes(await aggregator.read_mapped(S3, "m.bin")) == FRAME_LIKE
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("durable", [False, True])
+def test_compressed_file_is_decoded(tmp_path, make_aggregator, durable):
+    aggregator = make_aggregator(
+        COMPRESSION_ENABLED=True,
+        COMPRESSION_MIN_BYTES=0,
+        LOCAL_DURABLE_WRITES=durable,
+    )
+    data = b"0123456789" * 1000
+
+    async def main():
+        await aggregator.write(S3, "a.txt", data, content_type="text/plain")
+        assert len((tmp_path / "media" / "a.txt").read_bytes()) < len(data)
+        info = await aggregator.stat(S3, "a.txt")
+        assert info.codec is not None
+        assert info.size == len(data)
+        assert await aggregator.read(S3, "a.txt") == data
+        assert await _iter_read(aggregator, "a.txt", offset=5, length=10) == (
+            data[5:15]
+        )
+        assert await aggregator.read_range(S3, "a.txt", 995, 10) == data[995:1005]
+
+    asyncio.run(main())
+
+
+def test_file_replaced_around_the_aggregator_is_not_decoded(
+        tmp_path, make_aggregator
+):
+    aggregator = make_aggregator(COMPRESSION_ENABLED=True, COMPRESSION_MIN_BYTES=0)
+    path = tmp_path / "media" / "a.txt"
+
+    async def main():
+        await aggregator.write(S3, "a.txt", b"0" * 4096, content_type="text/plain")
+        stored = path.read_bytes()
+        path.write_bytes(stored + b"!")
+        assert await aggregator.read(S3, "a.txt") == stored + b"!"
+
+    asyncio.run(main())
+
+
+def test_metadata_sidecars_are_hidden_and_deleted(tmp_path, make_aggregator):
+    aggregator = make_aggregator(COMPRESSION_ENABLED=True, COMPRESSION_MIN_BYTES=0)
+
+    async def main():
+        await aggregator.write(S3, "d/a.txt", b"0" * 4096, content_type="text/plain")
+        assert await aggregator.list(S3, "d/") == ["d/a.txt"]
+        await aggregator.delete(S3, "d/a.txt")
+
+    asyncio.run(main())
+    assert os.listdir(tmp_path / "media" / "d") == []
+
+
+def test_reads_with_info_skip_metadata_requests(make_aggregator, monkeypatch):
+    aggregator = make_aggregator(COMPRESSION_ENABLED=True, COMPRESSION_MIN_BYTES=0)
+    data = b"0123456789" * 1000
+    stats = []
+    stat = LocalFSProcessor.stat
+
+    async def counting_stat(self, *args, **kwargs):
+        stats.append(True)
+        return await stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(LocalFSProcessor, "stat", counting_stat)
+
+    async def main():
+        await aggregator.write(S3, "a.txt", data, content_type="text/plain")
+        info = await aggregator.stat(S3, "a.txt")
+        assert await _iter_read(aggregator, "a.txt", info=info) == data
+        assert await _iter_read(
+            aggregator, "a.txt", offset=5, length=10, info=info
+        ) == data[5:15]
+        assert await aggregator.read_range(S3, "a.txt", 5, 10, info=info) == (
+            data[5:15]
+        )
+        assert await aggregator.read(S3, "a.txt") == data
+
+    asyncio.run(main())
+    assert len(stats) == 1
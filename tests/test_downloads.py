@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.dependencies.core.services.file_system import get_file_system_aggregator
+from api.v1.endpoints.assets.network import network_router
+from shared.enums.services.core.file_system import FSProvidersEnum
+from shared.exceptions.http import RangeNotSatisfiableError
+from shared.helpers.http import parse_byte_range
+
+DATA = b"0123456789" * 100
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-3", (0, 4)),
+        ("bytes=5-", (5, 995)),
+        ("bytes=-3", (997, 3)),
+        ("bytes=-5000", (0, 1000)),
+        ("bytes=990-5000", (990, 10)),
+        (" Bytes = 2-2", (2, 1)),
+        (None, None),
+        ("", None),
+        ("items=0-3", None),
+        ("bytes=0-1,4-5", None),
+        ("bytes=5-2", None),
+        ("bytes=a-b", None),
+        ("bytes=-", None),
+        ("bytes=3", None),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, len(DATA)) == expected
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=1000-", 1000),
+    ("bytes=2000-3000", 1000),
+    ("bytes=-0", 1000),
+    ("bytes=0-", 0),
+])
+def test_unsatisfiable_byte_range(header, size):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_byte_range(header, size)
+
+
+@pytest.fixture(params=[False, True], ids=["file", "streamed"])
+def client(request, make_aggregator):
+    """
+    Serve DATA as a.txt, either straight from the file or, compressed,
+    through the streaming range reads.
+    """
+    aggregator = make_aggregator(
+        COMPRESSION_ENABLED=request.param, COMPRESSION_MIN_BYTES=0
+    )
+    asyncio.run(aggregator.write(FSProvidersEnum.S3, "a.txt", DATA))
+
+    app = FastAPI()
+    app.include_router(network_router)
+    app.dependency_overrides[get_file_system_aggregator] = lambda: aggregator
+    with TestClient(app) as client:
+        yield client
+
+
+def test_full_download(client):
+    response = client.get("/download/a.txt")
+
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["content-length"] == str(len(DATA))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"]
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=10-19", 10, 19),
+    ("bytes=-5", 995, 999),
+    ("bytes=990-", 990, 999),
+])
+def test_range_download(client, header, start, end):
+    response = client.get("/download/a.txt", headers={"range": header})
+
+    assert response.status_code == 206
+    assert response.content == DATA[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(DATA)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+def test_unsatisfiable_range(client):
+    response = client.get("/download/a.txt", headers={"range": "bytes=5000-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(DATA)}"
+
+
+def test_if_range_serves_the_range_only_for_the_current_version(client):
+    etag = client.get("/download/a.txt").headers["etag"]
+
+    current = client.get(
+        "/download/a.txt", headers={"range": "bytes=0-3", "if-range": etag}
+    )
+    stale = client.get(
+        "/download/a.txt", headers={"range": "bytes=0-3", "if-range": '"stale"'}
+    )
+
+    assert current.status_code == 206
+    assert current.content == DATA[:4]
+    assert stale.status_code == 200
+    assert stale.content == DATA
+
+
+def test_if_none_match_is_not_modified(client):
+    etag = client.get("/download/a.txt").headers["etag"]
+
+    response = client.get("/download/a.txt", headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_missing_asset(client):
+    assert client.get("/download/missing.txt").status_code == 404
@@ -0,0 +1,64 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shared.helpers import group_commit
+from shared.helpers.group_commit import GroupCommitter
+
+
+def test_cancelled_writer_may_close_its_descriptor(tmp_path, monkeypatch):
+    synced = []
+
+    def fdatasync(fd):
+        synced.append(os.fstat(fd).st_ino)
+
+    monkeypatch.setattr(group_commit, "_fdatasync", fdatasync)
+    cancelled_path, other_path = tmp_path / "cancelled", tmp_path / "other"
+    cancelled_path.write_bytes(b"a")
+    other_path.write_bytes(b"b")
+
+    async def main(executor):
+        committer = GroupCommitter(executor, window_seconds=0.05)
+        cancelled_fd = os.open(cancelled_path, os.O_RDONLY)
+        other_fd = os.open(other_path, os.O_RDONLY)
+        try:
+            writer = asyncio.create_task(committer.sync(cancelled_fd))
+            await asyncio.sleep(0)
+            writer.cancel()
+            os.close(cancelled_fd)
+            # Joins the same group and returns once it is flushed
+            await committer.sync(other_fd)
+        finally:
+            os.close(other_fd)
+
+    with ThreadPoolExecutor(2) as executor:
+        asyncio.run(main(executor))
+
+    assert sorted(synced) == sorted(
+        [cancelled_path.stat().st_ino, other_path.stat().st_ino]
+    )
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/fd"), reason="needs /proc to count descriptors"
+)
+def test_group_closes_its_descriptors(tmp_path):
+    path = tmp_path / "file"
+    path.write_bytes(b"a")
+
+    async def main(executor):
+        committer = GroupCommitter(executor, window_seconds=0)
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            before = len(os.listdir("/proc/self/fd"))
+            await committer.sync(fd)
+            return before, len(os.listdir("/proc/self/fd"))
+        finally:
+            os.close(fd)
+
+    with ThreadPoolExecutor(2) as executor:
+        before, after = asyncio.run(main(executor))
+
+    assert after == before
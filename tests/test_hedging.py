@@ -0,0 +1,111 @@
+import asyncio
+
+from shared.helpers.hedging import HEDGE_BUDGET_BURST, HedgePolicy
+
+
+def test_delay_is_the_recent_percentile():
+    policy = HedgePolicy(percentile=95, min_delay_ms=5, max_delay_ms=500)
+    for latency in range(1, 50):
+        policy.record(latency)
+    # Not enough samples yet
+    assert policy.delay_ms == 500
+
+    policy.record(50)
+    assert policy.delay_ms == 48
+
+
+def test_delay_is_clamped():
+    fast = HedgePolicy(min_delay_ms=5, max_delay_ms=500, min_samples=10)
+    slow = HedgePolicy(min_delay_ms=5, max_delay_ms=500, min_samples=10)
+    for _ in range(10):
+        fast.record(1)
+        slow.record(10_000)
+    assert fast.delay_ms == 5
+    assert slow.delay_ms == 500
+
+
+def test_fixed_delay_ignores_latencies():
+    policy = HedgePolicy(fixed_delay_ms=20, min_samples=1)
+    policy.record(300)
+    assert policy.delay_ms == 20
+
+
+def test_budget_allows_a_share_of_requests():
+    policy = HedgePolicy(budget_ratio=0.25)
+    for _ in range(3):
+        policy.on_request()
+    assert not policy.try_acquire()
+
+    policy.on_request()
+    assert policy.try_acquire()
+    assert not policy.try_acquire()
+
+
+def test_budget_bursts_are_capped():
+    policy = HedgePolicy(budget_ratio=0.5)
+    for _ in range(1000):
+        policy.on_request()
+    acquired = 0
+    while policy.try_acquire():
+        acquired += 1
+    assert acquired == HEDGE_BUDGET_BURST
+
+
+def _counter(repository, name: str) -> float:
+    return sum(
+        value
+        for (key, _), value in repository.metrics.snapshot().counters.items()
+        if key == name
+    )
+
+
+def _slow_first_get(monkeypatch, client, seconds: float):
+    original = client.get_object
+    calls = []
+
+    async def get_object(*args, **kwargs):
+        calls.append(True)
+        if len(calls) == 1:
+            await asyncio.sleep(seconds)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(client, "get_object", get_object)
+    return calls
+
+
+def test_slow_get_is_hedged(run_with_s3, monkeypatch):
+    async def test(repository, bucket):
+        await repository.put_file(bucket, "a.txt", b"data")
+        async with repository.aws_client_factory.get_s3_client() as client:
+            calls = _slow_first_get(monkeypatch, client, 5)
+
+        assert await repository.get_file(bucket, "a.txt") == b"data"
+        assert len(calls) == 2
+        assert _counter(repository, "s3.hedge.sent") == 1
+        assert _counter(repository, "s3.hedge.won") == 1
+
+    run_with_s3(
+        test,
+        S3_HEDGED_READS=True,
+        S3_HEDGE_DELAY_MS=20,
+        S3_HEDGE_BUDGET_RATIO=1,
+    )
+
+
+def test_hedges_over_budget_are_not_sent(run_with_s3, monkeypatch):
+    async def test(repository, bucket):
+        await repository.put_file(bucket, "a.txt", b"data")
+        async with repository.aws_client_factory.get_s3_client() as client:
+            calls = _slow_first_get(monkeypatch, client, 0.1)
+
+        assert await repository.get_file(bucket, "a.txt") == b"data"
+        assert len(calls) == 1
+        assert _counter(repository, "s3.hedge.sent") == 0
+        assert _counter(repository, "s3.hedge.over_budget") == 1
+
+    run_with_s3(
+        test,
+        S3_HEDGED_READS=True,
+        S3_HEDGE_DELAY_MS=20,
+        S3_HEDGE_BUDGET_RATIO=0,
+    )
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+from configs.file_system import FileSystemConfig
+from core.services.file_system.local import LocalFSProcessor
+from shared.dataclasses.services.core.file_system import ObjectInfo
+
+
+@pytest.mark.parametrize("durable", [False, True])
+def test_write_bare_file_name(tmp_path, monkeypatch, durable):
+    monkeypatch.chdir(tmp_path)
+    processor = LocalFSProcessor(
+        fs_config=FileSystemConfig(LOCAL_DURABLE_WRITES=durable)
+    )
+
+    asyncio.run(processor.write("bare.txt", b"hi", None))
+
+    assert (tmp_path / "bare.txt").read_bytes() == b"hi"
+
+
+@pytest.mark.parametrize("durable", [False, True])
+def test_write_batch_bare_file_names(tmp_path, monkeypatch, durable):
+    monkeypatch.chdir(tmp_path)
+    processor = LocalFSProcessor(
+        fs_config=FileSystemConfig(LOCAL_DURABLE_WRITES=durable)
+    )
+
+    asyncio.run(
+        processor.write_batch([("a.txt", b"a"), ("b.txt", b"b")], None)
+    )
+
+    assert (tmp_path / "a.txt").read_bytes() == b"a"
+    assert (tmp_path / "b.txt").read_bytes() == b"b"
+
+
+def test_cancelled_listing_closes_walker_after_running_batch(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    closed = []
+
+    def walk(*args):
+        try:
+            started.set()
+            release.wait(5)
+            yield ObjectInfo(key="a")
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(LocalFSProcessor, "_walk_sync", staticmethod(walk))
+    processor = LocalFSProcessor(fs_config=FileSystemConfig())
+
+    async def main():
+        task = asyncio.create_task(anext(processor.iter_list("")))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        # The batch is still running when the listing is cancelled
+        asyncio.get_running_loop().call_later(0.1, release.set)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert closed == [True]
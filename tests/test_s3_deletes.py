@@ -0,0 +1,123 @@
+import pytest
+
+from core.repositories.aws import s3
+from core.repositories.aws.s3 import DELETE_OBJECTS_MAX_KEYS
+from shared.helpers.concurrency import map_bounded
+
+KEY_COUNT = 2 * DELETE_OBJECTS_MAX_KEYS + 1
+
+
+async def _put_keys(repository, bucket, keys):
+    await map_bounded(
+        lambda key: repository.put_file(bucket, key, b"x"), keys, 32
+    )
+
+
+def _record_delete_calls(monkeypatch, repository, failing=(), broken=False):
+    """
+    Record the keys of every DeleteObjects request. Keys in `failing` are
+    reported back as per-key errors; with `broken` the first request fails.
+    """
+    original = repository.delete_objects
+    calls = []
+
+    async def delete_objects(keys, bucket, quiet=False):
+        calls.append(list(keys))
+        if broken and len(calls) == 1:
+            raise RuntimeError("connection reset")
+        rejected = [key for key in keys if key in failing]
+        response = await original(
+            keys=[key for key in keys if key not in rejected],
+            bucket=bucket,
+            quiet=quiet,
+        )
+        response.setdefault("Errors", []).extend(
+            {"Key": key, "Code": "AccessDenied", "Message": "Access Denied"}
+            for key in rejected
+        )
+        return response
+
+    monkeypatch.setattr(repository, "delete_objects", delete_objects)
+    return calls
+
+
+def test_prefix_delete_uses_full_chunks(run_with_s3, monkeypatch):
+    keys = [f"logs/{index:05d}" for index in range(KEY_COUNT)]
+
+    async def test(repository, bucket):
+        await _put_keys(repository, bucket, [*keys, "other/keep"])
+        calls = _record_delete_calls(monkeypatch, repository)
+
+        summary = await repository.delete_files_by_prefix(bucket, "logs/")
+
+        assert summary.deleted == KEY_COUNT
+        assert summary.errors == {}
+        assert sorted(len(call) for call in calls) == [
+            1, DELETE_OBJECTS_MAX_KEYS, DELETE_OBJECTS_MAX_KEYS
+        ]
+        assert sorted(key for call in calls for key in call) == keys
+        assert await repository.list_file(bucket, "") == ["other/keep"]
+
+    run_with_s3(test)
+
+
+def test_key_delete_splits_into_chunks(run_with_s3, monkeypatch):
+    monkeypatch.setattr(s3, "DELETE_OBJECTS_MAX_KEYS", 3)
+    keys = [f"k/{index:05d}" for index in range(7)]
+
+    async def test(repository, bucket):
+        await _put_keys(repository, bucket, keys)
+        calls = _record_delete_calls(monkeypatch, repository)
+
+        summary = await repository.delete_files(bucket, keys)
+
+        assert summary.deleted == len(keys)
+        assert calls == [keys[0:3], keys[3:6], keys[6:]]
+        assert await repository.list_file(bucket, "k/") == []
+
+    run_with_s3(test)
+
+
+def test_delete_summary_reports_rejected_keys(run_with_s3, monkeypatch):
+    keys = [f"k/{index}" for index in range(5)]
+
+    async def test(repository, bucket):
+        await _put_keys(repository, bucket, keys)
+        _record_delete_calls(monkeypatch, repository, failing={"k/1", "k/3"})
+
+        summary = await repository.delete_files_by_prefix(bucket, "k/")
+
+        assert summary.deleted == 3
+        assert summary.errors == {
+            "k/1": "AccessDenied: Access Denied",
+            "k/3": "AccessDenied: Access Denied",
+        }
+        assert sorted(await repository.list_file(bucket, "k/")) == ["k/1", "k/3"]
+
+    run_with_s3(test)
+
+
+def test_failed_chunk_is_reported_and_the_rest_deleted(run_with_s3, monkeypatch):
+    monkeypatch.setattr(s3, "DELETE_OBJECTS_MAX_KEYS", 3)
+    keys = [f"k/{index}" for index in range(5)]
+
+    async def test(repository, bucket):
+        await _put_keys(repository, bucket, keys)
+        calls = _record_delete_calls(monkeypatch, repository, broken=True)
+
+        summary = await repository.delete_files(bucket, keys)
+
+        assert sorted(summary.failed) == calls[0]
+        assert set(summary.errors.values()) == {"connection reset"}
+        assert summary.deleted == len(keys) - len(calls[0])
+        assert sorted(await repository.list_file(bucket, "k/")) == calls[0]
+
+    run_with_s3(test)
+
+
+def test_empty_prefix_delete_raises(run_with_s3):
+    async def test(repository, bucket):
+        with pytest.raises(ValueError):
+            await repository.delete_files_by_prefix(bucket, "missing/")
+
+    run_with_s3(test)
@@ -0,0 +1,138 @@
+import pytest
+
+from core.clients.aws import s3
+
+MIB = 1024 * 1024
+PART_SIZE = 5 * MIB
+SETTINGS = dict(
+    S3_MULTIPART_THRESHOLD=6 * MIB,
+    S3_MULTIPART_PART_SIZE=PART_SIZE,
+    S3_MULTIPART_CONCURRENCY=2,
+)
+
+
+def _body(size: int) -> bytes:
+    return bytes(index % 251 for index in range(size))
+
+
+async def _chunks(data: bytes, chunk_size: int = MIB):
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+async def _record_calls(monkeypatch, repository, fail_part=None):
+    """
+    Record the multipart calls of the pooled client, failing the upload of
+    part `fail_part` when given.
+    """
+    calls = {"put_object": [], "upload_part": [], "abort_multipart_upload": []}
+    async with repository.aws_client_factory.get_s3_client() as client:
+        for method in calls:
+            original = getattr(client, method)
+
+            async def record(*args, _method=method, _original=original, **kwargs):
+                calls[_method].append(kwargs)
+                if _method == "upload_part" and kwargs["PartNumber"] == fail_part:
+                    raise ValueError("part lost")
+                return await _original(*args, **kwargs)
+
+            monkeypatch.setattr(client, method, record)
+    return calls
+
+
+def _part_sizes(calls) -> list[int]:
+    return [
+        len(call["Body"])
+        for call in sorted(calls["upload_part"], key=lambda c: c["PartNumber"])
+    ]
+
+
+async def _pending_uploads(repository, bucket) -> list:
+    async with repository.aws_client_factory.get_s3_client() as client:
+        response = await client.list_multipart_uploads(Bucket=bucket)
+    return response.get("Uploads", [])
+
+
+def test_small_bodies_use_a_single_put(run_with_s3, monkeypatch):
+    async def test(repository, bucket):
+        calls = await _record_calls(monkeypatch, repository)
+        await repository.upload_file("bytes.bin", _body(MIB), bucket)
+        await repository.upload_file("stream.bin", _chunks(_body(2 * MIB)), bucket)
+
+        assert len(calls["put_object"]) == 2
+        assert calls["upload_part"] == []
+        assert await repository.get_file(bucket, "stream.bin") == _body(2 * MIB)
+
+    run_with_s3(test, **SETTINGS)
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_large_bodies_are_split_into_parts(run_with_s3, monkeypatch, streamed):
+    data = _body(2 * PART_SIZE + MIB)
+
+    async def test(repository, bucket):
+        calls = await _record_calls(monkeypatch, repository)
+        await repository.upload_file(
+            "big.bin",
+            _chunks(data) if streamed else data,
+            bucket,
+            content_type="application/x-test",
+            metadata={"origin": "test"},
+        )
+
+        assert calls["put_object"] == []
+        assert _part_sizes(calls) == [PART_SIZE, PART_SIZE, MIB]
+        assert await repository.get_file(bucket, "big.bin") == data
+        info = await repository.get_file_info(bucket, "big.bin")
+        assert info.content_type == "application/x-test"
+        assert info.metadata == {"origin": "test"}
+
+    run_with_s3(test, **SETTINGS)
+
+
+def test_part_size_grows_to_stay_within_the_part_limit(run_with_s3, monkeypatch):
+    monkeypatch.setattr(s3, "MULTIPART_MAX_PARTS", 2)
+    data = _body(2 * PART_SIZE + MIB)
+
+    async def test(repository, bucket):
+        calls = await _record_calls(monkeypatch, repository)
+        await repository.upload_file("big.bin", data, bucket)
+
+        assert _part_sizes(calls) == [len(data) - len(data) // 2, len(data) // 2]
+        assert await repository.get_file(bucket, "big.bin") == data
+
+    run_with_s3(test, **SETTINGS)
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_failed_part_aborts_the_upload(run_with_s3, monkeypatch, streamed):
+    data = _body(2 * PART_SIZE + MIB)
+
+    async def test(repository, bucket):
+        calls = await _record_calls(monkeypatch, repository, fail_part=2)
+        with pytest.raises(ValueError):
+            await repository.upload_file(
+                "big.bin", _chunks(data) if streamed else data, bucket
+            )
+
+        assert len(calls["abort_multipart_upload"]) == 1
+        assert await _pending_uploads(repository, bucket) == []
+        assert not await repository.file_exists(bucket, "big.bin")
+
+    run_with_s3(test, **SETTINGS)
+
+
+def test_stream_over_the_part_limit_is_aborted(run_with_s3, monkeypatch):
+    monkeypatch.setattr(s3, "MULTIPART_MAX_PARTS", 2)
+
+    async def test(repository, bucket):
+        calls = await _record_calls(monkeypatch, repository)
+        with pytest.raises(ValueError, match="exceeds 2 parts"):
+            await repository.upload_file(
+                "big.bin", _chunks(_body(2 * PART_SIZE + MIB)), bucket
+            )
+
+        assert len(calls["abort_multipart_upload"]) == 1
+        assert await _pending_uploads(repository, bucket) == []
+
+    run_with_s3(test, **SETTINGS)
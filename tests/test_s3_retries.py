@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from shared.helpers.aws.s3 import (
+    backoff_delay,
+    is_s3_retryable_error,
+    is_s3_throttling_error,
+)
+from shared.helpers.concurrency import AdaptiveConcurrencyLimiter
+
+
+def _client_error(code: str, status: int = 400) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        "HeadObject",
+    )
+
+
+def _counter(repository, name: str) -> float:
+    return sum(
+        value
+        for (key, _), value in repository.metrics.snapshot().counters.items()
+        if key == name
+    )
+
+
+@pytest.mark.parametrize(
+    "error, throttling, retryable",
+    [
+        (_client_error("SlowDown", 503), True, True),
+        (_client_error("ThrottlingException"), True, True),
+        (_client_error("Unknown", 429), True, True),
+        (_client_error("InternalError", 500), False, True),
+        (_client_error("Unknown", 502), False, True),
+        (_client_error("RequestTimeout"), False, True),
+        (EndpointConnectionError(endpoint_url="http://s3"), False, True),
+        (_client_error("NoSuchKey", 404), False, False),
+        (_client_error("AccessDenied", 403), False, False),
+        (ValueError("bad"), False, False),
+    ],
+)
+def test_error_classification(error, throttling, retryable):
+    assert is_s3_throttling_error(error) is throttling
+    assert is_s3_retryable_error(error) is retryable
+
+
+def test_backoff_delay_is_jittered_below_its_cap():
+    for attempt in range(1, 10):
+        cap = min(1.0, 0.1 * 2 ** (attempt - 1))
+        delays = [backoff_delay(attempt, 0.1, 1.0) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        assert max(delays) > cap / 2
+
+
+def test_limiter_grows_additively_and_halves_on_throttling():
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=4, minimum=2, maximum=8, cooldown_seconds=0
+    )
+    # About one step per window of `limit` successes
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.limit == 5
+
+    limiter.on_throttle()
+    assert limiter.limit == 2
+    limiter.on_throttle()
+    assert limiter.limit == 2
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+
+
+def test_limiter_counts_one_decrease_per_cooldown():
+    limiter = AdaptiveConcurrencyLimiter(initial=32, cooldown_seconds=60)
+    for _ in range(5):
+        limiter.on_throttle()
+    assert limiter.limit == 16
+
+
+def test_limiter_caps_concurrency_and_reenters_held_slots():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            # Nested work runs under the slot that is already held
+            async with limiter.slot():
+                await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(work() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def _throttle_first_calls(monkeypatch, client, method: str, failures: int):
+    original = getattr(client, method)
+    calls = []
+
+    async def throttled(*args, **kwargs):
+        calls.append(True)
+        if len(calls) <= failures:
+            raise _client_error("SlowDown", 503)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(client, method, throttled)
+    return calls
+
+
+def test_throttled_idempotent_calls_are_retried(run_with_s3, monkeypatch):
+    async def test(repository, bucket):
+        await repository.put_file(bucket, "a.txt", b"data")
+        limit = repository.limiter.limit
+        async with repository.aws_client_factory.get_s3_client() as client:
+            calls = _throttle_first_calls(monkeypatch, client, "head_object", 2)
+
+        info = await repository.get_file_info(bucket, "a.txt")
+
+        assert info.size == 4
+        assert len(calls) == 3
+        assert _counter(repository, "s3.retries") == 2
+        assert _counter(repository, "s3.throttled") == 2
+        assert repository.limiter.limit < limit
+
+    run_with_s3(
+        test,
+        S3_RETRY_BASE_DELAY=0.001,
+        S3_ADAPTIVE_CONCURRENCY_COOLDOWN=0,
+    )
+
+
+def test_retries_stop_after_max_attempts(run_with_s3, monkeypatch):
+    async def test(repository, bucket):
+        async with repository.aws_client_factory.get_s3_client() as client:
+            calls = _throttle_first_calls(monkeypatch, client, "head_object", 10)
+
+        with pytest.raises(ClientError):
+            await repository.get_file_info(bucket, "a.txt")
+        assert len(calls) == 3
+
+    run_with_s3(test, S3_RETRY_BASE_DELAY=0.001, S3_RETRY_MAX_ATTEMPTS=3)
+
+
+def test_non_idempotent_calls_are_not_retried(run_with_s3, monkeypatch):
+    async def test(repository, bucket):
+        async with repository.aws_client_factory.get_s3_client() as client:
+            calls = _throttle_first_calls(
+                monkeypatch, client, "create_multipart_upload", 1
+            )
+
+        async with repository._get_client() as client:
+            with pytest.raises(ClientError):
+                await client.create_multipart_upload(Bucket=bucket, Key="a.bin")
+        assert len(calls) == 1
+
+    run_with_s3(test, S3_RETRY_BASE_DELAY=0.001)
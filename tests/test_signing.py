@@ -0,0 +1,33 @@
+import pytest
+
+from shared.exceptions.assets import InvalidTransferTokenError
+from shared.helpers.signing import TransferTokenSigner
+
+
+def test_verify_returns_signed_claims():
+    signer = TransferTokenSigner(b"secret")
+
+    claims = signer.verify(signer.sign({"op": "get", "path": "a.txt"}, 60))
+
+    assert claims["op"] == "get"
+    assert claims["path"] == "a.txt"
+
+
+@pytest.mark.parametrize(
+    "token",
+    ["", "abc", "abcédef", "abc.déf", "é.é"],
+)
+def test_verify_rejects_malformed_tokens(token):
+    with pytest.raises(InvalidTransferTokenError):
+        TransferTokenSigner(b"secret").verify(token)
+
+
+def test_verify_rejects_forged_and_expired_tokens():
+    signer = TransferTokenSigner(b"secret")
+    forged = TransferTokenSigner(b"other").sign({"op": "get"}, 60)
+    expired = signer.sign({"op": "get"}, -1)
+
+    with pytest.raises(InvalidTransferTokenError, match="Invalid"):
+        signer.verify(forged)
+    with pytest.raises(InvalidTransferTokenError, match="expired"):
+        signer.verify(expired)